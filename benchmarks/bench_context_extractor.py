@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ContextExtractor single-pass matcher vs. per-pattern scans
+
+Usage:
+    python benchmarks/bench_context_extractor.py [--mb 4] [--repeat 3]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from inceptor.core.context_extractor import ContextExtractor  # noqa: E402
+
+FILLER = (
+    "the service should handle incoming events and store them for later "
+    "review by the operations staff while keeping latency low"
+).split()
+
+
+def legacy_extract(text):
+    """The original implementation: one lower() and one findall per pattern."""
+    context = {}
+    for category, patterns in ContextExtractor.CONTEXT_PATTERNS.items():
+        matches = []
+        for pattern in patterns:
+            matches.extend(re.findall(pattern, text.lower()))
+        context[category] = list(set(matches))
+    return context
+
+
+def make_corpus(size_mb):
+    keywords = [
+        "python", "flask", "kubernetes", "redis", "logging", "security",
+        "ci/cd", "team size", "500 users", "urgent", "nice to have", "gdpr",
+    ]
+    rng = random.Random(42)
+    words = []
+    length = 0
+    while length < size_mb * 1024 * 1024:
+        word = rng.choice(keywords) if rng.random() < 0.05 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def best_of(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=4.0, help="Corpus size in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant")
+    args = parser.parse_args()
+
+    text = make_corpus(args.mb)
+    ContextExtractor.get_matcher()  # compile outside the timed region
+
+    legacy = best_of(legacy_extract, text, args.repeat)
+    combined = best_of(ContextExtractor.extract_context, text, args.repeat)
+
+    print(f"corpus:   {len(text) / 1024 / 1024:.1f} MB")
+    print(f"legacy:   {legacy:.3f}s ({len(text) / legacy / 1e6:.1f} MB/s)")
+    print(f"combined: {combined:.3f}s ({len(text) / combined / 1e6:.1f} MB/s)")
+    print(f"speedup:  {legacy / combined:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: binary solution format vs. the YAML/JSON save paths
+
+Usage:
+    python benchmarks/bench_serialization.py [--tasks 2000] [--repeat 3]
+"""
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from inceptor.core import serialization  # noqa: E402
+from inceptor.core.enums import ArchitectureLevel  # noqa: E402
+from inceptor.core.models import Solution, Task  # noqa: E402
+
+
+def make_solution(tasks):
+    """A solution shaped like DreamArchitect output with ``tasks`` tasks per level."""
+    code = "def handler(event):\n    return {'status': 'ok', 'event': event}\n" * 10
+    return Solution(
+        problem="logging system for a Flask app with Kubernetes deployment",
+        architecture={
+            "limbo": {"components": [{"name": f"Component{i}", "purpose": "x" * 80} for i in range(20)]},
+            "dream": {f"D{i}": {"design": {"interfaces": ["a", "b"], "notes": "y" * 200}} for i in range(tasks)},
+        },
+        tasks=[Task.from_dict({"task_id": f"R{i}", "description": "implement " * 10}, ArchitectureLevel.REALITY)
+               for i in range(tasks)],
+        implementation={"reality": {f"R{i}": {"code": code, "tests": code} for i in range(tasks)}},
+        metadata={"levels": 3, "duration": 12.5},
+    )
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks per level")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant")
+    args = parser.parse_args()
+
+    solution = make_solution(args.tasks)
+    variants = {
+        "yaml": (
+            lambda: yaml.dump(solution.to_dict(), default_flow_style=False).encode(),
+            lambda data: Solution.from_dict(yaml.safe_load(data)),
+        ),
+        "json": (
+            lambda: json.dumps(solution.to_dict(), indent=2).encode(),
+            lambda data: Solution.from_dict(json.loads(data)),
+        ),
+        "isol/json": (
+            lambda: serialization.dumps(solution, serialization.CODEC_JSON),
+            serialization.loads,
+        ),
+    }
+    if serialization.msgpack is not None:
+        variants["isol/msgpack"] = (
+            lambda: serialization.dumps(solution, serialization.CODEC_MSGPACK),
+            serialization.loads,
+        )
+
+    print(f"{'format':<14}{'size':>10}{'write':>10}{'read':>10}")
+    for name, (write, read) in variants.items():
+        write_time, data = best_of(write, args.repeat)
+        read_time, loaded = best_of(lambda: read(io.BytesIO(data).read()), args.repeat)
+        assert loaded == solution, name
+        print(f"{name:<14}{len(data) / 1024 / 1024:>8.1f}MB{write_time:>9.3f}s{read_time:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
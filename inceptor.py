@@ -4,23 +4,61 @@ Najprostszy Dream Architect System
 Minimal implementation z Ollama integration
 """
 
+import importlib
 import json
+import os
+import sys
+import types
 import requests
+from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+# Moduły z src/inceptor/core ładowane bez src/inceptor/__init__.py (CLI z click,
+# rich, yaml, ...): wystarczy requests, ale katalog src/ musi leżeć obok skryptu.
+# Osobna nazwa pakietu, bo ten skrypt przesłania pakiet "inceptor".
+_CORE_DIR = Path(__file__).resolve().parent / "src" / "inceptor" / "core"
+
+
+def _core_module(name: str) -> types.ModuleType:
+    """Importuje src/inceptor/core/<name>.py jako moduł pakietu _inceptor_core"""
+    if "_inceptor_core" not in sys.modules:
+        package = types.ModuleType("_inceptor_core")
+        package.__path__ = [str(_CORE_DIR)]
+        sys.modules["_inceptor_core"] = package
+    return importlib.import_module(f"_inceptor_core.{name}")
+
+
+ProjectExporter = _core_module("project_export").ProjectExporter
+ProjectIndex = _core_module("project_index").ProjectIndex
+StandInClient = _core_module("stand_in").StandInClient
+
 
 class SimpleDreamArchitect:
     """Minimalny Dream Architect - 3 poziomy: LIMBO → DREAM → REALITY"""
 
-    def __init__(self, ollama_url="http://localhost:11434"):
+    def __init__(self, ollama_url="http://localhost:11434", max_concurrency: int = 4, backend=None):
         self.ollama_url = ollama_url
         self.model = "mistral:7b"
+        # Klient z metodą generate() zamiast Ollama (np. StandInClient do testów
+        # bez serwera); INCEPTOR_BACKEND=stand-in włącza go domyślnie
+        if backend is None and os.environ.get("INCEPTOR_BACKEND") == "stand-in":
+            backend = StandInClient()
+        self.backend = backend
+        # Ile plików REALITY generować równolegle
+        self.max_concurrency = max(1, max_concurrency)
+        # Wspólna sesja HTTP (keep-alive), pula połączeń >= max_concurrency
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def ask_ollama(self, prompt: str) -> str:
         """Wysyła prompt do Ollama i zwraca odpowiedź"""
         try:
-            response = requests.post(
+            if self.backend is not None:
+                return self.backend.generate(prompt)
+            response = self.session.post(
                 f"{self.ollama_url}/api/generate",
                 json={
                     "model": self.model,
@@ -105,18 +143,22 @@ class SimpleDreamArchitect:
         }
 
     def reality(self, dream_result: Dict) -> Dict:
-        """LEVEL 3: Implementation - specs → kod"""
+        """LEVEL 3: Implementation - specs → kod
+
+        Pliki są generowane równolegle (max_concurrency zapytań naraz),
+        a słownik files zachowuje kolejność implementation_tasks.
+        """
         tasks = dream_result.get('implementation_tasks', [])
-        files = {}
+        technologies = dream_result.get('technologies', [])
 
-        for task in tasks:
+        def generate_file(task: Dict) -> tuple:
             file_name = task.get('file', 'main.py')
             description = task.get('description', 'Implementacja')
 
             prompt = f"""
             Stwórz zawartość pliku: {file_name}
             Opis: {description}
-            Technologie: {dream_result.get('technologies', [])}
+            Technologie: {technologies}
 
             Podaj tylko kod, bez komentarzy markdown:
             """
@@ -124,9 +166,18 @@ class SimpleDreamArchitect:
             code = self.ask_ollama(prompt)
             # Usuń markdown formatting
             code = code.replace('```python', '').replace('```', '').strip()
-            files[file_name] = code
+            return file_name, code
 
-        return {"files": files}
+        return {"files": dict(self.map_concurrent(generate_file, tasks))}
+
+    def map_concurrent(self, func, items: List) -> List:
+        """Wywołuje func dla każdego elementu w max_concurrency wątkach; wyniki w kolejności wejścia"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self.max_concurrency == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as pool:
+            return list(pool.map(func, items))
 
     def inception(self, problem: str) -> Dict:
         """Główna funkcja - wykonuje wszystkie 3 poziomy"""
@@ -215,7 +266,11 @@ class SimpleDreamArchitect:
                     print(f"   ✅ Saved: {filepath}")
 
     def save_files(self, result: Dict, project_name: str = None, auto_name: bool = False) -> List[str]:
-        """Zapisuje wygenerowane pliki do dysku"""
+        """Zapisuje wygenerowane pliki do dysku
+
+        Pliki są zapisywane równolegle do katalogu tymczasowego, który
+        następnie atomowo zastępuje katalog projektu.
+        """
         import os
         from datetime import datetime
 
@@ -226,25 +281,10 @@ class SimpleDreamArchitect:
         elif not project_name:
             project_name = "output"
 
-        # Stwórz katalog projektu
         project_dir = os.path.join("projects", project_name)
-        os.makedirs(project_dir, exist_ok=True)
-
-        saved_files = []
         files = result.get('reality', {}).get('files', {})
 
-        # Zapisz pliki kodu
-        for filename, content in files.items():
-            filepath = os.path.join(project_dir, filename)
-
-            # Stwórz subdirectories jeśli potrzebne
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            saved_files.append(filepath)
-
-        # Zapisz metadata projektu
+        # Metadata projektu
         metadata = {
             "problem": result.get('problem', ''),
             "timestamp": datetime.now().isoformat(),
@@ -254,18 +294,12 @@ class SimpleDreamArchitect:
             "files": list(files.keys())
         }
 
-        metadata_file = os.path.join(project_dir, "project_info.json")
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-        saved_files.append(metadata_file)
-
-        # Stwórz README
-        readme_content = self.generate_readme(result)
-        readme_file = os.path.join(project_dir, "README.md")
-        with open(readme_file, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        saved_files.append(readme_file)
+        project_files = dict(files)
+        project_files["project_info.json"] = json.dumps(metadata, indent=2, ensure_ascii=False)
+        project_files["README.md"] = self.generate_readme(result)
 
+        saved_files = ProjectExporter().export_dir(project_files, project_dir)
+        project_index().update(project_name, metadata)
         return saved_files
 
     def generate_readme(self, result: Dict) -> str:
@@ -353,35 +387,39 @@ def batch_generate(problems: List[str], output_dir: str = "batch_projects") -> D
     return results
 
 
-def list_projects() -> List[str]:
-    """Lista wygenerowanych projektów"""
-    import os
+_project_index = None
+
 
-    if not os.path.exists("projects"):
-        return []
+def project_index() -> ProjectIndex:
+    """Indeks projektów (projects/.index.db), otwierany przy pierwszym użyciu"""
+    global _project_index
+    if _project_index is None:
+        _project_index = ProjectIndex("projects")
+    return _project_index
 
-    projects = []
-    for item in os.listdir("projects"):
-        project_path = os.path.join("projects", item)
-        if os.path.isdir(project_path):
-            projects.append(item)
 
-    return sorted(projects)
+def list_projects(technology: str = None, component: str = None,
+                  since: str = None, text: str = None) -> List[str]:
+    """Lista wygenerowanych projektów
+
+    Korzysta z indeksu zamiast czytać project_info.json każdego projektu.
+    Filtry: technologia, komponent, data utworzenia (od, ISO) i fragment
+    opisu problemu.
+    """
+    return project_index().names(technology=technology, component=component,
+                                 since=since, text=text)
 
 
 def show_project_info(project_name: str):
     """Pokazuje informacje o projekcie"""
-    import os
-
-    info_file = os.path.join("projects", project_name, "project_info.json")
+    index = project_index()
+    index.refresh_if_stale()
+    info = index.get(project_name)
 
-    if not os.path.exists(info_file):
+    if info is None:
         print(f"❌ Project {project_name} not found")
         return
 
-    with open(info_file, 'r', encoding='utf-8') as f:
-        info = json.load(f)
-
     print(f"\n📁 Project: {project_name}")
     print(f"🎯 Problem: {info.get('problem', 'N/A')}")
     print(f"🕒 Created: {info.get('timestamp', 'N/A')}")
@@ -390,6 +428,22 @@ def show_project_info(project_name: str):
     print(f"📄 Files: {', '.join(info.get('files', []))}")
 
 
+def parse_list_filters(args: str) -> Dict[str, str]:
+    """Parsuje filtry komendy list: tech=..., component=..., since=..., reszta to tekst"""
+    aliases = {"tech": "technology", "technology": "technology",
+               "component": "component", "since": "since"}
+    filters, words = {}, []
+    for word in args.split():
+        key, sep, value = word.partition("=")
+        if sep and key.lower() in aliases:
+            filters[aliases[key.lower()]] = value
+        else:
+            words.append(word)
+    if words:
+        filters["text"] = " ".join(words)
+    return filters
+
+
 # Enhanced CLI with project management
 def enhanced_cli():
     """Enhanced CLI z project management"""
@@ -419,7 +473,8 @@ def enhanced_cli():
         print("Commands:")
         print("  dream <problem>  - Generate new solution")
         print("  batch           - Generate multiple solutions")
-        print("  list            - List all projects")
+        print("  list [filters]  - List projects (tech=, component=, since=, text)")
+        print("  reindex         - Rebuild project index from disk")
         print("  show <project>  - Show project info")
         print("  quit            - Exit")
 
@@ -472,7 +527,7 @@ def enhanced_cli():
                 print(f"\n✅ Generated {len([r for r in results.values() if r])} projects")
 
         elif cmd == "list":
-            projects = list_projects()
+            projects = list_projects(**parse_list_filters(parts[1] if len(parts) > 1 else ""))
             if projects:
                 print(f"\n📁 Projects ({len(projects)}):")
                 for project in projects:
@@ -483,6 +538,10 @@ def enhanced_cli():
         elif cmd == "show" and len(parts) > 1:
             show_project_info(parts[1])
 
+        elif cmd == "reindex":
+            count = project_index().rebuild()
+            print(f"\n🔄 Indexed {count} projects")
+
         else:
             print("❌ Unknown command or missing arguments")
 
@@ -491,6 +550,11 @@ def enhanced_cli():
 if __name__ == "__main__":
     import sys
 
+    # --stand-in: odpowiedzi generowane lokalnie, bez serwera Ollama
+    if "--stand-in" in sys.argv:
+        sys.argv.remove("--stand-in")
+        os.environ["INCEPTOR_BACKEND"] = "stand-in"
+
     if len(sys.argv) > 1:
         # Command line usage
         problem = " ".join(sys.argv[1:])
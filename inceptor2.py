@@ -272,23 +272,64 @@ Najprostszy Dream Architect System
 Minimal implementation z Ollama integration
 """
 
+import importlib
 import json
+import os
+import sys
+import types
 import requests
+from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+# Moduły z src/inceptor/core ładowane bez src/inceptor/__init__.py (CLI z click,
+# rich, yaml, ...): wystarczy requests, ale katalog src/ musi leżeć obok skryptu.
+# Osobna nazwa pakietu, bo ten skrypt przesłania pakiet "inceptor".
+_CORE_DIR = Path(__file__).resolve().parent / "src" / "inceptor" / "core"
+
+
+def _core_module(name: str) -> types.ModuleType:
+    """Importuje src/inceptor/core/<name>.py jako moduł pakietu _inceptor_core"""
+    if "_inceptor_core" not in sys.modules:
+        package = types.ModuleType("_inceptor_core")
+        package.__path__ = [str(_CORE_DIR)]
+        sys.modules["_inceptor_core"] = package
+    return importlib.import_module(f"_inceptor_core.{name}")
+
+
+BlobStore = _core_module("blob_store").BlobStore
+ProjectExporter = _core_module("project_export").ProjectExporter
+ProjectIndex = _core_module("project_index").ProjectIndex
+StandInClient = _core_module("stand_in").StandInClient
+
 
 class SimpleDreamArchitect:
     """Minimalny Dream Architect - 3 poziomy: LIMBO → DREAM → REALITY"""
 
-    def __init__(self, ollama_url="http://localhost:11434"):
+    def __init__(self, ollama_url="http://localhost:11434", max_concurrency: int = 4, backend=None):
         self.ollama_url = ollama_url
         self.model = "mistral:7b"
+        # Klient z metodą generate() zamiast Ollama (np. StandInClient do testów
+        # bez serwera); INCEPTOR_BACKEND=stand-in włącza go domyślnie
+        if backend is None and os.environ.get("INCEPTOR_BACKEND") == "stand-in":
+            backend = StandInClient()
+        self.backend = backend
+        # Ile plików REALITY generować równolegle
+        self.max_concurrency = max(1, max_concurrency)
+        # Wspólna sesja HTTP (keep-alive), pula połączeń >= max_concurrency
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Opcjonalny magazyn blobów: identyczne pliki są hardlinkowane
+        self.blob_store = None
 
     def ask_ollama(self, prompt: str) -> str:
         """Wysyła prompt do Ollama i zwraca odpowiedź"""
         try:
-            response = requests.post(
+            if self.backend is not None:
+                return self.backend.generate(prompt)
+            response = self.session.post(
                 f"{self.ollama_url}/api/generate",
                 json={
                     "model": self.model,
@@ -376,10 +417,9 @@ class SimpleDreamArchitect:
         """LEVEL 3: Implementation - specs → kod + environment setup"""
         tasks = dream_result.get('implementation_tasks', [])
         technologies = dream_result.get('technologies', [])
-        files = {}
 
-        # Generuj pliki kodu
-        for task in tasks:
+        # Generuj pliki kodu (równolegle, kolejność zgodna z implementation_tasks)
+        def generate_file(task: Dict) -> tuple:
             file_name = task.get('file', 'main.py')
             description = task.get('description', 'Implementacja')
 
@@ -399,7 +439,9 @@ class SimpleDreamArchitect:
 
             code = self.ask_ollama(prompt)
             code = code.replace('```python', '').replace('```', '').strip()
-            files[file_name] = code
+            return file_name, code
+
+        files = dict(self.map_concurrent(generate_file, tasks))
 
         # Generuj pliki środowiskowe
         env_files = self.generate_environment_files(dream_result)
@@ -407,47 +449,137 @@ class SimpleDreamArchitect:
 
         return {"files": files}
 
+    def map_concurrent(self, func, items: List) -> List:
+        """Wywołuje func dla każdego elementu w max_concurrency wątkach; wyniki w kolejności wejścia"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self.max_concurrency == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as pool:
+            return list(pool.map(func, items))
+
+    # Generatory zdefiniowane na początku modułu jako funkcje z `self`
+    generate_config_file = generate_config_file
+    generate_package_json = generate_package_json
+    generate_basic_tests = generate_basic_tests
+    generate_k8s_deployment = generate_k8s_deployment
+    generate_github_actions = generate_github_actions
+
+    # Flagi architektury, od których zależą szablony (dopasowanie podciągu)
+    ARCHITECTURE_FLAGS = ('postgres', 'mysql', 'mongo', 'redis', 'k8s')
+
+    # Od czego zależy wynik każdego generatora: 'tech' - lista technologii
+    # (dokładnie w podanej postaci), 'arch' - flagi architektury. Fragmenty
+    # bez zależności są renderowane raz na proces.
+    ENV_FRAGMENTS = {
+        'generate_dockerfile': ('tech',),
+        'generate_docker_compose': ('tech', 'arch'),
+        'generate_requirements': ('tech',),
+        'generate_package_json': ('tech',),
+        'generate_env_example': ('tech', 'arch'),
+        'generate_config_file': (),
+        'generate_setup_script': (),
+        'generate_run_script': ('tech',),
+        'generate_healthcheck': (),
+        'generate_basic_tests': (),
+        'generate_k8s_deployment': (),
+        'generate_github_actions': (),
+        'generate_troubleshooting': (),
+    }
+
+    # Cache współdzielony przez instancje: klucz -> wyrenderowane pliki/fragmenty
+    _env_files_cache: Dict[tuple, Dict[str, str]] = {}
+    _fragment_cache: Dict[tuple, str] = {}
+
+    @classmethod
+    def environment_key(cls, technologies: list, architecture: str) -> tuple:
+        """Klucz wejścia szablonów: (technologie bez zmian, flagi architektury)
+
+        Technologie nie są normalizowane - generatory rozróżniają wielkość
+        liter i spacje (np. 'JWT' w .env.example), więc tylko identyczne
+        listy dzielą wpis. Z architektury szablony sprawdzają wyłącznie
+        flagi, więc reszta opisu nie wchodzi do klucza.
+        """
+        arch = architecture.lower() if isinstance(architecture, str) else ''
+        return tuple(technologies), tuple(flag for flag in cls.ARCHITECTURE_FLAGS if flag in arch)
+
+    @classmethod
+    def clear_environment_cache(cls):
+        """Czyści cache plików środowiskowych (np. po zmianie szablonów)"""
+        cls._env_files_cache.clear()
+        cls._fragment_cache.clear()
+
     def generate_environment_files(self, dream_result: Dict) -> Dict:
-        """Generuje pliki konfiguracyjne i środowiskowe"""
-        technologies = dream_result.get('technologies', [])
-        architecture = dream_result.get('architecture', '')
+        """Generuje pliki konfiguracyjne i środowiskowe
+
+        Wynik jest czystą funkcją listy technologii i flag architektury,
+        więc jest cache'owany - w batchu identyczne stosy technologii nie
+        są renderowane ponownie.
+        """
+        techs, flags = self.environment_key(dream_result.get('technologies', []),
+                                            dream_result.get('architecture', ''))
+        key = (type(self), techs, flags)
+        env_files = self._env_files_cache.get(key)
+        if env_files is None:
+            env_files = self._render_environment_files(techs, flags)
+            self._env_files_cache[key] = env_files
+        return dict(env_files)
+
+    def _fragment(self, name: str, techs: tuple, flags: tuple) -> str:
+        """Renderuje (lub bierze z cache) jeden plik; klucz zawiera tylko jego zależności"""
+        deps = self.ENV_FRAGMENTS[name]
+        key = (type(self), name, techs if 'tech' in deps else None, flags if 'arch' in deps else None)
+        content = self._fragment_cache.get(key)
+        if content is None:
+            generator = getattr(self, name)
+            if name == 'generate_k8s_deployment':
+                content = generator()
+            elif 'arch' in deps:
+                content = generator(list(techs), ' '.join(flags))
+            else:
+                content = generator(list(techs))
+            self._fragment_cache[key] = content
+        return content
 
+    def _render_environment_files(self, techs: tuple, flags: tuple) -> Dict:
+        """Składa pliki środowiskowe dla wejścia z environment_key"""
+        fragment = lambda name: self._fragment(name, techs, flags)  # noqa: E731
         env_files = {}
 
         # 1. Docker setup
-        if any(tech.lower() in ['python', 'flask', 'django', 'fastapi'] for tech in technologies):
-            env_files['Dockerfile'] = self.generate_dockerfile(technologies)
-            env_files['docker-compose.yml'] = self.generate_docker_compose(technologies, architecture)
+        if any(tech.lower() in ['python', 'flask', 'django', 'fastapi'] for tech in techs):
+            env_files['Dockerfile'] = fragment('generate_dockerfile')
+            env_files['docker-compose.yml'] = fragment('generate_docker_compose')
 
         # 2. Requirements/Dependencies
-        if any(tech.lower() in ['python', 'flask', 'django', 'fastapi'] for tech in technologies):
-            env_files['requirements.txt'] = self.generate_requirements(technologies)
-        elif any(tech.lower() in ['nodejs', 'node', 'javascript', 'react'] for tech in technologies):
-            env_files['package.json'] = self.generate_package_json(technologies)
+        if any(tech.lower() in ['python', 'flask', 'django', 'fastapi'] for tech in techs):
+            env_files['requirements.txt'] = fragment('generate_requirements')
+        elif any(tech.lower() in ['nodejs', 'node', 'javascript', 'react'] for tech in techs):
+            env_files['package.json'] = fragment('generate_package_json')
 
         # 3. Environment configuration
-        env_files['.env.example'] = self.generate_env_example(technologies, architecture)
-        env_files['config.py'] = self.generate_config_file(technologies)
+        env_files['.env.example'] = fragment('generate_env_example')
+        env_files['config.py'] = fragment('generate_config_file')
 
         # 4. Setup scripts
-        env_files['setup.sh'] = self.generate_setup_script(technologies)
-        env_files['run.sh'] = self.generate_run_script(technologies)
+        env_files['setup.sh'] = fragment('generate_setup_script')
+        env_files['run.sh'] = fragment('generate_run_script')
 
         # 5. Health check
-        env_files['healthcheck.py'] = self.generate_healthcheck(technologies)
+        env_files['healthcheck.py'] = fragment('generate_healthcheck')
 
         # 6. Testing setup
-        env_files['test_basic.py'] = self.generate_basic_tests(technologies)
+        env_files['test_basic.py'] = fragment('generate_basic_tests')
 
         # 7. Deployment files
-        if 'kubernetes' in [t.lower() for t in technologies] or 'k8s' in architecture.lower():
-            env_files['k8s-deployment.yaml'] = self.generate_k8s_deployment()
+        if 'kubernetes' in [t.lower() for t in techs] or 'k8s' in flags:
+            env_files['k8s-deployment.yaml'] = fragment('generate_k8s_deployment')
 
         # 8. CI/CD
-        env_files['.github/workflows/ci.yml'] = self.generate_github_actions(technologies)
+        env_files['.github/workflows/ci.yml'] = fragment('generate_github_actions')
 
         # 9. Documentation
-        env_files['TROUBLESHOOTING.md'] = self.generate_troubleshooting(technologies)
+        env_files['TROUBLESHOOTING.md'] = fragment('generate_troubleshooting')
 
         return env_files
 
@@ -1014,7 +1146,11 @@ cp .env.example .env
                     print(f"   ✅ Saved: {filepath}")
 
     def save_files(self, result: Dict, project_name: str = None, auto_name: bool = False) -> List[str]:
-        """Zapisuje wygenerowane pliki do dysku"""
+        """Zapisuje wygenerowane pliki do dysku
+
+        Pliki są zapisywane równolegle do katalogu tymczasowego, który
+        następnie atomowo zastępuje katalog projektu.
+        """
         import os
         from datetime import datetime
 
@@ -1025,25 +1161,10 @@ cp .env.example .env
         elif not project_name:
             project_name = "output"
 
-        # Stwórz katalog projektu
         project_dir = os.path.join("projects", project_name)
-        os.makedirs(project_dir, exist_ok=True)
-
-        saved_files = []
         files = result.get('reality', {}).get('files', {})
 
-        # Zapisz pliki kodu
-        for filename, content in files.items():
-            filepath = os.path.join(project_dir, filename)
-
-            # Stwórz subdirectories jeśli potrzebne
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            saved_files.append(filepath)
-
-        # Zapisz metadata projektu
+        # Metadata projektu
         metadata = {
             "problem": result.get('problem', ''),
             "timestamp": datetime.now().isoformat(),
@@ -1053,18 +1174,12 @@ cp .env.example .env
             "files": list(files.keys())
         }
 
-        metadata_file = os.path.join(project_dir, "project_info.json")
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-        saved_files.append(metadata_file)
-
-        # Stwórz README
-        readme_content = self.generate_readme(result)
-        readme_file = os.path.join(project_dir, "README.md")
-        with open(readme_file, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        saved_files.append(readme_file)
+        project_files = dict(files)
+        project_files["project_info.json"] = json.dumps(metadata, indent=2, ensure_ascii=False)
+        project_files["README.md"] = self.generate_readme(result)
 
+        saved_files = ProjectExporter(blob_store=self.blob_store).export_dir(project_files, project_dir)
+        project_index().update(project_name, metadata)
         return saved_files
 
     def generate_readme(self, result: Dict) -> str:
@@ -1124,12 +1239,26 @@ def save_solution(problem: str, auto_save: bool = True) -> List[str]:
     return []
 
 
-def batch_generate(problems: List[str], output_dir: str = "batch_projects") -> Dict[str, List[str]]:
-    """Generuje rozwiązania dla wielu problemów na raz"""
+def batch_generate(problems: List[str], output_dir: str = "batch_projects", dedup: bool = False) -> Dict[str, List[str]]:
+    """Generuje rozwiązania dla wielu problemów na raz
+
+    Przy dedup=True pliki trafiają do projects/.blobs (adresowanie treścią),
+    a katalogi projektów dostają hardlinki - powtarzalny boilerplate
+    (Dockerfile, setup.sh, CI, ...) zajmuje miejsce tylko raz.
+
+    Cena: hardlinki dzielą jeden i-węzeł z blobem i ze wszystkimi innymi
+    projektami. Pliki są tylko do odczytu, ale ``chmod`` (np. ``chmod +x
+    setup.sh`` z README) zmienia tryb wszędzie, a edytor zapisujący w
+    miejscu po ``chmod u+w`` (vim przy plikach z wieloma linkami) zmienia
+    treść we wszystkich projektach naraz. Dlatego dedup jest opcjonalny -
+    dla archiwów projektów, których nikt nie edytuje.
+    """
     import os
 
     os.makedirs(output_dir, exist_ok=True)
     architect = SimpleDreamArchitect()
+    if dedup:
+        architect.blob_store = BlobStore(os.path.join("projects", ".blobs"))
     results = {}
 
     for i, problem in enumerate(problems, 1):
@@ -1148,38 +1277,47 @@ def batch_generate(problems: List[str], output_dir: str = "batch_projects") -> D
             print(f"   ❌ Error: {str(e)}")
             results[problem] = []
 
+    if architect.blob_store is not None:
+        stats = architect.blob_store.stats()
+        print(f"\n💾 Written: {stats['bytes_written']} B, deduplicated: {stats['bytes_deduplicated']} B "
+              f"({stats['blobs']} unique files)")
+
     return results
 
 
-def list_projects() -> List[str]:
-    """Lista wygenerowanych projektów"""
-    import os
+_project_index = None
+
 
-    if not os.path.exists("projects"):
-        return []
+def project_index() -> ProjectIndex:
+    """Indeks projektów (projects/.index.db), otwierany przy pierwszym użyciu"""
+    global _project_index
+    if _project_index is None:
+        _project_index = ProjectIndex("projects")
+    return _project_index
 
-    projects = []
-    for item in os.listdir("projects"):
-        project_path = os.path.join("projects", item)
-        if os.path.isdir(project_path):
-            projects.append(item)
 
-    return sorted(projects)
+def list_projects(technology: str = None, component: str = None,
+                  since: str = None, text: str = None) -> List[str]:
+    """Lista wygenerowanych projektów
+
+    Korzysta z indeksu zamiast czytać project_info.json każdego projektu.
+    Filtry: technologia, komponent, data utworzenia (od, ISO) i fragment
+    opisu problemu.
+    """
+    return project_index().names(technology=technology, component=component,
+                                 since=since, text=text)
 
 
 def show_project_info(project_name: str):
     """Pokazuje informacje o projekcie"""
-    import os
-
-    info_file = os.path.join("projects", project_name, "project_info.json")
+    index = project_index()
+    index.refresh_if_stale()
+    info = index.get(project_name)
 
-    if not os.path.exists(info_file):
+    if info is None:
         print(f"❌ Project {project_name} not found")
         return
 
-    with open(info_file, 'r', encoding='utf-8') as f:
-        info = json.load(f)
-
     print(f"\n📁 Project: {project_name}")
     print(f"🎯 Problem: {info.get('problem', 'N/A')}")
     print(f"🕒 Created: {info.get('timestamp', 'N/A')}")
@@ -1188,6 +1326,22 @@ def show_project_info(project_name: str):
     print(f"📄 Files: {', '.join(info.get('files', []))}")
 
 
+def parse_list_filters(args: str) -> Dict[str, str]:
+    """Parsuje filtry komendy list: tech=..., component=..., since=..., reszta to tekst"""
+    aliases = {"tech": "technology", "technology": "technology",
+               "component": "component", "since": "since"}
+    filters, words = {}, []
+    for word in args.split():
+        key, sep, value = word.partition("=")
+        if sep and key.lower() in aliases:
+            filters[aliases[key.lower()]] = value
+        else:
+            words.append(word)
+    if words:
+        filters["text"] = " ".join(words)
+    return filters
+
+
 # Enhanced CLI with project management
 def enhanced_cli():
     """Enhanced CLI z project management"""
@@ -1216,8 +1370,9 @@ def enhanced_cli():
         print("\n" + "=" * 50)
         print("Commands:")
         print("  dream <problem>  - Generate new solution")
-        print("  batch           - Generate multiple solutions")
-        print("  list            - List all projects")
+        print("  batch [--dedup] - Generate multiple solutions (--dedup: hardlink shared files)")
+        print("  list [filters]  - List projects (tech=, component=, since=, text)")
+        print("  reindex         - Rebuild project index from disk")
         print("  show <project>  - Show project info")
         print("  quit            - Exit")
 
@@ -1266,11 +1421,11 @@ def enhanced_cli():
                 problems.append(problem)
 
             if problems:
-                results = batch_generate(problems)
+                results = batch_generate(problems, dedup=len(parts) > 1 and parts[1].strip() == "--dedup")
                 print(f"\n✅ Generated {len([r for r in results.values() if r])} projects")
 
         elif cmd == "list":
-            projects = list_projects()
+            projects = list_projects(**parse_list_filters(parts[1] if len(parts) > 1 else ""))
             if projects:
                 print(f"\n📁 Projects ({len(projects)}):")
                 for project in projects:
@@ -1281,6 +1436,10 @@ def enhanced_cli():
         elif cmd == "show" and len(parts) > 1:
             show_project_info(parts[1])
 
+        elif cmd == "reindex":
+            count = project_index().rebuild()
+            print(f"\n🔄 Indexed {count} projects")
+
         else:
             print("❌ Unknown command or missing arguments")
 
@@ -1289,6 +1448,11 @@ def enhanced_cli():
 if __name__ == "__main__":
     import sys
 
+    # --stand-in: odpowiedzi generowane lokalnie, bez serwera Ollama
+    if "--stand-in" in sys.argv:
+        sys.argv.remove("--stand-in")
+        os.environ["INCEPTOR_BACKEND"] = "stand-in"
+
     if len(sys.argv) > 1:
         # Command line usage
         problem = " ".join(sys.argv[1:])
@@ -20,7 +20,8 @@ from .core import (
     Task,
     ArchitectureLevel,
     quick_solution,
-    analyze_context
+    analyze_context,
+    analyze_context_stream
 )
 
 __all__ = [
@@ -35,5 +36,6 @@ __all__ = [
     'Task',
     'ArchitectureLevel',
     'quick_solution',
-    'analyze_context'
+    'analyze_context',
+    'analyze_context_stream'
 ]
\ No newline at end of file
@@ -7,13 +7,14 @@ import json
 import os
 import subprocess
 import sys
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pathlib import Path
-from dataclasses import asdict
 from typing import Optional, Dict, Any, List, Union, cast
 
 # Third-party imports
 import click
+import requests
 import yaml
 from rich.console import Console
 from rich.panel import Panel
@@ -25,21 +26,161 @@ from rich.tree import Tree
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 # Local application imports
-from .core import DreamArchitect
-from .core.models import Solution, Level, Component, Relationship
+from .core import (ContextExtractor, CorpusAnalyzer, DreamArchitect, LazySolution, ProjectExporter, PromptTemplates,
+                   SemanticCache, SolutionStore, analyze_context, analyze_context_stream, create_client,
+                   open_solution, quick_solution, save_solution, solution_files)
+from .core.load_test import LoadStep, LoadTester, load_problems
+from .core.stats import latency_summary
+from .core.profiling import InceptionProfiler, profile_inception
+from .core.routing import ModelRouter
+from .core.scheduler import PRIORITIES, RequestScheduler
+from .core.speculative import SpeculativeGenerator
+from .core.stand_in import BACKENDS
+from .core.models import Solution
 
 # Initialize console for rich output
 console = Console()
 
+# Shell save/load names with one of these suffixes are standalone files
+SOLUTION_FILE_SUFFIXES = ('.isol', '.json', '.yaml', '.yml')
+
 
 class CLI:
     """Command Line Interface for Inceptor"""
+
+    DEFAULT_CONFIG: Dict[str, Any] = {
+        'default_levels': 3,
+        'ollama_url': 'http://localhost:11434',
+        # 'stand-in' answers in-process (recorded or synthetic responses)
+        'backend': 'ollama',
+        'stand_in_responses': None,
+        # Maximum prompt size in tokens; larger specs and code are trimmed
+        'prompt_budget': None,
+        # Directory of template files overriding level prompts (limbo.txt, ...)
+        'prompt_templates': None,
+        # Model per level/complexity/prompt size with fallbacks (see ModelRouter),
+        # e.g. {'default': 'mistral:7b', 'levels': {'limbo': 'llama3.2:3b'}}
+        'routing': None,
+        # How long Ollama keeps models loaded (e.g. '30m'); pings keep them
+        # warm during shell sessions and runs
+        'keep_alive': None,
+        'keep_warm': True,
+        # Parallel candidates per level, first valid response wins (see
+        # SpeculativeGenerator), e.g. {'levels': {'limbo': 3}}
+        'speculation': None,
+    }
     
     def __init__(self) -> None:
-        self.architect = DreamArchitect()
+        self.workspace_dir: Path = Path.home() / ".inceptor"
+        self.config: Dict[str, Any] = self.load_config()
+        self.architect = self.create_architect()
         self.current_solution: Optional[Solution] = None
         self.history: List[Dict[str, Any]] = []
-        self.workspace_dir: Path = Path.home() / ".inceptor"
+
+    def create_architect(self, backend: Optional[str] = None, responses: Optional[str] = None,
+                         record: Optional[str] = None, replay: Optional[str] = None,
+                         replay_speed: float = 1.0, **options: Any) -> DreamArchitect:
+        """Build a DreamArchitect for the configured (or given) model backend"""
+        if replay:
+            client = create_client('replay', responses=replay, record=record, speed=replay_speed)
+        else:
+            client = create_client(
+                backend or os.environ.get('INCEPTOR_BACKEND') or self.config.get('backend'),
+                base_url=self.config.get('ollama_url', self.DEFAULT_CONFIG['ollama_url']),
+                responses=responses or self.config.get('stand_in_responses'),
+                record=record,
+                keep_alive=self.config.get('keep_alive'),
+                **options
+            )
+        templates = self.config.get('prompt_templates')
+        routing = self.config.get('routing')
+        speculation = self.config.get('speculation')
+        return DreamArchitect(client=client, prompt_budget=self.config.get('prompt_budget'),
+                              templates=PromptTemplates.from_directory(templates) if templates else PromptTemplates,
+                              router=ModelRouter.from_config(routing) if routing else None,
+                              speculation=SpeculativeGenerator.from_config(speculation) if speculation else None)
+
+    def load_config(self) -> Dict[str, Any]:
+        """Load config.yaml from the workspace, falling back to defaults"""
+        config = dict(self.DEFAULT_CONFIG)
+        config_path = self.workspace_dir / "config.yaml"
+        if config_path.exists():
+            with open(config_path, 'r') as f:
+                config.update(yaml.safe_load(f) or {})
+        return config
+
+    def save_config(self, config: Dict[str, Any]) -> None:
+        """Write config.yaml to the workspace"""
+        self.workspace_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.workspace_dir / "config.yaml", 'w') as f:
+            yaml.dump(config, f, default_flow_style=False)
+
+    def add_to_history(self, command: str, result: Any) -> None:
+        """Record a shell command and whether it produced a result"""
+        self.history.append({
+            'timestamp': datetime.now().isoformat(),
+            'command': command,
+            'success': result is not None
+        })
+
+
+@contextmanager
+def closing_trace(architect: DreamArchitect):
+    """Close the architect's trace recorder (if recording) when done"""
+    try:
+        yield
+    finally:
+        recorder = getattr(architect.ollama, 'recorder', None)
+        if recorder is not None:
+            recorder.close()
+
+
+def keeping_warm(architect: DreamArchitect, enabled: bool = True):
+    """Keep the architect's models loaded on the server while the block runs"""
+    client = getattr(architect.ollama, 'backend', architect.ollama)
+    if not enabled or not hasattr(client, 'keep_warm'):
+        return nullcontext()
+    models = architect.router.models() if architect.router is not None else [client.model]
+    return client.keep_warm(models)
+
+
+def show_profile(profiler: InceptionProfiler, output: str, top: int) -> None:
+    """Print a profile summary and save the profile files"""
+    console.print(profiler.summary(top), markup=False, highlight=False, soft_wrap=True)
+    for kind, path in profiler.save(output).items():
+        console.print(f"📈 {kind} profile saved to {path}")
+
+
+def show_model_stats(architect: DreamArchitect) -> None:
+    """Print per-model request statistics of a routed architect"""
+    stats = architect.router.stats() if architect.router is not None else {}
+    if not stats:
+        return
+    table = Table(title="Models")
+    table.add_column("Model", style="cyan")
+    for column in ("Req", "Err", "Fallback", "Mean s", "p95 s", "In tok", "Out tok"):
+        table.add_column(column, justify="right", style="green")
+    for model, row in stats.items():
+        table.add_row(model, str(row['requests']), str(row['errors']), str(row['fallbacks']),
+                      f"{row['mean_latency']:.3f}", f"{row['p95_latency']:.3f}", str(row['prompt_tokens']),
+                      str(row['completion_tokens']))
+    console.print(table)
+
+
+def show_speculation_stats(architect: DreamArchitect) -> None:
+    """Print the cost and benefit of speculative generation per level"""
+    stats = architect.speculation.stats() if architect.speculation is not None else {}
+    if not stats:
+        return
+    table = Table(title="Speculation")
+    table.add_column("Level", style="cyan")
+    for column in ("Races", "Sent", "Failed", "Bad 1st", "+In tok", "+Out tok", "Saved s"):
+        table.add_column(column, justify="right", style="green")
+    for level, row in stats.items():
+        table.add_row(level, str(row['races']), str(row['candidates']), str(row['failures']),
+                      str(row['primary_failures']), str(row['extra_prompt_tokens']),
+                      str(row['extra_completion_tokens']), f"{row['latency_saved']:.3f}")
+    console.print(table)
 
 
 def print_help() -> None:
@@ -101,8 +242,24 @@ def shell() -> None:
     click.echo("Goodbye!")
 
 
-if __name__ == "__main__":
-    cli()
+class DreamShell:
+    """Interactive Dream Architect shell"""
+
+    def __init__(self) -> None:
+        self.cli = CLI()
+        self.current_solution: Optional[Solution] = None
+        self.workspace: Path = self.cli.workspace_dir
+        self.workspace.mkdir(parents=True, exist_ok=True)
+        self.store = SolutionStore(self.workspace / "solutions.db")
+
+    def show_banner(self) -> None:
+        """Print the welcome banner"""
+        console.print(Panel(
+            "[bold]🌀 Dream Architect Shell[/bold]\n"
+            "Multi-level solution architecture generator. Type 'help' for commands.",
+            border_style="blue"
+        ))
+
     def cmd_help(self) -> None:
         """Show help"""
         table = Table(title="Available Commands")
@@ -116,9 +273,10 @@ if __name__ == "__main__":
             ("context <text>", "Analyze context from text", "context 'urgent Python security audit'"),
             ("levels <1-5>", "Set architecture depth", "levels 4"),
             ("show", "Display current solution", "show"),
-            ("save [name]", "Save solution to file", "save my_logging_system"),
-            ("load <name>", "Load solution from file", "load my_logging_system"),
-            ("export <format>", "Export (json/yaml/files)", "export files"),
+            ("save [name]", "Save solution (name.isol/.json/.yaml for a file)", "save my_logging_system"),
+            ("load <name>", "Load saved solution", "load my_logging_system"),
+            ("search <query>", "Search saved solutions", "search flask logging"),
+            ("export <format>", "Export (json/yaml/bin/files/zip/tar)", "export zip"),
             ("workspace", "Open workspace directory", "workspace"),
             ("history", "Show command history", "history"),
             ("config", "Show/edit configuration", "config"),
@@ -208,7 +366,7 @@ if __name__ == "__main__":
             self.show_solution_detail(detail)
 
     def cmd_save(self, name: str = None) -> None:
-        """Save current solution"""
+        """Save current solution to the workspace store"""
         if not self.current_solution:
             console.print("❌ No solution to save.", style="red")
             return
@@ -216,59 +374,101 @@ if __name__ == "__main__":
         if not name:
             name = Prompt.ask("Enter solution name", default=f"solution_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
 
-        save_path = self.workspace / f"{name}.yaml"
+        if Path(name).suffix.lower() in SOLUTION_FILE_SUFFIXES:
+            # Explicit file name: write a standalone file (.isol is binary)
+            save_path = self.workspace / name
+            save_solution(self.full_solution(), save_path)
+            console.print(f"✅ Solution saved to: [bold]{save_path}[/bold]")
+            return
+
+        changed = self.store.save(name, self.current_solution)
 
-        with open(save_path, 'w') as f:
-            yaml.dump(asdict(self.current_solution), f, default_flow_style=False)
+        console.print(f"✅ Solution saved as: [bold]{name}[/bold] ({changed} records updated)")
 
-        console.print(f"✅ Solution saved to: [bold]{save_path}[/bold]")
+    def show_solution_list(self, solutions: List[Dict[str, Any]], title: str) -> None:
+        """Print a table of stored solutions"""
+        table = Table(title=title)
+        table.add_column("Name", style="cyan")
+        table.add_column("Problem", style="white")
+        table.add_column("Modified", style="white")
+
+        for sol in solutions:
+            table.add_row(
+                sol['name'],
+                sol['problem'][:60] + ('...' if len(sol['problem']) > 60 else ''),
+                datetime.fromtimestamp(sol['modified']).strftime('%Y-%m-%d %H:%M')
+            )
+
+        console.print(table)
 
     def cmd_load(self, name: str) -> None:
-        """Load solution from file"""
+        """Load solution from the workspace store"""
         if not name:
-            # Show available solutions
-            solutions = list(self.workspace.glob("*.yaml"))
+            # Show the most recent solutions
+            solutions = self.store.list(limit=20)
             if not solutions:
                 console.print("❌ No saved solutions found.", style="red")
                 return
 
-            table = Table(title="Saved Solutions")
-            table.add_column("Name", style="cyan")
-            table.add_column("Modified", style="white")
-
-            for sol in solutions:
-                table.add_row(sol.stem, datetime.fromtimestamp(sol.stat().st_mtime).strftime('%Y-%m-%d %H:%M'))
-
-            console.print(table)
+            total = self.store.count()
+            title = "Saved Solutions" if total <= len(solutions) else f"Saved Solutions (20 most recent of {total})"
+            self.show_solution_list(solutions, title)
             name = Prompt.ask("Enter solution name to load")
 
-        load_path = self.workspace / f"{name}.yaml"
-
-        if not load_path.exists():
-            console.print(f"❌ Solution '{name}' not found.", style="red")
+        if Path(name).suffix.lower() in SOLUTION_FILE_SUFFIXES:
+            load_path = self.workspace / name
+            if not load_path.exists():
+                console.print(f"❌ Solution file '{name}' not found.", style="red")
+                return
+            # .isol files are memory-mapped; levels are decoded when shown
+            if isinstance(self.current_solution, LazySolution):
+                self.current_solution.close()
+            self.current_solution = open_solution(load_path)
+            console.print(f"✅ Solution '{name}' loaded.")
             return
 
-        with open(load_path, 'r') as f:
-            data = yaml.safe_load(f)
-            # Reconstruct Solution object (simplified)
-            self.current_solution = type('Solution', (), data)
+        solution = self.store.load(name)
+
+        if solution is None:
+            # Solutions saved by older versions are YAML files in the workspace
+            legacy_path = self.workspace / f"{name}.yaml"
+            if not legacy_path.exists():
+                console.print(f"❌ Solution '{name}' not found.", style="red")
+                return
+            with open(legacy_path, 'r') as f:
+                solution = Solution.from_dict(yaml.safe_load(f))
+            self.store.save(name, solution)
 
+        self.current_solution = solution
         console.print(f"✅ Solution '{name}' loaded.")
 
+    def cmd_search(self, query: str) -> None:
+        """Full-text search over saved solutions"""
+        results = self.store.search(query)
+        if not results:
+            console.print(f"❌ No solutions match '{query}'.", style="red")
+            return
+
+        self.show_solution_list(results, f"Solutions matching '{query}'")
+
     def cmd_export(self, format_type: str = "json") -> None:
         """Export current solution"""
         if not self.current_solution:
             console.print("❌ No solution to export.", style="red")
             return
 
-        if format_type == "files":
-            self.export_implementation_files()
+        if format_type in ("files", "zip", "tar"):
+            self.export_implementation_files(format_type)
         elif format_type == "json":
-            output = json.dumps(asdict(self.current_solution), indent=2)
+            output = json.dumps(self.full_solution().to_dict(), indent=2)
             console.print(Syntax(output, "json"))
         elif format_type == "yaml":
-            output = yaml.dump(asdict(self.current_solution), default_flow_style=False)
+            output = yaml.dump(self.full_solution().to_dict(), default_flow_style=False)
             console.print(Syntax(output, "yaml"))
+        elif format_type == "bin":
+            export_path = self.workspace / f"solution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.isol"
+            save_solution(self.full_solution(), export_path)
+            console.print(f"✅ Solution exported to: [bold]{export_path}[/bold]")
         else:
             console.print(f"❌ Unknown format: {format_type}")
 
@@ -319,6 +519,10 @@ if __name__ == "__main__":
             console.print("✅ Ollama connection: [green]OK[/green]")
             console.print(f"📍 URL: {self.cli.architect.ollama.base_url}")
             console.print(f"🤖 Model: {self.cli.architect.ollama.model}")
+            timings = getattr(self.cli.architect.ollama, 'model_timings', dict)()
+            for model, timing in timings.items():
+                console.print(f"⏱️ {model}: load {timing['load_seconds']:.2f}s ({timing['cold_starts']} cold), "
+                              f"generation {timing['prompt_eval_seconds'] + timing['eval_seconds']:.2f}s")
         except Exception as e:
             console.print("❌ Ollama connection: [red]FAILED[/red]")
             console.print(f"Error: {str(e)}")
@@ -333,6 +537,12 @@ if __name__ == "__main__":
         self.cli.save_config(self.cli.config)
         console.print(f"✅ Default levels set to: {levels}")
 
+    def full_solution(self) -> Solution:
+        """Current solution with every level decoded"""
+        if isinstance(self.current_solution, LazySolution):
+            return self.current_solution.to_solution()
+        return self.current_solution
+
     def show_solution_summary(self) -> None:
         """Display solution summary"""
         if not self.current_solution:
@@ -342,13 +552,16 @@ if __name__ == "__main__":
         tree = Tree("🏗️ Architecture Overview")
 
         if hasattr(self.current_solution, 'architecture') and self.current_solution.architecture:
-            for level, data in self.current_solution.architecture.items():
+            # Only LIMBO is rendered, so only LIMBO is read (matters for lazily loaded solutions)
+            for level in self.current_solution.architecture:
                 level_tree = tree.add(f"📊 {level.upper()}")
 
-                if level == 'limbo' and 'components' in data:
-                    components_tree = level_tree.add("Components")
-                    for comp in data['components']:
-                        components_tree.add(f"• {comp.get('name', 'Unknown')} ({comp.get('priority', 'N/A')})")
+                if level == 'limbo':
+                    data = self.current_solution.architecture[level]
+                    if 'components' in data:
+                        components_tree = level_tree.add("Components")
+                        for comp in data['components']:
+                            components_tree.add(f"• {comp.get('name', 'Unknown')} ({comp.get('priority', 'N/A')})")
 
         console.print(tree)
 
@@ -358,24 +571,31 @@ if __name__ == "__main__":
             return
 
         if level == "all":
-            data = asdict(self.current_solution)
+            data = self.full_solution().to_dict()
+        elif level in self.current_solution.architecture:
+            data = self.current_solution.architecture[level]
         else:
-            data = self.current_solution.architecture.get(level, {})
+            data = self.current_solution.implementation.get(level, {})
 
         console.print(Panel(JSON(json.dumps(data, indent=2)), title=f"{level.upper()} Details"))
 
-    def export_implementation_files(self) -> None:
-        """Export implementation files to workspace"""
-        if not hasattr(self.current_solution, 'implementation'):
+    def export_implementation_files(self, format_type: str = "files") -> None:
+        """Export implementation files to workspace as a directory or zip/tar archive"""
+        if not getattr(self.current_solution, 'implementation', None):
             console.print("❌ No implementation to export.", style="red")
             return
 
-        export_dir = self.workspace / f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        export_dir.mkdir(exist_ok=True)
+        files = solution_files(self.full_solution())
+        export_name = f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        exporter = ProjectExporter()
 
-        # This would need to be implemented based on the actual structure
-        # of the implementation data from the DreamArchitect
-        console.print(f"📁 Files would be exported to: {export_dir}")
+        if format_type == "files":
+            exporter.export_dir(files, self.workspace / export_name)
+            console.print(f"📁 {len(files)} files exported to: [bold]{self.workspace / export_name}[/bold]")
+        else:
+            archive = self.workspace / (f"{export_name}.zip" if format_type == "zip" else f"{export_name}.tar.gz")
+            exporter.export_archive(files, archive, root=export_name)
+            console.print(f"📦 {len(files)} files exported to: [bold]{archive}[/bold]")
 
     def edit_config(self) -> None:
         """Interactive configuration editor"""
@@ -399,7 +619,11 @@ if __name__ == "__main__":
     def run(self) -> None:
         """Main shell loop"""
         self.show_banner()
+        with keeping_warm(self.cli.architect, self.cli.config.get('keep_warm', True)):
+            self.loop()
 
+    def loop(self) -> None:
+        """Read and run commands until exit"""
         while True:
             try:
                 command = Prompt.ask("[bold blue]dream>[/bold blue]").strip()
@@ -435,6 +659,11 @@ if __name__ == "__main__":
                 elif cmd == 'load':
                     name = args[0] if args else None
                     self.cmd_load(name)
+                elif cmd == 'search':
+                    if not args:
+                        console.print("❌ Please provide a search query", style="red")
+                        continue
+                    self.cmd_search(' '.join(args))
                 elif cmd == 'export':
                     format_type = args[0] if args else 'json'
                     self.cmd_export(format_type)
@@ -482,32 +711,84 @@ def shell():
 @click.argument('problem')
 @click.option('--levels', '-l', default=3, help='Architecture depth (1-5)')
 @click.option('--output', '-o', type=click.Choice(['json', 'yaml', 'summary']), default='summary')
-def dream(problem: str, levels: Optional[int], output: Optional[str]) -> int:
+@click.option('--semantic-cache', is_flag=True, help='Reuse LIMBO/DREAM results of similar past problems')
+@click.option('--similarity', type=click.FloatRange(0, 1), default=0.92, help='Semantic cache hit threshold')
+@click.option('--backend', type=click.Choice(BACKENDS), default=None,
+              help='Model backend (default: $INCEPTOR_BACKEND, then config)')
+@click.option('--responses', type=click.Path(exists=True, dir_okay=False),
+              help='Recorded responses for the stand-in backend (JSON or JSON lines)')
+@click.option('--record', type=click.Path(dir_okay=False, writable=True),
+              help='Record model requests and responses with timing to this trace (.gz to compress)')
+@click.option('--replay', type=click.Path(exists=True, dir_okay=False),
+              help='Serve model responses from a recorded trace instead of a backend')
+@click.option('--replay-speed', type=click.FloatRange(min=0), default=1.0,
+              help='Replay latency divisor (1 = recorded timing, 0 = no delay)')
+@click.option('--profile', is_flag=True, help='Profile the run: model wait vs local CPU, top functions')
+@click.option('--profile-output', type=click.Path(dir_okay=False), default='inceptor-profile',
+              help='Profile file prefix (.prof for pstats, .folded for flame graphs)')
+@click.option('--profile-top', type=click.IntRange(min=1), default=15, help='Functions to show in the profile summary')
+def dream(problem: str, levels: Optional[int], output: Optional[str], semantic_cache: bool, similarity: float,
+          backend: Optional[str], responses: Optional[str], record: Optional[str], replay: Optional[str],
+          replay_speed: float, profile: bool, profile_output: str, profile_top: int) -> int:
     """Generate solution architecture
     
     Args:
         problem: The problem description to generate a solution for
         levels: Number of architecture levels to generate
         output: Optional output file path to save the solution
+        semantic_cache: Use the semantic cache stored in ~/.inceptor
+        similarity: Minimum cosine similarity for a cache hit
+        backend: Model backend ('ollama', 'stand-in' or 'replay')
+        responses: Recorded responses file for the stand-in backend
+        record: Trace file to record model traffic to
+        replay: Trace file to replay model responses from
+        replay_speed: Replay latency divisor
+        profile: Profile the orchestration and print a summary
+        profile_output: Prefix of the profile files
+        profile_top: Functions listed in the profile summary
         
     Returns:
         int: Exit code (0 for success, 1 for error)
     """
-    architect = DreamArchitect()
+    try:
+        cli_obj = CLI()
+        architect = cli_obj.create_architect(backend, responses, record, replay, replay_speed)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    cache = None
+    if semantic_cache:
+        try:
+            cache = SemanticCache(architect.ollama, threshold=similarity,
+                                  path=Path.home() / ".inceptor" / "semantic_cache")
+        except ImportError as e:
+            console.print(f"❌ Error: {str(e)}", style="red")
+            sys.exit(1)
+        architect.semantic_cache = cache
 
     console.print(f"🌀 Generating {levels}-level architecture...")
 
     try:
-        solution = architect.inception(problem, max_levels=levels)
+        profiler = profile_inception(architect) if profile else nullcontext()
+        with closing_trace(architect), keeping_warm(architect, cli_obj.config.get('keep_warm', True)), profiler:
+            solution = architect.inception(problem, max_levels=levels)
+        if profile:
+            show_profile(profiler, profile_output, profile_top)
+        if cache is not None:
+            cache.save()
+            hit = solution.metadata.get("semantic_cache")
+            if hit:
+                console.print(f"♻️ Reused LIMBO/DREAM from: {hit['source_problem']} (similarity {hit['similarity']})")
 
         if output == 'json':
-            console.print(JSON(json.dumps(asdict(solution), indent=2)))
+            console.print(JSON(json.dumps(solution.to_dict(), indent=2)))
         elif output == 'yaml':
-            console.print(Syntax(yaml.dump(asdict(solution), default_flow_style=False), "yaml"))
+            console.print(Syntax(yaml.dump(solution.to_dict(), default_flow_style=False), "yaml"))
         else:
             console.print(f"✅ Solution generated for: [bold]{problem}[/bold]")
             console.print(f"📊 Levels: {levels}")
             console.print(f"🏗️ Components: {len(solution.architecture.get('limbo', {}).get('components', []))}")
+            show_model_stats(architect)
+            show_speculation_stats(architect)
 
     except Exception as e:
         console.print(f"❌ Error: {str(e)}", style="red")
@@ -515,10 +796,24 @@ def dream(problem: str, levels: Optional[int], output: Optional[str]) -> int:
 
 
 @cli.command()
-@click.argument('text')
-def context(text):
-    """Analyze context from text"""
-    result = analyze_context(text)
+@click.argument('text', required=False)
+@click.option('--file', '-f', 'file_path', type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+              help='Read text from a file instead ("-" for stdin)')
+def context(text: Optional[str], file_path: Optional[str]) -> None:
+    """Analyze context from text, a file or stdin
+
+    Files and stdin are streamed, so large documents and log dumps
+    are analyzed without being loaded into memory at once.
+    """
+    if file_path == '-':
+        with click.open_file('-', 'rb') as stdin:
+            result = analyze_context_stream(stdin)
+    elif file_path:
+        result = analyze_context_stream(file_path)
+    elif text:
+        result = analyze_context(text)
+    else:
+        raise click.UsageError("Provide TEXT or --file")
 
     table = Table(title="Context Analysis")
     table.add_column("Category", style="cyan")
@@ -531,12 +826,114 @@ def context(text):
     console.print(table)
 
 
+@cli.command()
+@click.option('--file', '-f', 'files', multiple=True, type=click.Path(exists=True, dir_okay=False),
+              help='Pattern config file (YAML/JSON) to add')
+@click.option('--profile', 'sample', type=click.Path(exists=True, dir_okay=False),
+              help='Measure per-pattern match cost on this sample text')
+@click.option('--top', type=int, default=15, help='Patterns to show when profiling')
+def patterns(files: List[str], sample: Optional[str], top: int) -> None:
+    """Show context patterns and their match cost
+
+    Extra pattern files can also be set with $INCEPTOR_PATTERN_FILES.
+    """
+    for path in files:
+        try:
+            ContextExtractor.load_patterns(path)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--file')
+
+    if sample:
+        with open(sample, 'r', encoding='utf-8', errors='replace') as f:
+            costs = ContextExtractor.profile_patterns(f.read())
+
+        table = Table(title="Pattern Match Cost")
+        table.add_column("Category", style="cyan")
+        table.add_column("Pattern", style="white")
+        table.add_column("Source", style="white")
+        table.add_column("Matches", justify="right")
+        table.add_column("ms", style="green", justify="right")
+        for cost in costs[:top]:
+            table.add_row(cost.category, cost.pattern, cost.source, str(cost.matches), f"{cost.seconds * 1000:.2f}")
+        console.print(table)
+        return
+
+    table = Table(title="Context Patterns")
+    table.add_column("Category", style="cyan")
+    table.add_column("Patterns", justify="right")
+    table.add_column("Sources", style="white")
+    for category, entries in ContextExtractor.registry.sources(ContextExtractor.CONTEXT_PATTERNS).items():
+        table.add_row(category, str(len(entries)), ", ".join(sorted({source for _, source in entries})))
+    console.print(table)
+
+
+@cli.command()
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--lines', is_flag=True, help='Treat every line of a file as a separate document')
+@click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: CPU count)')
+@click.option('--batch-size', type=int, default=64, help='Documents per work unit')
+@click.option('--jsonl', 'jsonl_path', type=click.Path(dir_okay=False, writable=True),
+              help='Write per-document results as JSON lines')
+@click.option('--top', type=int, default=10, help='Terms to show per category')
+def corpus(paths: List[str], lines: bool, workers: Optional[int], batch_size: int,
+           jsonl_path: Optional[str], top: int) -> None:
+    """Analyze context across a corpus of files
+
+    Files (directories are walked recursively) are spread over a
+    process pool; the result is a category/term document-frequency
+    table and a throughput report.
+    """
+    analyzer = CorpusAnalyzer(workers=workers, batch_size=batch_size)
+    jsonl = open(jsonl_path, 'w', encoding='utf-8') if jsonl_path else None
+
+    try:
+        with console.status("[bold green]Analyzing corpus..."):
+            if lines:
+                report = analyzer.analyze(CorpusAnalyzer.iter_lines(paths), jsonl=jsonl)
+            else:
+                report = analyzer.analyze_files(paths, jsonl=jsonl)
+    finally:
+        if jsonl:
+            jsonl.close()
+
+    table = Table(title="Corpus Context Frequencies")
+    table.add_column("Category", style="cyan")
+    table.add_column("Documents", style="white", justify="right")
+    table.add_column("Top terms", style="green")
+
+    for category, count in report.category_counts.most_common():
+        terms = ", ".join(f"{term} ({n})" for term, n in report.top_terms(category, top))
+        table.add_row(category.title(), str(count), terms)
+
+    console.print(table)
+    console.print(f"📄 Documents: {report.documents} ({report.errors} errors)")
+    console.print(f"⏱️ {report.elapsed:.2f}s — {report.docs_per_second:.1f} documents/sec")
+    if jsonl_path:
+        console.print(f"✅ Per-document results saved to {jsonl_path}")
+
+
 @cli.command()
 @click.argument('problem')
 @click.option('--context', '-c', help='JSON context for the generation')
 @click.option('--levels', '-l', type=int, default=3, help='Number of architecture levels (1-5)')
-@click.option('--output', '-o', type=click.Path(), help='Output file path')
-def generate(problem: str, context: Optional[str], levels: int, output: Optional[str]) -> int:
+@click.option('--output', '-o', type=click.Path(), help='Output file path (.isol for the binary format, .yaml or .json)')
+@click.option('--backend', type=click.Choice(BACKENDS), default=None,
+              help='Model backend (default: $INCEPTOR_BACKEND, then config)')
+@click.option('--responses', type=click.Path(exists=True, dir_okay=False),
+              help='Recorded responses for the stand-in backend (JSON or JSON lines)')
+@click.option('--record', type=click.Path(dir_okay=False, writable=True),
+              help='Record model requests and responses with timing to this trace (.gz to compress)')
+@click.option('--replay', type=click.Path(exists=True, dir_okay=False),
+              help='Serve model responses from a recorded trace instead of a backend')
+@click.option('--replay-speed', type=click.FloatRange(min=0), default=1.0,
+              help='Replay latency divisor (1 = recorded timing, 0 = no delay)')
+@click.option('--profile', is_flag=True, help='Profile the run: model wait vs local CPU, top functions')
+@click.option('--profile-output', type=click.Path(dir_okay=False), default='inceptor-profile',
+              help='Profile file prefix (.prof for pstats, .folded for flame graphs)')
+@click.option('--profile-top', type=click.IntRange(min=1), default=15, help='Functions to show in the profile summary')
+def generate(problem: str, context: Optional[str], levels: int, output: Optional[str],
+             backend: Optional[str], responses: Optional[str], record: Optional[str], replay: Optional[str],
+             replay_speed: float, profile: bool, profile_output: str, profile_top: int) -> int:
     """Generate solution architecture with custom context
     
     Example:
@@ -548,11 +945,24 @@ def generate(problem: str, context: Optional[str], levels: int, output: Optional
         context: Optional JSON string containing additional context
         levels: Number of architecture levels to generate (1-5)
         output: Optional output file path to save the solution
+        backend: Model backend ('ollama', 'stand-in' or 'replay')
+        responses: Recorded responses file for the stand-in backend
+        record: Trace file to record model traffic to
+        replay: Trace file to replay model responses from
+        replay_speed: Replay latency divisor
+        profile: Profile the orchestration and print a summary
+        profile_output: Prefix of the profile files
+        profile_top: Functions listed in the profile summary
         
     Returns:
         int: Exit code (0 for success, 1 for error)
     """
     cli = CLI()
+    if backend or responses or record or replay:
+        try:
+            cli.architect = cli.create_architect(backend, responses, record, replay, replay_speed)
+        except ValueError as e:
+            raise click.UsageError(str(e))
     
     try:
         # Parse context if provided
@@ -565,21 +975,25 @@ def generate(problem: str, context: Optional[str], levels: int, output: Optional
                 return 1
         
         # Generate solution
-        with console.status("[bold green]Generating solution..."):
+        profiler = profile_inception(cli.architect) if profile else nullcontext()
+        with console.status("[bold green]Generating solution..."), closing_trace(cli.architect), \
+                keeping_warm(cli.architect, cli.config.get('keep_warm', True)), profiler:
             solution = cli.architect.inception(
-                problem=problem,
-                context=context_dict,
-                levels=levels
+                problem,
+                max_levels=levels,
+                additional_context=context_dict
             )
+        if profile:
+            show_profile(profiler, profile_output, profile_top)
         
         # Output results
         if output:
-            with open(output, 'w') as f:
-                json.dump(asdict(solution), f, indent=2)
+            # .isol writes the binary format, .yaml/.yml YAML, anything else JSON
+            save_solution(solution, output)
             console.print(f"✅ Solution saved to {output}")
         else:
             console.print(Panel(
-                f"[bold green]Solution Architecture[/]\n\n{json.dumps(asdict(solution), indent=2)}",
+                f"[bold green]Solution Architecture[/]\n\n{json.dumps(solution.to_dict(), indent=2)}",
                 title="Generated Solution"
             ))
             
@@ -590,6 +1004,127 @@ def generate(problem: str, context: Optional[str], levels: int, output: Optional
         return 1
 
 
+@cli.command()
+@click.argument('corpus', type=click.Path(exists=True, dir_okay=False))
+@click.option('--levels', '-l', type=click.IntRange(3, 5), default=3, help='Architecture depth of each inception')
+@click.option('--concurrency', '-c', default='1,2,4,8,16', help='Comma-separated concurrency ramp')
+@click.option('--requests', '-n', 'requests_per_step', type=click.IntRange(min=1), default=None,
+              help='Inceptions per step (default: 2 per worker)')
+@click.option('--saturation-gain', type=click.FloatRange(min=0), default=0.1,
+              help='Throughput gain below which a step counts as saturated')
+@click.option('--backend', type=click.Choice(BACKENDS), default=None,
+              help='Model backend (default: $INCEPTOR_BACKEND, then config)')
+@click.option('--responses', type=click.Path(exists=True, dir_okay=False),
+              help='Recorded responses for the stand-in backend (JSON or JSON lines)')
+@click.option('--latency', type=click.FloatRange(min=0), default=0.0,
+              help='Seconds the stand-in backend takes per response')
+@click.option('--replay', type=click.Path(exists=True, dir_okay=False),
+              help='Serve model responses from a recorded trace instead of a backend')
+@click.option('--replay-speed', type=click.FloatRange(min=0), default=1.0,
+              help='Replay latency divisor (1 = recorded timing, 0 = no delay)')
+@click.option('--mix', default=None,
+              help='Priority classes per round through a shared scheduler, e.g. "interactive=1,batch=4"')
+@click.option('--slots', type=click.IntRange(min=1), default=1,
+              help='Requests the scheduler lets through to the backend at once (with --mix)')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False, writable=True),
+              help='Write the full report as JSON')
+def loadtest(corpus: str, levels: int, concurrency: str, requests_per_step: Optional[int], saturation_gain: float,
+             backend: Optional[str], responses: Optional[str], latency: float, replay: Optional[str],
+             replay_speed: float, mix: Optional[str], slots: int, json_path: Optional[str]) -> None:
+    """Ramp up concurrent inceptions and find the saturation point
+
+    CORPUS holds one problem per line. Every step shares one model
+    client, so the ramp shows how the backend behaves under N
+    simultaneous users: throughput, p50/p95/p99 latency per level and
+    error rate per step.
+
+    With --mix, requests go through a priority scheduler in front of the
+    backend and the report adds latency and queue wait per class.
+    """
+    try:
+        ramp = [int(value) for value in concurrency.split(',') if value.strip()]
+    except ValueError:
+        raise click.BadParameter("expected comma-separated integers", param_hint='--concurrency')
+    if not ramp or min(ramp) < 1:
+        raise click.BadParameter("concurrency values must be positive", param_hint='--concurrency')
+
+    priority_mix: Dict[str, int] = {}
+    for item in (mix or '').split(','):
+        if not item.strip():
+            continue
+        priority, _, count = item.partition('=')
+        priority = priority.strip()
+        if priority not in PRIORITIES or not count.strip().isdigit():
+            raise click.BadParameter(f"expected CLASS=COUNT with CLASS in {', '.join(PRIORITIES)}",
+                                     param_hint='--mix')
+        priority_mix[priority] = int(count)
+
+    # Only the stand-in backend takes a latency
+    options = {'latency': latency} if latency else {}
+    try:
+        architect = CLI().create_architect(backend, responses, replay=replay, replay_speed=replay_speed, **options)
+        if priority_mix:
+            architect.ollama = RequestScheduler(architect.ollama, max_concurrency=slots)
+        tester = LoadTester(architect, load_problems(corpus), max_levels=levels, mix=priority_mix)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    def show_step(step: LoadStep) -> None:
+        summary = latency_summary(step.latencies)
+        console.print(f"⚡ {step.concurrency:>4} workers: {step.throughput:8.2f}/s  "
+                      f"p50 {summary['p50']:.3f}s  p95 {summary['p95']:.3f}s  p99 {summary['p99']:.3f}s  "
+                      f"errors {step.error_rate:.1%}"
+                      + (f"  limit {step.backend['limit']}" if step.backend.get('limit') else ""))
+
+    report = tester.ramp(ramp, requests_per_step, saturation_gain=saturation_gain, on_step=show_step)
+
+    table = Table(title="Latency per Level (seconds)")
+    table.add_column("Workers", justify="right")
+    table.add_column("Level", style="cyan")
+    for column in ("p50", "p95", "p99"):
+        table.add_column(column, justify="right", style="green")
+    for step in report.steps:
+        for level, values in step.level_latencies.items():
+            summary = latency_summary(values)
+            table.add_row(str(step.concurrency), level, *(f"{summary[q]:.3f}" for q in ("p50", "p95", "p99")))
+    console.print(table)
+
+    if priority_mix:
+        table = Table(title="Latency and Queue Wait per Priority Class (seconds)")
+        table.add_column("Workers", justify="right")
+        table.add_column("Class", style="cyan")
+        for column in ("p50", "p95", "wait p50", "wait p95", "aged"):
+            table.add_column(column, justify="right", style="green")
+        for step in report.steps:
+            for priority, values in step.class_latencies.items():
+                summary = latency_summary(values)
+                wait = step.queue_waits.get(priority, {})
+                table.add_row(str(step.concurrency), priority, f"{summary['p50']:.3f}", f"{summary['p95']:.3f}",
+                              f"{wait.get('p50_wait', 0.0):.3f}", f"{wait.get('p95_wait', 0.0):.3f}",
+                              str(wait.get('aged', 0)))
+        console.print(table)
+
+    for step in report.steps:
+        for error, count in step.error_messages.items():
+            console.print(f"❌ {step.concurrency} workers: {count} × {error}", style="red")
+
+    show_model_stats(architect)
+    show_speculation_stats(architect)
+
+    peak = report.peak
+    if peak is not None:
+        console.print(f"🏁 Peak throughput: {peak.throughput:.2f} inceptions/s at {peak.concurrency} workers")
+    if report.saturation_point is not None:
+        console.print(f"📈 Saturation point: {report.saturation_point} workers")
+    else:
+        console.print("📈 No saturation within the ramp")
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
+        console.print(f"✅ Report saved to {json_path}")
+
+
 @cli.command()
 def status() -> None:
     """Check system status
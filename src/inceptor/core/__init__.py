@@ -5,21 +5,79 @@ This module contains the main components for generating multi-level solution arc
 """
 
 from .dream_architect import DreamArchitect
-from .ollama_client import OllamaClient
+from .ollama_client import OllamaClient, GenerationCancelled
+from .concurrency import AdaptiveLimiter, limiter_for
+from .keep_warm import KeepWarm, keep_alive_seconds
+from .stand_in import StandInClient, create_client
+from .trace import TraceRecorder, ReplayClient, read_trace, trace_summary
+from .scheduler import RequestScheduler, ScheduledClient, PRIORITIES
+from .routing import ModelRouter
+from .speculative import SpeculativeGenerator
 from .context_extractor import ContextExtractor
+from .corpus_analyzer import CorpusAnalyzer, CorpusReport
+from .pattern_registry import PatternRegistry, PatternCost
+from .semantic_cache import SemanticCache
+from .solution_store import SolutionStore
+from .serialization import LazySolution, SolutionWriter, save_solution, load_solution, open_solution
+from .blob_store import BlobStore
+from .project_export import ProjectExporter, solution_files
+from .project_index import ProjectIndex
+from .load_test import LoadTester, LoadReport, LoadStep
+from .profiling import InceptionProfiler, profile_inception
 from .prompt_templates import PromptTemplates
+from .template_engine import CompiledTemplate, compile_template
 from .models import Solution, Task
 from .enums import ArchitectureLevel
-from .utils import quick_solution, analyze_context
+from .utils import quick_solution, analyze_context, analyze_context_stream, analyze_corpus
 
 __all__ = [
     'DreamArchitect',
     'OllamaClient',
+    'GenerationCancelled',
+    'AdaptiveLimiter',
+    'limiter_for',
+    'KeepWarm',
+    'keep_alive_seconds',
+    'StandInClient',
+    'create_client',
+    'TraceRecorder',
+    'ReplayClient',
+    'read_trace',
+    'trace_summary',
+    'RequestScheduler',
+    'ScheduledClient',
+    'PRIORITIES',
+    'ModelRouter',
+    'SpeculativeGenerator',
     'ContextExtractor',
+    'CorpusAnalyzer',
+    'CorpusReport',
+    'PatternRegistry',
+    'PatternCost',
+    'SemanticCache',
+    'SolutionStore',
+    'SolutionWriter',
+    'LazySolution',
+    'save_solution',
+    'load_solution',
+    'open_solution',
+    'BlobStore',
+    'ProjectExporter',
+    'solution_files',
+    'ProjectIndex',
+    'LoadTester',
+    'LoadReport',
+    'LoadStep',
+    'InceptionProfiler',
+    'profile_inception',
     'PromptTemplates',
+    'CompiledTemplate',
+    'compile_template',
     'Solution',
     'Task',
     'ArchitectureLevel',
     'quick_solution',
-    'analyze_context'
+    'analyze_context',
+    'analyze_context_stream',
+    'analyze_corpus'
 ]
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Union
+
+
+class BlobStore:
+    """Content-addressed store of file contents shared between projects.
+
+    Each distinct content is written once, as a read-only file named by its
+    SHA-256 digest, and hardlinked into project directories. Generating many
+    projects with the same boilerplate then costs disk space and write I/O
+    for unique content only. Blobs are read-only so that a plain write
+    fails instead of changing every other project; editors that save by
+    writing a new file and renaming it just break the link. A link shares
+    the blob's inode, though: ``chmod`` changes the mode everywhere, and
+    writing in place after ``chmod u+w`` changes the content everywhere.
+    Use the store for projects that are not edited where they are.
+
+    Where hardlinks are not possible (different filesystem, or a filesystem
+    without links) the blob is copied instead.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """Open (or create) a store.
+
+        Args:
+            root: Blob directory; keep it on the same filesystem as the
+                project directories so that files can be hardlinked
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.bytes_written = 0
+        self.bytes_deduplicated = 0
+        self.links = 0
+        self.copies = 0
+        self._lock = threading.Lock()
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def put(self, content: Union[str, bytes]) -> str:
+        """Stores content unless it is already present.
+
+        Args:
+            content: File content; str is stored as UTF-8
+
+        Returns:
+            SHA-256 hex digest identifying the blob
+        """
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if path.exists():
+            with self._lock:
+                self.bytes_deduplicated += len(data)
+            return digest
+
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, 0o444)
+            # A concurrent put of the same content writes identical bytes
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        with self._lock:
+            self.bytes_written += len(data)
+        return digest
+
+    def link(self, digest: str, target: Union[str, Path]) -> None:
+        """Atomically places a blob at ``target``, replacing any existing file.
+
+        Raises:
+            FileNotFoundError: If the blob does not exist
+        """
+        target = Path(target)
+        blob = self.path(digest)
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(blob, tmp)
+            linked = True
+        except FileNotFoundError:
+            raise
+        except OSError:
+            shutil.copyfile(blob, tmp)
+            os.chmod(tmp, 0o644)
+            linked = False
+        try:
+            os.replace(tmp, target)
+        finally:
+            # rename() is a no-op when target is already a link to this blob
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+        with self._lock:
+            if linked:
+                self.links += 1
+            else:
+                self.copies += 1
+
+    def store(self, content: Union[str, bytes], target: Union[str, Path]) -> str:
+        """``put`` followed by ``link``; returns the digest."""
+        digest = self.put(content)
+        self.link(digest, target)
+        return digest
+
+    def prune(self) -> int:
+        """Deletes blobs no project links to any more.
+
+        Only hardlinked references are seen; copies made on other
+        filesystems do not keep a blob alive (and do not need it).
+
+        Returns:
+            Number of blobs removed
+        """
+        removed = 0
+        for blob in self.root.glob("??/*"):
+            if not blob.name.startswith(".") and blob.stat().st_nlink == 1:
+                blob.unlink()
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Blob count and size on disk, plus write/dedup counters for this instance."""
+        blobs = [blob for blob in self.root.glob("??/*") if not blob.name.startswith(".")]
+        return {
+            "blobs": len(blobs),
+            "bytes": sum(blob.stat().st_size for blob in blobs),
+            "bytes_written": self.bytes_written,
+            "bytes_deduplicated": self.bytes_deduplicated,
+            "links": self.links,
+            "copies": self.copies,
+        }
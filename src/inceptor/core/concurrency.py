@@ -0,0 +1,156 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class AdaptiveLimiter:
+    """Latency-driven limit on in-flight requests to one backend (AIMD).
+
+    Each finished request reports its latency and, when the server reports
+    it, its service time (Ollama's ``prompt_eval_duration`` plus
+    ``eval_duration``). The difference is time spent queued in front of the
+    model, including the server's own wait for a model load or a free slot. While the smoothed queueing
+    delay stays within ``tolerance`` of the service time the limit grows by
+    about one per limit's worth of requests, but only when requests
+    actually fill it. Past that, and on timeouts, connection errors and
+    overload responses, the limit is cut multiplicatively, at most once per
+    round trip so one congested burst does not collapse it.
+
+    Without a service time the fastest recent latency stands in for the
+    no-load latency, as in gradient-style limiters.
+    """
+
+    def __init__(self, initial: int = 4, min_limit: int = 1, max_limit: int = 64, tolerance: float = 0.1,
+                 min_delay: float = 0.05, backoff: float = 0.9, drop_backoff: float = 0.5, smoothing: float = 0.2):
+        """Initialize the limiter.
+
+        Args:
+            initial: Starting limit
+            min_limit: Limit never goes below this
+            max_limit: Limit never goes above this
+            tolerance: Queueing delay accepted, as a fraction of service time
+            min_delay: Queueing delay (seconds) always accepted, for jitter
+            backoff: Limit multiplier when queueing delay is too high
+            drop_backoff: Limit multiplier on failed (dropped) requests
+            smoothing: Weight of the newest sample in the moving averages
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.min_delay = min_delay
+        self.backoff = backoff
+        self.drop_backoff = drop_backoff
+        self.smoothing = smoothing
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._queue_delay = 0.0
+        self._service_time = 0.0
+        self._min_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._requests = 0
+        self._drops = 0
+        self._decreases = 0
+        self._waited = 0.0
+        self._peak_limit = initial
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def acquire(self) -> float:
+        """Blocks until a request may be sent; returns the seconds waited."""
+        started = time.monotonic()
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            waited = time.monotonic() - started
+            self._waited += waited
+            return waited
+
+    def release(self, latency: Optional[float] = None, service_time: Optional[float] = None,
+                dropped: bool = False) -> None:
+        """Frees the slot of a finished request and adapts the limit.
+
+        Args:
+            latency: Seconds from sending the request to the full response;
+                None for requests that say nothing about the backend (e.g.
+                rejected as invalid)
+            service_time: Seconds the server spent evaluating the prompt
+                and generating, if reported; time it spent waiting for a
+                model load or a free slot counts as queueing
+            dropped: The backend timed out, refused or was overloaded
+        """
+        with self._cond:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            now = time.monotonic()
+            if dropped:
+                self._drops += 1
+                # Drops of one burst are one signal: cut at most once per round
+                # trip, even if they failed faster than a normal request
+                round_trip = max(latency or 0.0, self._service_time, self._min_latency or 0.0)
+                self._decrease(self.drop_backoff, now, round_trip)
+            elif latency is not None:
+                self._requests += 1
+                self._sample(latency, service_time, in_flight, now)
+            self._cond.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "peak_limit": self._peak_limit,
+                "requests": self._requests,
+                "drops": self._drops,
+                "decreases": self._decreases,
+                "queue_delay": round(self._queue_delay, 6),
+                "service_time": round(self._service_time, 6),
+                "client_wait": round(self._waited, 6),
+            }
+
+    def _sample(self, latency: float, service_time: Optional[float], in_flight: int, now: float) -> None:
+        if service_time is None:
+            # No server timing: compare against the fastest recent request
+            self._min_latency = latency if self._min_latency is None else min(latency, self._min_latency * 1.01)
+            service_time = self._min_latency
+        queue_delay = max(0.0, latency - service_time)
+        alpha = self.smoothing
+        self._queue_delay += alpha * (queue_delay - self._queue_delay)
+        self._service_time = service_time if not self._service_time else \
+            self._service_time + alpha * (service_time - self._service_time)
+
+        if self._queue_delay > max(self.min_delay, self.tolerance * self._service_time):
+            self._decrease(self.backoff, now, latency)
+        elif in_flight >= int(self._limit):
+            # Only grow a limit that is actually in use
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            self._peak_limit = max(self._peak_limit, self.limit)
+
+    def _decrease(self, factor: float, now: float, latency: float) -> None:
+        if now - self._last_decrease < latency:
+            return
+        self._last_decrease = now
+        self._decreases += 1
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(base_url: str, **options: Any) -> AdaptiveLimiter:
+    """The limiter shared by every client of the backend at ``base_url``.
+
+    ``options`` (see ``AdaptiveLimiter``) only apply when it is created.
+    """
+    key = base_url.rstrip("/")
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = AdaptiveLimiter(**options)
+        return _limiters[key]
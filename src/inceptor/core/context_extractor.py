@@ -1,5 +1,48 @@
-import re
-from typing import Dict, Any, List
+import codecs
+import mmap
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .pattern_registry import CompiledMatcher, PatternCost, PatternRegistry
+
+# Anything extract_context_stream can read from: a path, a binary or text file
+# object, or an iterable of str/bytes chunks.
+TextSource = Union[str, "os.PathLike[str]", IO[Any], Iterable[Union[str, bytes]]]
+
+
+def _decode_chunks(chunks: Iterable[Union[str, bytes]], encoding: str) -> Iterator[str]:
+    """Decodes byte chunks incrementally, so multi-byte characters may be split."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield chunk
+        elif chunk:
+            yield decoder.decode(chunk)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _read_file_chunks(file: IO[Any], chunk_size: int) -> Iterator[Union[str, bytes]]:
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read_path_chunks(path: Union[str, "os.PathLike[str]"], chunk_size: int) -> Iterator[bytes]:
+    """Reads a file in chunks, memory-mapping it when it spans several chunks."""
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size <= chunk_size:
+            yield from _read_file_chunks(file, chunk_size)
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, size, chunk_size):
+                yield mapped[offset:offset + chunk_size]
+
 
 class ContextExtractor:
     """Extracts context from various sources using predefined patterns."""
@@ -30,34 +73,102 @@ class ContextExtractor:
         ]
     }
 
+    # Streaming defaults: characters read per chunk, and characters held back
+    # between chunks so that matches crossing a boundary are still found.
+    STREAM_CHUNK_SIZE = 1024 * 1024
+    STREAM_OVERLAP = 256
+
+    # Extra categories/patterns from config files ($INCEPTOR_PATTERN_FILES)
+    registry = PatternRegistry.from_env()
+
+    @classmethod
+    def get_matcher(cls) -> CompiledMatcher:
+        """Returns the combined matcher, compiling it on first use.
+
+        The matcher covers ``CONTEXT_PATTERNS`` plus the registry's config
+        files and is rebuilt only when one of them changes.
+        """
+        return cls.registry.get_matcher(cls.CONTEXT_PATTERNS)
+
+    @classmethod
+    def load_patterns(cls, path: Union[str, Path]) -> None:
+        """Adds a pattern config file to the registry.
+
+        Args:
+            path: YAML or JSON file, see PatternRegistry for the format
+
+        Raises:
+            ValueError: If the file is malformed or a pattern does not compile
+        """
+        PatternRegistry.load_file(path)
+        cls.registry.add_file(path)
+
+    @classmethod
+    def profile_patterns(cls, text: str, repeat: int = 1) -> List[PatternCost]:
+        """Measures how long each pattern takes to match ``text``.
+
+        Args:
+            text: Representative input
+            repeat: Runs per pattern; the fastest is reported
+
+        Returns:
+            PatternCost entries, most expensive first
+        """
+        return cls.registry.profile(text, cls.CONTEXT_PATTERNS, repeat=repeat)
+
     @staticmethod
     def extract_context(text: str) -> Dict[str, List[str]]:
         """Extracts context from text using regex patterns.
-        
+
+        All categories are matched in a single pass over one lowered copy
+        of the text.
+
         Args:
             text: Input text to analyze
-            
+
         Returns:
             Dictionary containing extracted context categories and matches
         """
-        context = {}
+        return ContextExtractor.get_matcher().extract(text)
 
-        for category, patterns in ContextExtractor.CONTEXT_PATTERNS.items():
-            matches = []
-            for pattern in patterns:
-                matches.extend(re.findall(pattern, text.lower()))
-            context[category] = list(set(matches))
+    @staticmethod
+    def extract_context_stream(source: TextSource, chunk_size: Optional[int] = None,
+                               encoding: str = "utf-8") -> Dict[str, List[str]]:
+        """Extracts context from a file or stream without loading it whole.
 
-        return context
+        Memory use is bounded by ``chunk_size`` regardless of input size.
+        Files larger than one chunk are memory-mapped.
+
+        Args:
+            source: File path, file object (text or binary) or iterable of
+                str/bytes chunks. A plain string is treated as a path; use
+                :meth:`extract_context` for in-memory text.
+            chunk_size: Characters/bytes to process at a time
+            encoding: Encoding used to decode byte input
+
+        Returns:
+            Dictionary containing extracted context categories and matches
+        """
+        chunk_size = chunk_size or ContextExtractor.STREAM_CHUNK_SIZE
+        if isinstance(source, (str, os.PathLike)):
+            chunks: Iterable[Union[str, bytes]] = _read_path_chunks(source, chunk_size)
+        elif hasattr(source, "read"):
+            chunks = _read_file_chunks(source, chunk_size)
+        else:
+            chunks = source
+
+        return ContextExtractor.get_matcher().extract_stream(
+            _decode_chunks(chunks, encoding), ContextExtractor.STREAM_OVERLAP
+        )
 
     @staticmethod
     def enrich_context(context: Dict[str, Any], additional_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Enriches context with additional information and sets defaults.
-        
+
         Args:
             context: Existing context dictionary
             additional_info: Additional context information to add
-            
+
         Returns:
             Enriched context dictionary
         """
@@ -0,0 +1,176 @@
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .context_extractor import ContextExtractor
+
+# A unit of work: (document id, text). When ``is_path`` is set on the batch,
+# the second element is a file path that the worker streams itself.
+Document = Tuple[str, str]
+
+
+def _analyze_batch(batch: List[Document], is_path: bool) -> List[Tuple[str, Optional[Dict[str, List[str]]], Optional[str]]]:
+    """Worker entry point: extracts context for every document in a batch.
+
+    Returns ``(doc_id, context, error)`` triples in input order.
+    """
+    results = []
+    for doc_id, payload in batch:
+        try:
+            if is_path:
+                context = ContextExtractor.extract_context_stream(payload)
+            else:
+                context = ContextExtractor.extract_context(payload)
+            results.append((doc_id, context, None))
+        except Exception as e:
+            results.append((doc_id, None, str(e)))
+    return results
+
+
+@dataclass
+class CorpusReport:
+    """Aggregated result of a corpus run."""
+    documents: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    # Number of documents in which each category / term was found
+    category_counts: Counter = field(default_factory=Counter)
+    term_counts: Dict[str, Counter] = field(default_factory=dict)
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    def add(self, context: Dict[str, List[str]]) -> None:
+        for category, terms in context.items():
+            if terms:
+                self.category_counts[category] += 1
+                self.term_counts.setdefault(category, Counter()).update(set(terms))
+
+    def top_terms(self, category: str, n: int = 20) -> List[Tuple[str, int]]:
+        return self.term_counts.get(category, Counter()).most_common(n)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+            "docs_per_second": round(self.docs_per_second, 1),
+            "category_counts": dict(self.category_counts),
+            "term_counts": {c: dict(t) for c, t in self.term_counts.items()},
+        }
+
+
+class CorpusAnalyzer:
+    """Runs context extraction over large corpora on a process pool."""
+
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 64):
+        """Initialize the analyzer.
+
+        Args:
+            workers: Worker processes (default: CPU count). ``0`` or ``1``
+                analyzes in the calling process.
+            batch_size: Documents sent to a worker per work unit
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = max(1, batch_size)
+
+    def analyze(self, documents: Iterable[Union[str, Document]],
+                jsonl: Optional[IO[str]] = None) -> CorpusReport:
+        """Analyzes in-memory documents.
+
+        Args:
+            documents: Texts, or ``(doc_id, text)`` pairs
+            jsonl: Optional text stream receiving one JSON line per document
+
+        Returns:
+            CorpusReport with aggregated frequencies and throughput
+        """
+        pairs = (
+            (str(i), doc) if isinstance(doc, str) else doc
+            for i, doc in enumerate(documents)
+        )
+        return self._run(pairs, False, jsonl)
+
+    def analyze_files(self, paths: Iterable[Union[str, Path]],
+                      jsonl: Optional[IO[str]] = None) -> CorpusReport:
+        """Analyzes files, one document per file, streamed by the workers.
+
+        Directories are walked recursively.
+
+        Args:
+            paths: Files or directories
+            jsonl: Optional text stream receiving one JSON line per document
+
+        Returns:
+            CorpusReport with aggregated frequencies and throughput
+        """
+        return self._run(((p, p) for p in self._iter_files(paths)), True, jsonl)
+
+    @staticmethod
+    def iter_lines(paths: Iterable[Union[str, Path]]) -> Iterator[Document]:
+        """Yields every non-empty line of the given files as a document."""
+        for path in CorpusAnalyzer._iter_files(paths):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for number, line in enumerate(f, 1):
+                    if line.strip():
+                        yield f"{path}:{number}", line
+
+    @staticmethod
+    def _iter_files(paths: Iterable[Union[str, Path]]) -> Iterator[str]:
+        for path in paths:
+            path = Path(path)
+            if path.is_dir():
+                yield from (str(p) for p in sorted(path.rglob("*")) if p.is_file())
+            else:
+                yield str(path)
+
+    def _batches(self, pairs: Iterator[Document]) -> Iterator[List[Document]]:
+        while True:
+            batch = list(islice(pairs, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _run(self, pairs: Iterator[Document], is_path: bool,
+             jsonl: Optional[IO[str]]) -> CorpusReport:
+        report = CorpusReport()
+        start = time.perf_counter()
+
+        for doc_id, context, error in self._results(self._batches(pairs), is_path):
+            report.documents += 1
+            if error is None:
+                report.add(context)
+            else:
+                report.errors += 1
+            if jsonl is not None:
+                record = {"id": doc_id, "context": context}
+                if error is not None:
+                    record["error"] = error
+                jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _results(self, batches: Iterator[List[Document]], is_path: bool) -> Iterator[Tuple[str, Any, Optional[str]]]:
+        if self.workers <= 1:
+            for batch in batches:
+                yield from _analyze_batch(batch, is_path)
+            return
+
+        # Keep a bounded window of batches in flight so that memory use does
+        # not depend on corpus size, and yield results in input order.
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                pending.append(pool.submit(_analyze_batch, batch, is_path))
+                if len(pending) >= self.workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
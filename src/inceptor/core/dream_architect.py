@@ -1,23 +1,52 @@
 import json
-from typing import Dict, Any, Optional
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Type
 
 from .ollama_client import OllamaClient
 from .context_extractor import ContextExtractor
 from .prompt_templates import PromptTemplates
 from .models import Solution, Task
 from .enums import ArchitectureLevel
+from .semantic_cache import SemanticCache
+from .token_budget import estimate_tokens
+
+if TYPE_CHECKING:
+    from .routing import ModelRouter
+    from .speculative import SpeculativeGenerator
 
 class DreamArchitect:
     """Main class for generating multi-level solution architectures."""
 
-    def __init__(self, ollama_url: str = "http://localhost:11434"):
+    def __init__(self, ollama_url: str = "http://localhost:11434", semantic_cache: Optional[SemanticCache] = None,
+                 client: Optional[OllamaClient] = None, prompt_budget: Optional[int] = None,
+                 templates: Type[PromptTemplates] = PromptTemplates, router: Optional["ModelRouter"] = None,
+                 speculation: Optional["SpeculativeGenerator"] = None):
         """Initialize the DreamArchitect with required components.
         
         Args:
             ollama_url: Base URL for the Ollama API server
+            semantic_cache: Optional cache reusing LIMBO/DREAM results of
+                near-duplicate problems
+            client: Model client to use instead of an OllamaClient for
+                ``ollama_url`` (e.g. a StandInClient)
+            prompt_budget: Maximum prompt size in tokens; larger design
+                specs, implementations and contexts are trimmed to fit
+                (see ``PromptTemplates.fit``)
+            templates: Prompt templates, e.g. from
+                ``PromptTemplates.from_directory``
+            router: Picks the model per level, component complexity or
+                prompt size, with fallbacks (default: the client's model)
+            speculation: Races several generations of the prompts of
+                latency-critical levels (e.g. LIMBO) and keeps the first
+                valid response instead of retrying after a bad one
         """
-        self.ollama = OllamaClient(ollama_url)
+        self.ollama = client if client is not None else OllamaClient(ollama_url)
         self.context_extractor = ContextExtractor()
+        self.semantic_cache = semantic_cache
+        self.prompt_budget = prompt_budget
+        self.templates = templates
+        self.router = router
+        self.speculation = speculation
 
     def inception(self, problem: str, max_levels: int = 3, additional_context: Optional[Dict[str, Any]] = None) -> Solution:
         """Generate a multi-level architecture solution.
@@ -44,102 +73,243 @@ class DreamArchitect:
             architecture={},
             tasks=[],
             implementation={},
-            metadata={"context": context, "max_levels": max_levels}
+            metadata={"context": context, "max_levels": max_levels, "timings": {}}
         )
+        # Seconds spent per level (levels served from the cache are absent)
+        timings = solution.metadata["timings"]
+        # Per-level trimming done to fit prompts into the budget
+        if self.prompt_budget is not None:
+            solution.metadata["prompt_budget"] = {"budget": self.prompt_budget, "levels": {}}
+        # Requests per level and model
+        if self.router is not None:
+            solution.metadata["models"] = {}
+        run = solution.metadata
         
+        # Near-duplicate problems reuse the cached LIMBO/DREAM subtree
+        cached = self._cache_lookup(problem, context)
+        if cached:
+            similarity, entry = cached
+            solution.metadata["semantic_cache"] = {
+                "hit": True,
+                "similarity": round(similarity, 4),
+                "source_problem": entry["problem"]
+            }
+
         # Execute each level of the architecture
-        limbo_result = self._execute_limbo(problem, context)
+        limbo_result = cached[1]["limbo"] if cached else self._timed(timings, "limbo", self._execute_limbo,
+                                                                     problem, context, run)
         solution.architecture["limbo"] = limbo_result
-        solution.tasks.extend(limbo_result.get("dream_tasks", []))
+        solution.tasks.extend(self._tasks(limbo_result, "dream_tasks", ArchitectureLevel.DREAM))
         
         if max_levels >= 2:
-            dream_results = self._execute_dream(limbo_result, context)
+            dream_results = cached[1]["dream"] if cached else self._timed(timings, "dream", self._execute_dream,
+                                                                          limbo_result, context, run)
+            if not cached:
+                self._cache_store(problem, context, limbo_result, dream_results)
             solution.architecture["dream"] = dream_results
-            solution.tasks.extend(dream_results.get("reality_tasks", []))
+            solution.tasks.extend(self._tasks(dream_results, "reality_tasks", ArchitectureLevel.REALITY))
             
             if max_levels >= 3:
-                reality_results = self._execute_reality(dream_results, context)
+                reality_results = self._timed(timings, "reality", self._execute_reality, dream_results, context,
+                                               run, self._complexities(limbo_result))
                 solution.implementation["reality"] = reality_results
-                solution.tasks.extend(reality_results.get("deeper_tasks", []))
+                solution.tasks.extend(self._tasks(reality_results, "deeper_tasks", ArchitectureLevel.DEEPER))
                 
                 if max_levels >= 4:
-                    deeper_results = self._execute_deeper(reality_results, context)
+                    deeper_results = self._timed(timings, "deeper", self._execute_deeper, reality_results, context,
+                                                  run)
                     solution.implementation["deeper"] = deeper_results
-                    solution.tasks.extend(deeper_results.get("deepest_tasks", []))
+                    solution.tasks.extend(self._tasks(deeper_results, "deepest_tasks", ArchitectureLevel.DEEPEST))
                     
                     if max_levels >= 5:
-                        deepest_results = self._execute_deepest(solution, context)
+                        deepest_results = self._timed(timings, "deepest", self._execute_deepest, solution, context,
+                                                       run)
                         solution.implementation["deepest"] = deepest_results
         
         return solution
 
-    def _execute_limbo(self, problem: str, context: Dict) -> Dict:
+    @staticmethod
+    def _timed(timings: Dict[str, float], level: str, execute, *args):
+        """Runs one level and records its duration in ``timings``."""
+        started = time.perf_counter()
+        try:
+            return execute(*args)
+        finally:
+            timings[level] = time.perf_counter() - started
+
+    @staticmethod
+    def _tasks(result: Dict, key: str, level: ArchitectureLevel) -> List[Task]:
+        """Wraps the task dicts a level emitted in compact Task nodes."""
+        return [Task.from_dict(task, level) for task in result.get(key, []) if isinstance(task, dict)]
+
+    def _cache_lookup(self, problem: str, context: Dict) -> Optional[Tuple[float, Dict]]:
+        """Look up a cached LIMBO/DREAM subtree; embedding errors count as a miss."""
+        if self.semantic_cache is None:
+            return None
+        try:
+            return self.semantic_cache.lookup(SemanticCache.key_text(problem, context))
+        except Exception:
+            return None
+
+    def _cache_store(self, problem: str, context: Dict, limbo_result: Dict, dream_results: Dict) -> None:
+        if self.semantic_cache is None:
+            return
+        try:
+            self.semantic_cache.store(
+                SemanticCache.key_text(problem, context),
+                {"problem": problem, "limbo": limbo_result, "dream": dream_results}
+            )
+        except Exception:
+            pass
+
+    def _prompt(self, level: ArchitectureLevel, run: Optional[Dict[str, Any]], **fields) -> str:
+        """Format a level prompt, within ``prompt_budget`` when one is set."""
+        if self.prompt_budget is None:
+            return self.templates.get_prompt(level=level, **fields)
+        prompt, report = self.templates.fit(level, self.prompt_budget, **fields)
+        if run is not None and "prompt_budget" in run:
+            stats = run["prompt_budget"]["levels"].setdefault(
+                level.name.lower(), {"prompts": 0, "trimmed": 0, "max_tokens": 0, "dropped_tokens": 0, "fields": {}}
+            )
+            stats["prompts"] += 1
+            stats["max_tokens"] = max(stats["max_tokens"], report["tokens"])
+            if report["dropped_tokens"]:
+                stats["trimmed"] += 1
+                stats["dropped_tokens"] += report["dropped_tokens"]
+                for name, dropped in report["fields"].items():
+                    stats["fields"][name] = stats["fields"].get(name, 0) + dropped
+        return prompt
+
+    def _ask(self, level: ArchitectureLevel, prompt: str, run: Optional[Dict[str, Any]],
+             complexity: Optional[str] = None) -> Dict:
+        """Send a level prompt and parse the JSON response.
+
+        With a router, the routed model is asked first and its fallbacks
+        after it when the request fails or the response is not valid JSON.
+        """
+        if self.router is None:
+            return self._generate(level, prompt)[0]
+
+        name = level.name.lower()
+        prompt_tokens = estimate_tokens(prompt)
+        models = self.router.route(name, complexity, prompt_tokens)
+        error: Optional[Exception] = None
+        for attempt, model in enumerate(models):
+            started = time.perf_counter()
+            try:
+                result, response, usage = self._generate(level, prompt, model)
+            except Exception as e:
+                self.router.record(model, time.perf_counter() - started, prompt_tokens, error=True,
+                                   fallback=attempt > 0)
+                error = e
+                continue
+            usage = usage or {}
+            self.router.record(model, time.perf_counter() - started,
+                               usage.get("prompt_eval_count", prompt_tokens),
+                               usage.get("eval_count", estimate_tokens(response)), fallback=attempt > 0,
+                               load_seconds=usage.get("load_duration", 0) / 1e9)
+            if run is not None and "models" in run:
+                counts = run["models"].setdefault(name, {})
+                counts[model] = counts.get(model, 0) + 1
+            return result
+        raise error  # type: ignore[misc]
+
+    def _generate(self, level: ArchitectureLevel, prompt: str,
+                  model: Optional[str] = None) -> Tuple[Dict, str, Optional[Dict[str, Any]]]:
+        """Generate and parse one response, racing several for speculative levels.
+
+        Returns:
+            Tuple of the parsed response, the raw response and the client's
+            usage report for it (None if it has none)
+        """
+        name = level.name.lower()
+        if self.speculation is not None and self.speculation.fanout(name) > 1:
+            return self.speculation.generate(self.ollama, name, prompt, self._parse_json_response, model)
+        response = self.ollama.generate(prompt) if model is None else self.ollama.generate(prompt, model=model)
+        result = self._parse_json_response(response)
+        last_usage = getattr(self.ollama, "last_usage", None)
+        return result, response, last_usage() if last_usage is not None else None
+
+    @staticmethod
+    def _complexities(limbo_result: Dict) -> Dict[str, str]:
+        """DREAM task id -> complexity of the LIMBO component it designs."""
+        components = {
+            component.get("name"): component.get("complexity")
+            for component in limbo_result.get("components", []) if isinstance(component, dict)
+        }
+        return {
+            task["task_id"]: components[task.get("component")]
+            for task in limbo_result.get("dream_tasks", [])
+            if isinstance(task, dict) and "task_id" in task and components.get(task.get("component"))
+        }
+
+    def _execute_limbo(self, problem: str, context: Dict, run: Optional[Dict[str, Any]] = None) -> Dict:
         """Execute Level 1 - Meta Architecture."""
-        prompt = PromptTemplates.get_prompt(
-            level=1,
+        prompt = self._prompt(
+            ArchitectureLevel.LIMBO, run,
             problem=problem,
             context=json.dumps(context, indent=2, ensure_ascii=False)
         )
-        response = self.ollama.generate(prompt)
-        return self._parse_json_response(response)
+        return self._ask(ArchitectureLevel.LIMBO, prompt, run)
 
-    def _execute_dream(self, limbo_result: Dict, context: Dict) -> Dict:
+    def _execute_dream(self, limbo_result: Dict, context: Dict, run: Optional[Dict[str, Any]] = None) -> Dict:
         """Execute Level 2 - Solution Design."""
         components = json.dumps(limbo_result.get("components", []), indent=2, ensure_ascii=False)
         dream_tasks = limbo_result.get("dream_tasks", [])
+        complexities = self._complexities(limbo_result) if self.router is not None else {}
         
         results = {}
         for task in dream_tasks:
-            prompt = PromptTemplates.get_prompt(
-                level=2,
+            prompt = self._prompt(
+                ArchitectureLevel.DREAM, run,
                 task=json.dumps(task, indent=2, ensure_ascii=False),
                 context=json.dumps(context, indent=2, ensure_ascii=False),
                 components=components
             )
-            response = self.ollama.generate(prompt)
-            results[task["task_id"]] = self._parse_json_response(response)
+            results[task["task_id"]] = self._ask(ArchitectureLevel.DREAM, prompt, run,
+                                                 complexities.get(task["task_id"]))
         
         return results
 
-    def _execute_reality(self, dream_results: Dict, context: Dict) -> Dict:
+    def _execute_reality(self, dream_results: Dict, context: Dict, run: Optional[Dict[str, Any]] = None,
+                         complexities: Optional[Dict[str, str]] = None) -> Dict:
         """Execute Level 3 - Implementation."""
+        complexities = complexities or {}
         results = {}
         for task_id, design in dream_results.items():
             for task in design.get("reality_tasks", []):
-                prompt = PromptTemplates.get_prompt(
-                    level=3,
+                prompt = self._prompt(
+                    ArchitectureLevel.REALITY, run,
                     task=json.dumps(task, indent=2, ensure_ascii=False),
                     specification=json.dumps(design["design"], indent=2, ensure_ascii=False),
                     context=json.dumps(context, indent=2, ensure_ascii=False)
                 )
-                response = self.ollama.generate(prompt)
-                results[task["task_id"]] = self._parse_json_response(response)
+                results[task["task_id"]] = self._ask(ArchitectureLevel.REALITY, prompt, run,
+                                                     complexities.get(task_id))
         return results
 
-    def _execute_deeper(self, reality_results: Dict, context: Dict) -> Dict:
+    def _execute_deeper(self, reality_results: Dict, context: Dict, run: Optional[Dict[str, Any]] = None) -> Dict:
         """Execute Level 4 - Integration."""
         results = {}
         for task_id, impl in reality_results.items():
-            prompt = PromptTemplates.get_prompt(
-                level=4,
+            prompt = self._prompt(
+                ArchitectureLevel.DEEPER, run,
                 task=json.dumps(impl, indent=2, ensure_ascii=False),
                 context=json.dumps(context, indent=2, ensure_ascii=False)
             )
-            response = self.ollama.generate(prompt)
-            results[task_id] = self._parse_json_response(response)
+            results[task_id] = self._ask(ArchitectureLevel.DEEPER, prompt, run)
         return results
 
-    def _execute_deepest(self, solution: Solution, context: Dict) -> Dict:
+    def _execute_deepest(self, solution: Solution, context: Dict, run: Optional[Dict[str, Any]] = None) -> Dict:
         """Execute Level 5 - Optimization."""
         results = {}
         for task_id, deeper in solution.implementation.get("deeper", {}).items():
-            prompt = PromptTemplates.get_prompt(
-                level=5,
+            prompt = self._prompt(
+                ArchitectureLevel.DEEPEST, run,
                 task=json.dumps(deeper, indent=2, ensure_ascii=False),
                 context=json.dumps(context, indent=2, ensure_ascii=False)
             )
-            response = self.ollama.generate(prompt)
-            results[task_id] = self._parse_json_response(response)
+            results[task_id] = self._ask(ArchitectureLevel.DEEPEST, prompt, run)
         return results
 
     @staticmethod
@@ -0,0 +1,110 @@
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Ollama unloads idle models after 5 minutes unless told otherwise
+DEFAULT_KEEP_ALIVE = 300.0
+
+
+def keep_alive_seconds(keep_alive: Optional[Union[str, float]]) -> Optional[float]:
+    """Seconds of an Ollama ``keep_alive`` value (``300``, ``"10m"``, ``"1h"``).
+
+    Returns:
+        The duration, or None for "forever" (negative values)
+
+    Raises:
+        ValueError: If the value is not a duration
+    """
+    if keep_alive is None:
+        return DEFAULT_KEEP_ALIVE
+    if isinstance(keep_alive, (int, float)):
+        seconds = float(keep_alive)
+    else:
+        match = _DURATION_RE.match(str(keep_alive))
+        if match is None:
+            if str(keep_alive).strip().startswith("-"):
+                return None
+            raise ValueError(f"Invalid keep_alive duration: {keep_alive!r} (e.g. 300, '30s', '10m', '1h')")
+        seconds = float(match.group(1)) * _UNIT_SECONDS[match.group(2) or "s"]
+    return None if seconds < 0 else seconds
+
+
+class KeepWarm:
+    """Keeps models loaded on an Ollama server while something is active.
+
+    A daemon thread preloads the models (optionally right away, so the
+    first request does not pay the load time) and then pings them every
+    ``interval`` seconds, within the server's ``keep_alive`` window. Use
+    as a context manager around an inception or an interactive session.
+    """
+
+    def __init__(self, client: Any, models: Iterable[str], interval: Optional[float] = None,
+                 preload: bool = True):
+        """Initialize the pinger.
+
+        Args:
+            client: OllamaClient (anything with ``preload(model)``)
+            models: Models to keep loaded
+            interval: Seconds between pings (default: half the client's
+                ``keep_alive``, at most one minute)
+            preload: Load the models as soon as the thread starts
+        """
+        self.client = client
+        self.models: List[str] = list(dict.fromkeys(models))
+        if interval is None:
+            window = keep_alive_seconds(getattr(client, "keep_alive", None))
+            interval = min(60.0, window / 2) if window else 60.0
+        self.interval = max(0.01, interval)
+        self.preload = preload
+        self.pings = 0
+        self.failures = 0
+        self.load_seconds = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "KeepWarm":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="inceptor-keep-warm", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "KeepWarm":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "models": list(self.models),
+            "interval": self.interval,
+            "pings": self.pings,
+            "failures": self.failures,
+            "load_seconds": round(self.load_seconds, 6),
+        }
+
+    def _run(self) -> None:
+        if not self.preload and self._stop.wait(self.interval):
+            return
+        while True:
+            for model in self.models:
+                if self._stop.is_set():
+                    return
+                try:
+                    self.load_seconds += self.client.preload(model)
+                    self.pings += 1
+                except Exception:
+                    # The server may be down or restarting; try again next round
+                    self.failures += 1
+            if self._stop.wait(self.interval):
+                return
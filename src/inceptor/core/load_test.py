@@ -0,0 +1,208 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import cycle
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from .dream_architect import DreamArchitect
+from .stats import latency_summary
+
+LEVELS = ("limbo", "dream", "reality", "deeper", "deepest")
+
+
+def load_problems(path: Union[str, Path]) -> List[str]:
+    """Reads a problem corpus: one problem per non-empty line, ``#`` comments skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+@dataclass
+class LoadStep:
+    """Result of running inceptions at one concurrency."""
+    concurrency: int
+    requests: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    level_latencies: Dict[str, List[float]] = field(default_factory=dict)
+    error_messages: Dict[str, int] = field(default_factory=dict)
+    # With a priority mix: end-to-end latencies and scheduler queue waits per class
+    class_latencies: Dict[str, List[float]] = field(default_factory=dict)
+    queue_waits: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Client metrics after the step, e.g. the adaptive concurrency limit
+    backend: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Successful inceptions per second."""
+        return (self.requests - self.errors) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 3),
+            "latency": latency_summary(self.latencies),
+            "levels": {level: latency_summary(values) for level, values in self.level_latencies.items()},
+            "error_messages": dict(self.error_messages),
+            "classes": {priority: dict(latency_summary(values), queue_wait=self.queue_waits.get(priority, {}))
+                        for priority, values in self.class_latencies.items()},
+            "backend": dict(self.backend),
+        }
+
+
+@dataclass
+class LoadReport:
+    """Results of a concurrency ramp."""
+    steps: List[LoadStep] = field(default_factory=list)
+    # Throughput gain below which more concurrency counts as saturated
+    saturation_gain: float = 0.1
+
+    @property
+    def saturation_point(self) -> Optional[int]:
+        """Lowest concurrency past which throughput stops growing.
+
+        That is the first step whose successor improves throughput by less
+        than ``saturation_gain`` (or raises the error rate). None if every
+        step still scaled.
+        """
+        for step, following in zip(self.steps, self.steps[1:]):
+            if (following.throughput < step.throughput * (1 + self.saturation_gain)
+                    or following.error_rate > step.error_rate):
+                return step.concurrency
+        return None
+
+    @property
+    def peak(self) -> Optional[LoadStep]:
+        return max(self.steps, key=lambda step: step.throughput, default=None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "steps": [step.to_dict() for step in self.steps],
+            "saturation_point": self.saturation_point,
+        }
+
+
+class LoadTester:
+    """Drives concurrent inceptions against one architect and measures them.
+
+    All workers share the architect (and so its model client), which is how
+    several users hitting one Ollama server behave. Per-level latencies come
+    from the ``timings`` that ``DreamArchitect.inception`` records.
+
+    With a priority ``mix`` the architect's client must be a
+    ``RequestScheduler``; requests are spread over the classes in the mix's
+    proportions, each inception as its own flow.
+    """
+
+    def __init__(self, architect: DreamArchitect, problems: Iterable[str], max_levels: int = 3,
+                 mix: Optional[Mapping[str, int]] = None):
+        """Initialize the tester.
+
+        Args:
+            architect: Architect whose model client is under test
+            problems: Problem corpus; cycled through when shorter than a step
+            max_levels: Depth of each inception (3-5)
+            mix: Requests per priority class in each round, e.g.
+                ``{"interactive": 1, "batch": 4}``
+
+        Raises:
+            ValueError: If the corpus is empty, or a mix is given without
+                a scheduler
+        """
+        self.architect = architect
+        self.problems = list(problems)
+        if not self.problems:
+            raise ValueError("Load test needs at least one problem")
+        self.max_levels = max_levels
+        self.scheduler = None
+        self._priorities: List[str] = []
+        if mix:
+            if not hasattr(architect.ollama, "context"):
+                raise ValueError("A priority mix needs an architect whose client is a RequestScheduler")
+            self.scheduler = architect.ollama
+            self._priorities = [priority for priority, count in mix.items() for _ in range(count)]
+            if not self._priorities:
+                raise ValueError("The priority mix has no requests")
+        self._problem_iter = cycle(self.problems)
+        self._lock = threading.Lock()
+
+    def run_step(self, concurrency: int, requests: Optional[int] = None) -> LoadStep:
+        """Runs ``requests`` inceptions (default: 2 per worker) ``concurrency`` at a time."""
+        requests = requests or 2 * concurrency
+        step = LoadStep(concurrency=concurrency)
+        if self.scheduler is not None:
+            self.scheduler.reset_stats()
+
+        def one(index: int) -> None:
+            with self._lock:
+                problem = next(self._problem_iter)
+            priority = self._priorities[index % len(self._priorities)] if self._priorities else None
+            started = time.perf_counter()
+            try:
+                if priority is None:
+                    solution = self.architect.inception(problem, max_levels=self.max_levels)
+                else:
+                    with self.scheduler.context(priority, flow=f"inception-{concurrency}-{index}"):
+                        solution = self.architect.inception(problem, max_levels=self.max_levels)
+            except Exception as e:
+                error = type(e).__name__
+                with self._lock:
+                    step.errors += 1
+                    step.error_messages[error] = step.error_messages.get(error, 0) + 1
+                return
+            finally:
+                latency = time.perf_counter() - started
+                with self._lock:
+                    step.requests += 1
+            timings = solution.metadata.get("timings", {})
+            with self._lock:
+                step.latencies.append(latency)
+                if priority is not None:
+                    step.class_latencies.setdefault(priority, []).append(latency)
+                for level, seconds in timings.items():
+                    step.level_latencies.setdefault(level, []).append(seconds)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(requests)))
+        step.elapsed = time.perf_counter() - started
+        step.level_latencies = {level: step.level_latencies[level] for level in LEVELS
+                                if level in step.level_latencies}
+        if self.scheduler is not None:
+            step.queue_waits = {priority: stats for priority, stats in self.scheduler.stats().items()
+                                if priority in step.class_latencies}
+        client = getattr(self.architect.ollama, "backend", self.architect.ollama)
+        if hasattr(client, "metrics"):
+            step.backend = client.metrics()
+        return step
+
+    def ramp(self, concurrencies: Iterable[int], requests_per_step: Optional[int] = None,
+             saturation_gain: float = 0.1, on_step=None) -> LoadReport:
+        """Runs one step per concurrency, in order.
+
+        Args:
+            concurrencies: Concurrency of each step, e.g. ``[1, 2, 4, 8]``
+            requests_per_step: Inceptions per step (default: 2 per worker)
+            saturation_gain: See ``LoadReport.saturation_point``
+            on_step: Called with each finished ``LoadStep``
+
+        Returns:
+            LoadReport with every step
+        """
+        report = LoadReport(saturation_gain=saturation_gain)
+        for concurrency in concurrencies:
+            step = self.run_step(concurrency, requests_per_step)
+            report.steps.append(step)
+            if on_step is not None:
+                on_step(step)
+        return report
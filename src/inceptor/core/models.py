@@ -1,23 +1,112 @@
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 from .enums import ArchitectureLevel
 
+# Keys of a task dict that map onto Task fields; everything else the model
+# returns for a task is kept in ``Task.context``.
+_TASK_FIELDS = ("task_id", "level", "description", "dependencies", "output_format", "success_criteria")
+
 @dataclass
 class Task:
     """Represents a task in the architecture generation process."""
+    # Declared by hand rather than with dataclass(slots=True) to support 3.9
+    __slots__ = ("id", "level", "description", "context", "dependencies", "output_format", "success_criteria")
+
     id: str
-    level: ArchitectureLevel
+    level: Optional[ArchitectureLevel]
     description: str
     context: Dict[str, Any]
     dependencies: List[str]
     output_format: str
     success_criteria: List[str]
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], level: Optional[ArchitectureLevel] = None) -> "Task":
+        """Builds a Task from a task dict as returned by the model.
+
+        Args:
+            data: Task dict (``task_id``, ``description``, ...); unknown keys
+                go to ``context`` without being copied
+            level: Level the task runs at; defaults to ``data["level"]`` if
+                that names an ``ArchitectureLevel``, else the level is unset
+
+        Returns:
+            New Task
+        """
+        raw_level = data.get("level")
+        if level is None and raw_level is not None:
+            level = ArchitectureLevel.__members__.get(str(raw_level))
+        context = {k: v for k, v in data.items() if k not in _TASK_FIELDS}
+        if raw_level is not None and (level is None or raw_level != level.name):
+            # The model's own "level" value, not ours: keep it
+            context["level"] = raw_level
+        return cls(
+            id=str(data.get("task_id", "")),
+            level=level,
+            description=data.get("description", ""),
+            context=context,
+            dependencies=data.get("dependencies", []),
+            output_format=data.get("output_format", ""),
+            success_criteria=data.get("success_criteria", [])
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the task dict form; nested values are shared, not copied.
+
+        ``level`` is the level's name, left out if unset; a ``level`` the
+        model returned itself (kept in ``context``) takes precedence.
+        """
+        data: Dict[str, Any] = {"task_id": self.id}
+        if self.level is not None:
+            data["level"] = self.level.name
+        data.update(
+            description=self.description,
+            dependencies=self.dependencies,
+            output_format=self.output_format,
+            success_criteria=self.success_criteria,
+        )
+        data.update(self.context)
+        return data
+
 @dataclass
 class Solution:
     """Represents a complete solution with all its components."""
+    __slots__ = ("problem", "architecture", "tasks", "implementation", "metadata")
+
     problem: str
     architecture: Dict[str, Any]
     tasks: List[Task]
     implementation: Dict[str, str]
     metadata: Dict[str, Any]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Solution":
+        """Builds a Solution from ``to_dict`` output (or a legacy ``asdict`` dump)."""
+        return cls(
+            problem=data["problem"],
+            architecture=data.get("architecture", {}),
+            tasks=[as_task(task) for task in data.get("tasks", [])],
+            implementation=data.get("implementation", {}),
+            metadata=data.get("metadata", {})
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON/YAML-ready dict without copying level results.
+
+        Unlike ``dataclasses.asdict`` this does not deep-copy the (often
+        large) architecture and implementation trees; only tasks are
+        converted. Treat the result as read-only.
+        """
+        return {
+            "problem": self.problem,
+            "architecture": self.architecture,
+            "tasks": [task.to_dict() if isinstance(task, Task) else task for task in self.tasks],
+            "implementation": self.implementation,
+            "metadata": self.metadata,
+        }
+
+def as_task(task: Union[Task, Dict[str, Any]]) -> Union[Task, Dict[str, Any]]:
+    """Converts serialized task dicts back to Task; other values pass through."""
+    if isinstance(task, dict) and "task_id" in task:
+        return Task.from_dict(task)
+    return task
@@ -1,47 +1,284 @@
+import json
+import threading
+import time
 import requests
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+
+from .concurrency import AdaptiveLimiter, limiter_for
+from .keep_warm import KeepWarm, keep_alive_seconds
+
+# HTTP statuses meaning the server is overloaded rather than the request bad
+_OVERLOAD_STATUSES = (429, 502, 503, 504)
+
+# A request whose model load took longer than this started cold
+COLD_START_SECONDS = 0.5
+
+# Response fields kept for ``last_usage``
+_USAGE_KEYS = ("prompt_eval_count", "eval_count", "total_duration", "load_duration",
+               "prompt_eval_duration", "eval_duration")
+
+if TYPE_CHECKING:
+    from .trace import TraceRecorder
+
+
+class GenerationCancelled(Exception):
+    """Raised by ``generate`` when its ``cancel`` event is set before the response is complete."""
 
 class OllamaClient:
     """Client for communicating with Ollama Mistral:7b API."""
 
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(self, base_url: str = "http://localhost:11434", recorder: Optional["TraceRecorder"] = None,
+                 limiter: Optional[AdaptiveLimiter] = None, adaptive: bool = True,
+                 keep_alive: Optional[Union[str, float]] = None):
         """Initialize the Ollama client.
         
         Args:
             base_url: Base URL of the Ollama API server
+            recorder: Trace that every ``generate`` request and response is
+                written to, with timing (see ``ReplayClient``)
+            limiter: Limit on concurrent ``generate`` requests; by default
+                the adaptive limiter shared by all clients of ``base_url``
+            adaptive: Set to False to send requests without any limit
+            keep_alive: How long the server keeps a model loaded after a
+                request (seconds or a duration such as ``"30m"``; negative
+                keeps it loaded); the server default is 5 minutes
+
+        Raises:
+            ValueError: If ``keep_alive`` is not a duration
         """
+        keep_alive_seconds(keep_alive)
         self.base_url = base_url
         self.model = "mistral:7b"
+        self.embedding_model = "nomic-embed-text"
+        self.recorder = recorder
+        self.limiter = limiter or (limiter_for(base_url) if adaptive else None)
+        self.keep_alive = keep_alive
+        self._local = threading.local()
+        self._timing_lock = threading.Lock()
+        self._model_timings: Dict[str, Dict[str, float]] = {}
 
-    def generate(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> str:
+    def generate(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000,
+                 model: Optional[str] = None, temperature: float = 0.7, seed: Optional[int] = None,
+                 cancel: Optional[threading.Event] = None) -> str:
         """Generate a response from Ollama.
         
         Args:
             prompt: The input prompt for generation
             system_prompt: System prompt to guide the model's behavior
             max_tokens: Maximum number of tokens to generate
+            model: Model to use instead of ``self.model``
+            temperature: Sampling temperature
+            seed: Sampling seed, for reproducible responses
+            cancel: Event aborting the request when set; the response is
+                then streamed and the connection closed on cancellation,
+                which stops the server generating
             
         Returns:
             Generated text response
             
         Raises:
+            GenerationCancelled: If ``cancel`` was set first
             Exception: If there's an error with the API request
         """
+        model = model or self.model
+        self._local.usage = None
+        options: Dict[str, Any] = {"num_predict": max_tokens, "temperature": temperature}
+        if seed is not None:
+            options["seed"] = seed
+        if self.limiter is not None:
+            self.limiter.acquire()
+        started = time.monotonic()
+        latency: Optional[float] = None
+        service_time: Optional[float] = None
+        dropped = False
         try:
+            if cancel is not None and cancel.is_set():
+                raise GenerationCancelled("Generation cancelled before it was sent")
             response = requests.post(
                 f"{self.base_url}/api/generate",
                 json={
-                    "model": self.model,
+                    "model": model,
                     "prompt": prompt,
                     "system": system_prompt,
-                    "stream": False,
-                    "options": {
-                        "num_predict": max_tokens,
-                        "temperature": 0.7
-                    }
+                    "stream": cancel is not None,
+                    "options": options,
+                    **self._keep_alive_field()
+                },
+                stream=cancel is not None
+            )
+            if response.status_code in _OVERLOAD_STATUSES:
+                dropped = True
+            response.raise_for_status()
+            data = response.json() if cancel is None else self._read_stream(response, cancel)
+            text = data['response']
+            latency = time.monotonic() - started
+            self._local.usage = {key: data[key] for key in _USAGE_KEYS if key in data}
+            self._record_timing(model, data)
+            # total_duration also covers the server's wait for a model load
+            # and a free slot, which is queueing to the limiter
+            compute = data.get('prompt_eval_duration', 0) + data.get('eval_duration', 0)
+            if compute:
+                service_time = compute / 1e9
+        except GenerationCancelled:
+            raise
+        except Exception as e:
+            dropped = dropped or isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+            if dropped:
+                # Lets the limiter treat a burst of failures as one round trip
+                latency = time.monotonic() - started
+            if self.recorder is not None:
+                self.recorder.record(prompt, system_prompt, max_tokens, model, started,
+                                     time.monotonic() - started, error=str(e))
+            raise Exception(f"Ollama API error: {str(e)}")
+        finally:
+            if self.limiter is not None:
+                self.limiter.release(latency, service_time, dropped=dropped)
+        if self.recorder is not None:
+            self.recorder.record(prompt, system_prompt, max_tokens, model, started,
+                                 time.monotonic() - started, response=text, usage=data)
+        return text
+
+    def _read_stream(self, response: Any, cancel: threading.Event) -> Dict[str, Any]:
+        """Joins a streamed response, closing the connection if ``cancel`` is set."""
+        parts: List[str] = []
+        try:
+            for line in response.iter_lines():
+                if cancel.is_set():
+                    # Each chunk is one token; report what was spent so far
+                    self._local.usage = {"eval_count": len(parts)}
+                    raise GenerationCancelled(f"Generation cancelled after {len(parts)} tokens")
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise Exception(chunk['error'])
+                parts.append(chunk.get('response', ''))
+                if chunk.get('done'):
+                    chunk['response'] = "".join(parts)
+                    return chunk
+        finally:
+            response.close()
+        raise Exception("Response stream ended before it was done")
+
+    def preload(self, model: Optional[str] = None) -> float:
+        """Load a model on the server (or refresh its keep-alive) without generating.
+
+        Args:
+            model: Model to load (defaults to ``self.model``)
+
+        Returns:
+            Seconds the server spent loading it (near 0 if already loaded)
+
+        Raises:
+            Exception: If there's an error with the API request
+        """
+        model = model or self.model
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model, "prompt": "", "stream": False, **self._keep_alive_field()}
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            raise Exception(f"Ollama API error: {str(e)}")
+        self._record_timing(model, data, preload=True)
+        return data.get('load_duration', 0) / 1e9
+
+    def unload(self, model: Optional[str] = None) -> None:
+        """Ask the server to unload a model right away."""
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model or self.model, "prompt": "", "stream": False, "keep_alive": 0}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            raise Exception(f"Ollama API error: {str(e)}")
+
+    def keep_warm(self, models: Optional[Iterable[str]] = None, interval: Optional[float] = None,
+                  preload: bool = True) -> KeepWarm:
+        """Background pings keeping ``models`` (default: ``self.model``) loaded.
+
+        Example:
+            with client.keep_warm(["mistral:7b", "llama3.2:3b"]):
+                architect.inception(problem)
+        """
+        return KeepWarm(self, models or [self.model], interval=interval, preload=preload)
+
+    def model_timings(self) -> Dict[str, Dict[str, float]]:
+        """Load time vs generation time per model, in seconds.
+
+        Returns:
+            Model -> ``requests``, ``cold_starts`` (loads over
+            ``COLD_START_SECONDS``), ``load_seconds``, ``prompt_eval_seconds``,
+            ``eval_seconds`` and ``preloads``
+        """
+        with self._timing_lock:
+            return {model: dict(timings) for model, timings in self._model_timings.items()}
+
+    def last_usage(self) -> Optional[Dict[str, Any]]:
+        """Token counts and durations Ollama reported for this thread's last ``generate``.
+
+        Returns:
+            ``prompt_eval_count``, ``eval_count`` and the ``*_duration``
+            fields (nanoseconds) present in the response, or None if the
+            request failed
+        """
+        return getattr(self._local, "usage", None)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Concurrency metrics of this client's backend.
+
+        Returns:
+            Limiter state (current ``limit``, ``in_flight``, smoothed
+            ``queue_delay`` and ``service_time`` in seconds, ...) plus the
+            backend URL; ``limit`` is None without a limiter
+        """
+        metrics: Dict[str, Any] = self.limiter.metrics() if self.limiter is not None else {"limit": None}
+        metrics["base_url"] = self.base_url
+        metrics["models"] = self.model_timings()
+        return metrics
+
+    def _keep_alive_field(self) -> Dict[str, Any]:
+        return {"keep_alive": self.keep_alive} if self.keep_alive is not None else {}
+
+    def _record_timing(self, model: str, data: Dict[str, Any], preload: bool = False) -> None:
+        load = data.get('load_duration', 0) / 1e9
+        with self._timing_lock:
+            timings = self._model_timings.setdefault(model, {
+                "requests": 0, "preloads": 0, "cold_starts": 0, "load_seconds": 0.0,
+                "prompt_eval_seconds": 0.0, "eval_seconds": 0.0,
+            })
+            timings["preloads" if preload else "requests"] += 1
+            timings["cold_starts"] += load >= COLD_START_SECONDS
+            timings["load_seconds"] += load
+            timings["prompt_eval_seconds"] += data.get('prompt_eval_duration', 0) / 1e9
+            timings["eval_seconds"] += data.get('eval_duration', 0) / 1e9
+
+    def embed(self, text: str, model: Optional[str] = None) -> List[float]:
+        """Get an embedding vector for text from Ollama.
+
+        Args:
+            text: Text to embed
+            model: Embedding model (defaults to ``embedding_model``)
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            Exception: If there's an error with the API request
+        """
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/embeddings",
+                json={
+                    "model": model or self.embedding_model,
+                    "prompt": text,
+                    **self._keep_alive_field()
                 }
             )
             response.raise_for_status()
-            return response.json()['response']
+            return response.json()['embedding']
         except Exception as e:
             raise Exception(f"Ollama API error: {str(e)}")
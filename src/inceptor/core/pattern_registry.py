@@ -0,0 +1,335 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# A pattern of the form ``\b(word|other word|ci/cd)\b`` is a plain keyword list
+# and can be folded into the combined matcher as literal alternatives.
+_KEYWORD_LIST = re.compile(r'^\\b\(([\w /|-]+)\)\\b$')
+_PLAIN_KEYWORD = re.compile(r'^[\w /-]+$')
+
+
+class CompiledMatcher:
+    """Matcher built from a ``{category: [pattern, ...]}`` mapping.
+
+    Keyword-list patterns are merged into one alternation (longest keyword
+    first). For every keyword the per-category hits are precomputed by running
+    the original keyword-list patterns over the keyword itself, so a keyword
+    shared by several categories (``security``) or containing another keyword
+    (``team size`` / ``team``) is still reported everywhere it used to be.
+    Any other pattern is precompiled and run as its own pass, like ``findall``,
+    so it may overlap keywords and use inline flags, named groups and
+    backreferences.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.categories = list(patterns)
+        self.keyword_hits: Dict[str, List[Tuple[str, str]]] = {}
+        # (category, compiled pattern, group reported as the term)
+        self.passes: List[Tuple[str, Pattern[str], int]] = []
+
+        keywords = []
+        keyword_regexes: Dict[str, List[Pattern[str]]] = {}
+        for category, category_patterns in patterns.items():
+            for pattern in category_patterns:
+                keyword_list = _KEYWORD_LIST.match(pattern)
+                if keyword_list:
+                    keywords.extend(keyword_list.group(1).split('|'))
+                    keyword_regexes.setdefault(category, []).append(re.compile(pattern))
+                else:
+                    regex = re.compile(pattern)
+                    # Like findall, report the pattern's own first group if it has one
+                    self.passes.append((category, regex, 1 if regex.groups else 0))
+
+        for keyword in set(keywords):
+            hits = []
+            for category, regexes in keyword_regexes.items():
+                for regex in regexes:
+                    hits.extend((category, term) for term in regex.findall(keyword))
+            self.keyword_hits[keyword] = hits
+
+        self.regex: Optional[Pattern[str]] = None
+        if keywords:
+            ordered = sorted(set(keywords), key=lambda k: (-len(k), k))
+            self.regex = re.compile(r"\b(" + "|".join(re.escape(k) for k in ordered) + r")\b")
+
+    def new_result(self) -> Dict[str, Dict[str, None]]:
+        """Returns an empty accumulator for :meth:`scan`."""
+        return {c: {} for c in self.categories}
+
+    def scan(self, text: str, found: Dict[str, Dict[str, None]],
+             pos: int = 0, limit: Optional[int] = None) -> Optional[int]:
+        """Records matches in already-lowered ``text[pos:]`` into ``found``.
+
+        Only matches ending at or before ``limit`` are recorded. The earliest
+        start of a match that runs past ``limit`` is returned so that a caller
+        streaming the text can rescan from there once more text is available.
+        """
+        resume: Optional[int] = None
+        if self.regex is not None:
+            keyword_hits = self.keyword_hits
+            for match in self.regex.finditer(text, pos):
+                if limit is not None and match.end() > limit:
+                    resume = match.start()
+                    break
+                for category, term in keyword_hits[match.group(1)]:
+                    found[category][term] = None
+
+        for category, regex, term_group in self.passes:
+            terms = found[category]
+            for match in regex.finditer(text, pos):
+                if limit is not None and match.end() > limit:
+                    if resume is None or match.start() < resume:
+                        resume = match.start()
+                    break
+                terms[match.group(term_group) or ""] = None
+        return resume
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Scan ``text`` once and group the matches by category."""
+        found = self.new_result()
+        self.scan(text.lower(), found)
+        return {category: list(terms) for category, terms in found.items()}
+
+    def extract_stream(self, chunks: Iterable[str], overlap: int) -> Dict[str, List[str]]:
+        """Scan a sequence of text chunks, keeping at most one chunk in memory.
+
+        Matches that cross chunk boundaries are found by holding back the
+        last ``overlap`` characters (plus any match running into them) and
+        rescanning them together with the next chunk.
+        """
+        found = self.new_result()
+        prefix = ""  # one character preceding ``carry``, so \b sees real context
+        carry = ""
+        for chunk in chunks:
+            buffer = prefix + carry + chunk.lower()
+            start = len(prefix)
+            limit = len(buffer) - overlap
+            if limit <= start:
+                carry = buffer[start:]
+                continue
+            resume = self.scan(buffer, found, start, limit)
+            cut = limit if resume is None else min(resume, limit)
+            prefix, carry = buffer[cut - 1:cut], buffer[cut:]
+
+        self.scan(prefix + carry, found, len(prefix))
+        return {category: list(terms) for category, terms in found.items()}
+
+
+@dataclass
+class PatternCost:
+    """Time spent matching a single pattern, as measured by ``PatternRegistry.profile``."""
+    category: str
+    pattern: str
+    source: str
+    matches: int
+    seconds: float
+
+
+class PatternRegistry:
+    """Context patterns from the built-in table plus config files.
+
+    Each config file maps a category to either a list of regular expressions
+    or a mapping with ``patterns`` and/or ``keywords``::
+
+        technology:
+          - '\\b(rust|elixir)\\b'
+        healthcare:
+          keywords: [hl7, fhir, dicom]
+
+    Keywords are folded into the combined matcher's single alternation, so
+    they are the cheapest way to add terms. Files may be YAML or JSON.
+
+    The merged patterns are compiled once and cached for the process; the
+    files are re-stat'ed at most every ``check_interval`` seconds and the
+    cache is rebuilt when one of them changes.
+    """
+
+    ENV_VAR = "INCEPTOR_PATTERN_FILES"
+
+    def __init__(self, paths: Iterable[Union[str, Path]] = (), check_interval: float = 1.0):
+        """Initialize the registry.
+
+        Args:
+            paths: Config files to load patterns from
+            check_interval: Minimum seconds between checks for changed files
+        """
+        self.paths: List[Path] = [Path(p) for p in paths]
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._matcher: Optional[CompiledMatcher] = None
+        self._key: Optional[Tuple] = None
+        self._stamps: Tuple = ()
+        # Stamps of files that failed to load, so each broken version is reported once
+        self._failed_stamps: Optional[Tuple] = None
+        self._checked_at = float("-inf")
+        self._file_patterns: Dict[str, List[Tuple[str, str]]] = {}
+
+    @classmethod
+    def from_env(cls) -> "PatternRegistry":
+        """Creates a registry for the files listed in ``$INCEPTOR_PATTERN_FILES``."""
+        value = os.environ.get(cls.ENV_VAR, "")
+        return cls(p for p in value.split(os.pathsep) if p)
+
+    def add_file(self, path: Union[str, Path]) -> None:
+        """Registers another config file; it is loaded on the next lookup."""
+        with self._lock:
+            self.paths.append(Path(path))
+            self._checked_at = float("-inf")
+
+    def get_matcher(self, base: Dict[str, List[str]]) -> CompiledMatcher:
+        """Returns the compiled matcher for ``base`` merged with the config files.
+
+        Args:
+            base: Built-in ``{category: [pattern, ...]}`` table
+
+        Returns:
+            Cached CompiledMatcher, rebuilt only when ``base`` or a file changed
+        """
+        base_key = tuple((c, tuple(p)) for c, p in base.items())
+        now = time.monotonic()
+        if (self._matcher is not None and self._key == (base_key, self._stamps)
+                and now - self._checked_at < self.check_interval):
+            return self._matcher
+
+        with self._lock:
+            self._refresh(now)
+            key = (base_key, self._stamps)
+            if self._matcher is None or self._key != key:
+                self._matcher = CompiledMatcher(
+                    {c: [p for p, _ in entries] for c, entries in self._merge(base).items()}
+                )
+                self._key = key
+            return self._matcher
+
+    def sources(self, base: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, str]]]:
+        """Returns the merged patterns as ``{category: [(pattern, source), ...]}``."""
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._merge(base)
+
+    def profile(self, text: str, base: Dict[str, List[str]], repeat: int = 1) -> List[PatternCost]:
+        """Measures the cost of every pattern on a sample text.
+
+        Args:
+            text: Representative input
+            base: Built-in ``{category: [pattern, ...]}`` table
+            repeat: Runs per pattern; the fastest is reported
+
+        Returns:
+            PatternCost entries, most expensive first
+        """
+        lowered = text.lower()
+        costs = []
+        for category, entries in self.sources(base).items():
+            for pattern, source in entries:
+                regex = re.compile(pattern)
+                best = float("inf")
+                for _ in range(max(1, repeat)):
+                    start = time.perf_counter()
+                    matches = sum(1 for _ in regex.finditer(lowered))
+                    best = min(best, time.perf_counter() - start)
+                costs.append(PatternCost(category, pattern, source, matches, best))
+        return sorted(costs, key=lambda c: c.seconds, reverse=True)
+
+    def _refresh(self, now: float) -> None:
+        """Reloads the config files if the check interval passed and one changed.
+
+        A file that no longer loads is logged once and the last good
+        patterns stay in use until it is fixed.
+        """
+        if now - self._checked_at < self.check_interval:
+            return
+        stamps = self._file_stamps()
+        if stamps != self._stamps and stamps != self._failed_stamps:
+            try:
+                self._file_patterns = self._load_files()
+            except (OSError, ValueError) as e:
+                self._failed_stamps = stamps
+                logger.warning("Pattern config not reloaded, keeping the previous patterns: %s", e)
+            else:
+                self._stamps = stamps
+                self._failed_stamps = None
+        self._checked_at = now
+
+    def _merge(self, base: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, str]]]:
+        merged = {c: [(p, "builtin") for p in patterns] for c, patterns in base.items()}
+        for category, entries in self._file_patterns.items():
+            known = {p for p, _ in merged.get(category, [])}
+            merged.setdefault(category, []).extend(e for e in entries if e[0] not in known)
+        return merged
+
+    def _file_stamps(self) -> Tuple:
+        stamps = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                stamps.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append((str(path), None, None))
+        return tuple(stamps)
+
+    def _load_files(self) -> Dict[str, List[Tuple[str, str]]]:
+        loaded: Dict[str, List[Tuple[str, str]]] = {}
+        for path in self.paths:
+            if path.exists():
+                for category, patterns in self.load_file(path).items():
+                    loaded.setdefault(category, []).extend((p, str(path)) for p in patterns)
+        return loaded
+
+    @staticmethod
+    def load_file(path: Union[str, Path]) -> Dict[str, List[str]]:
+        """Reads and validates one config file.
+
+        Args:
+            path: YAML (``.yaml``/``.yml``) or JSON file
+
+        Returns:
+            ``{category: [pattern, ...]}`` with keywords turned into patterns
+
+        Raises:
+            ValueError: If the file is malformed or a pattern does not compile
+        """
+        path = Path(path)
+        with open(path, "r", encoding="utf-8") as f:
+            if path.suffix in (".yaml", ".yml"):
+                import yaml
+                try:
+                    data = yaml.safe_load(f) or {}
+                except yaml.YAMLError as e:
+                    raise ValueError(f"{path}: {e}")
+            else:
+                data = json.load(f)
+
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected a mapping of category to patterns")
+
+        result: Dict[str, List[str]] = {}
+        for category, spec in data.items():
+            if isinstance(spec, dict):
+                patterns = list(spec.get("patterns", []))
+                keywords = [str(k).lower() for k in spec.get("keywords", [])]
+                if keywords:
+                    # Plain words are left unescaped so the pattern is recognised
+                    # as a keyword list and folded into the single alternation.
+                    words = [k if _PLAIN_KEYWORD.match(k) else re.escape(k) for k in keywords]
+                    patterns.append(r"\b(" + "|".join(words) + r")\b")
+            elif isinstance(spec, list):
+                patterns = list(spec)
+            else:
+                raise ValueError(f"{path}: category '{category}' must be a list or mapping")
+
+            for pattern in patterns:
+                try:
+                    re.compile(pattern)
+                except (re.error, TypeError) as e:
+                    raise ValueError(f"{path}: invalid pattern {pattern!r} in '{category}': {e}")
+            result[str(category)] = patterns
+        return result
@@ -0,0 +1,217 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple, Union
+
+# pstats function key: (file name, first line, function name)
+FunctionKey = Tuple[str, int, str]
+
+
+def _frame_name(func: FunctionKey) -> str:
+    filename, line, name = func
+    if filename == "~":  # built-in
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def folded_stacks(stats: pstats.Stats, min_share: float = 1e-4) -> Iterator[Tuple[str, int]]:
+    """Turns cProfile statistics into folded stacks (``a;b;c microseconds``).
+
+    cProfile only records caller/callee pairs, so time along deeper paths
+    is apportioned by the share each caller contributed to a callee's
+    cumulative time (as flameprof and gprof2dot do). Recursive calls are
+    folded into the first occurrence on a path, and calls into functions
+    missing from ``stats`` are not followed.
+
+    Args:
+        stats: Profile statistics
+        min_share: Paths worth less than this fraction of the total are dropped
+
+    Yields:
+        (stack, self time in microseconds) pairs
+    """
+    entries = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, edge_cumulative))
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    total = sum(entry[2] for entry in entries.values()) or 1.0
+
+    def walk(func: FunctionKey, time_here: float, path: List[FunctionKey]) -> Iterator[Tuple[str, int]]:
+        _, _, self_time, cumulative, _ = entries[func]
+        scale = time_here / cumulative if cumulative else 0.0
+        path = path + [func]
+        own = self_time * scale
+        if own >= total * min_share:
+            yield ";".join(_frame_name(f) for f in path), int(own * 1e6)
+        for callee, edge_cumulative in callees.get(func, ()):
+            child_time = edge_cumulative * scale
+            if callee not in path and child_time >= total * min_share:
+                yield from walk(callee, child_time, path)
+
+    for root in roots:
+        yield from walk(root, entries[root][3], [])
+
+
+class InceptionProfiler:
+    """Profiles the orchestration side of inception runs.
+
+    Used as a context manager around ``DreamArchitect.inception`` (or any
+    code driving a model client). Calls to the client's ``generate`` and
+    ``embed`` are timed and pruned from the profile, so the run splits into:
+
+    - ``model_wait``: wall time spent inside model calls
+    - ``local_cpu``: CPU time of the profiled thread outside model calls
+    - ``other``: the rest (GIL contention, disk I/O, profiler overhead)
+
+    ``save`` writes the cProfile statistics and the same data as folded
+    stacks, the input format of flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, client: Any = None):
+        """Initialize the profiler.
+
+        Args:
+            client: Model client whose calls count as model wait (e.g.
+                ``architect.ollama``); without one everything is local
+        """
+        self.client = client
+        self.profile = cProfile.Profile()
+        self.wall = 0.0
+        self.model_wait = 0.0
+        self.model_calls = 0
+        self.local_cpu = 0.0
+        self._model_cpu = 0.0
+        self._patched: List[Tuple[str, bool, Any]] = []
+
+    @property
+    def other(self) -> float:
+        return max(0.0, self.wall - self.model_wait - self.local_cpu)
+
+    def __enter__(self) -> "InceptionProfiler":
+        self._thread_id = threading.get_ident()
+        for name in ("generate", "embed"):
+            if self.client is not None and hasattr(self.client, name):
+                self._patch(name)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profile.disable()
+        self.wall += time.perf_counter() - self._wall_start
+        self.local_cpu += time.thread_time() - self._cpu_start - self._model_cpu
+        self._model_cpu = 0.0
+        for name, had_attribute, original in self._patched:
+            if had_attribute:
+                setattr(self.client, name, original)
+            else:
+                delattr(self.client, name)
+        self._patched.clear()
+
+    def _patch(self, name: str) -> None:
+        original = getattr(self.client, name)
+
+        # Profiling stays on (disabling it would drop the callers of
+        # everything after the call); model code is pruned in stats().
+        def model_call(*args: Any, **kwargs: Any) -> Any:
+            # thread_time() only covers the profiled thread
+            if threading.get_ident() != self._thread_id:
+                return original(*args, **kwargs)
+            started, cpu_started = time.perf_counter(), time.thread_time()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.model_wait += time.perf_counter() - started
+                self._model_cpu += time.thread_time() - cpu_started
+                self.model_calls += 1
+
+        self._patched.append((name, name in vars(self.client), original))
+        setattr(self.client, name, model_call)
+
+    def stats(self) -> pstats.Stats:
+        """cProfile statistics without the model side.
+
+        Functions only reached through model calls are removed; cumulative
+        times of local callers still include the time they waited for the
+        model.
+        """
+        stats = pstats.Stats(self.profile)
+        entries = stats.stats  # type: ignore[attr-defined]
+        callees: Dict[FunctionKey, List[FunctionKey]] = {}
+        for func, entry in entries.items():
+            for caller in entry[4]:
+                callees.setdefault(caller, []).append(func)
+        # Local code: reachable from the profiled block without entering a model call
+        local: Set[FunctionKey] = set()
+        pending = [func for func, entry in entries.items() if not entry[4]]
+        while pending:
+            func = pending.pop()
+            if func in local or func[2] == "model_call" and func[0] == __file__:
+                continue
+            local.add(func)
+            pending.extend(callees.get(func, ()))
+        stats.stats = {func: entry for func, entry in entries.items() if func in local}  # type: ignore[attr-defined]
+        stats.total_tt = sum(entry[2] for entry in stats.stats.values())  # type: ignore[attr-defined]
+        stats.fcn_list = 0  # type: ignore[attr-defined]
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall": round(self.wall, 6),
+            "model_wait": round(self.model_wait, 6),
+            "model_calls": self.model_calls,
+            "local_cpu": round(self.local_cpu, 6),
+            "other": round(self.other, 6),
+        }
+
+    def summary(self, top: int = 15, sort: str = "cumulative") -> str:
+        """Time split plus the ``top`` local functions from cProfile."""
+        lines = [
+            f"Wall time:   {self.wall:.3f}s",
+            f"Model wait:  {self.model_wait:.3f}s in {self.model_calls} calls",
+            f"Local CPU:   {self.local_cpu:.3f}s",
+            f"Other:       {self.other:.3f}s",
+        ]
+        stream = io.StringIO()
+        stats = self.stats()
+        stats.stream = stream  # type: ignore[attr-defined]
+        stats.strip_dirs().sort_stats(sort).print_stats(top)
+        return "\n".join(lines) + "\n" + stream.getvalue()
+
+    def save(self, path: Union[str, Path]) -> Dict[str, str]:
+        """Writes ``<path>.prof`` (pstats) and ``<path>.folded`` (flame graph stacks).
+
+        Returns:
+            Format -> written file path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        prof = path.with_name(path.name + ".prof")
+        folded = path.with_name(path.name + ".folded")
+        stats = self.stats()
+        stats.dump_stats(str(prof))
+        with open(folded, "w", encoding="utf-8") as f:
+            for stack, microseconds in folded_stacks(stats):
+                if microseconds:
+                    f.write(f"{stack} {microseconds}\n")
+        return {"pstats": str(prof), "folded": str(folded)}
+
+
+def profile_inception(architect: Any) -> InceptionProfiler:
+    """Profiler for runs of ``architect`` (its model client counts as model wait).
+
+    Example:
+        with profile_inception(architect) as profile:
+            architect.inception(problem)
+        print(profile.summary())
+        profile.save("inception")
+    """
+    return InceptionProfiler(architect.ollama)
@@ -0,0 +1,237 @@
+import io
+import json
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import IO, Dict, List, Mapping, Optional, Union
+
+from .blob_store import BlobStore
+from .models import Solution
+
+# File name -> content; str content is written as UTF-8
+ProjectFiles = Mapping[str, Union[str, bytes]]
+
+# Archive suffix -> (tarfile mode for seekable files, streaming mode)
+_TAR_MODES = {
+    ".tar": ("w", "w|"),
+    ".tar.gz": ("w:gz", "w|gz"),
+    ".tgz": ("w:gz", "w|gz"),
+    ".tar.bz2": ("w:bz2", "w|bz2"),
+    ".tar.xz": ("w:xz", "w|xz"),
+}
+
+_UNSAFE_NAME = re.compile(r"[^\w.-]+")
+
+
+def _encode(content: Union[str, bytes]) -> bytes:
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def _archive_format(name: str) -> str:
+    name = name.lower()
+    if name.endswith(".zip"):
+        return ".zip"
+    for suffix in sorted(_TAR_MODES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return suffix
+    raise ValueError(f"Unsupported archive format: {name} (use .zip, .tar, .tar.gz, .tgz, .tar.bz2 or .tar.xz)")
+
+
+def safe_relative_path(name: str) -> str:
+    """Validates a project file name and returns it in POSIX form.
+
+    Raises:
+        ValueError: If the name is empty, absolute or escapes the project
+    """
+    path = PurePosixPath(name.replace("\\", "/"))
+    if not path.parts or path.is_absolute() or ".." in path.parts or re.match(r"^[A-Za-z]:", name):
+        raise ValueError(f"Invalid project file name: {name!r}")
+    return str(path)
+
+
+def solution_files(solution: Solution) -> Dict[str, str]:
+    """Lays out a Solution as project files.
+
+    ``solution.json`` holds the whole solution. Each implementation task
+    gets ``<level>/<task_id>/result.json``, and every string field of its
+    main section (``implementation``, ``deployment``, ...) is also written
+    on its own, e.g. ``reality/<task_id>/code.txt``.
+    """
+    files = {"solution.json": json.dumps(solution.to_dict(), indent=2, ensure_ascii=False)}
+    for level, results in solution.implementation.items():
+        if not isinstance(results, dict):
+            continue
+        for task_id, result in results.items():
+            base = f"{level}/{_UNSAFE_NAME.sub('_', str(task_id)) or 'task'}"
+            files[f"{base}/result.json"] = json.dumps(result, indent=2, ensure_ascii=False)
+            for section in (result.values() if isinstance(result, dict) else ()):
+                if isinstance(section, dict):
+                    for key, value in section.items():
+                        if isinstance(value, str) and value:
+                            files[f"{base}/{_UNSAFE_NAME.sub('_', key)}.txt"] = value
+    return files
+
+
+class ProjectExporter:
+    """Writes generated project files to a directory or an archive.
+
+    Directory exports are staged next to the target, written concurrently
+    (each file to a temporary name, then renamed into place) and swapped in
+    with a rename, so the target is never seen half-written. Archive
+    exports stream entries straight into a zip or tar file.
+    """
+
+    def __init__(self, max_workers: int = 8, blob_store: Optional[BlobStore] = None):
+        """Initialize the exporter.
+
+        Args:
+            max_workers: Threads used to write files concurrently
+            blob_store: When set, directory exports hardlink files from this
+                content-addressed store instead of writing a copy each time
+        """
+        self.max_workers = max(1, max_workers)
+        self.blob_store = blob_store
+
+    def write_files(self, files: ProjectFiles, directory: Union[str, Path]) -> List[str]:
+        """Writes files into ``directory`` concurrently, each one atomically.
+
+        Existing files not in ``files`` are left alone.
+
+        Args:
+            files: Relative file name -> content
+            directory: Destination directory (created if missing)
+
+        Returns:
+            Written paths, in the order of ``files``
+
+        Raises:
+            ValueError: If a file name is absolute or escapes ``directory``
+        """
+        directory = Path(directory)
+        targets = [(directory / safe_relative_path(name), content) for name, content in files.items()]
+        for parent in {path.parent for path, _ in targets}:
+            parent.mkdir(parents=True, exist_ok=True)
+
+        if self.max_workers == 1 or len(targets) < 2:
+            for path, content in targets:
+                self._write_file(path, content)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets))) as pool:
+                # list() re-raises the first write error
+                list(pool.map(lambda item: self._write_file(*item), targets))
+        return [str(path) for path, _ in targets]
+
+    def export_dir(self, files: ProjectFiles, target: Union[str, Path]) -> List[str]:
+        """Writes a complete project and swaps it in place of ``target``.
+
+        The project is written to a staging directory beside ``target``. An
+        existing ``target`` is then renamed aside, the staging directory is
+        renamed to ``target`` and the old copy is removed. If anything
+        fails, the staging directory is removed and the old project is
+        restored.
+
+        Args:
+            files: Relative file name -> content
+            target: Project directory to create or replace
+
+        Returns:
+            Paths of the exported files under ``target``
+        """
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent))
+        backup: Optional[Path] = None
+        try:
+            self.write_files(files, staging)
+            if target.exists():
+                backup = target.with_name(f".{target.name}.{os.getpid()}.{time.monotonic_ns()}.old")
+                os.rename(target, backup)
+            os.rename(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            if backup is not None and not target.exists():
+                os.rename(backup, target)
+            raise
+        if backup is not None:
+            shutil.rmtree(backup, ignore_errors=True)
+        return [str(target / safe_relative_path(name)) for name in files]
+
+    def export_archive(self, files: ProjectFiles, destination: Union[str, Path, IO[bytes]],
+                       format: Optional[str] = None, root: str = "") -> None:
+        """Streams files into a zip or tar archive.
+
+        A path destination is written to a temporary file and renamed into
+        place when complete. A binary file object (e.g. stdout) is written
+        as a stream.
+
+        Args:
+            files: Relative file name -> content
+            destination: Archive path or writable binary file object
+            format: Archive suffix such as ``.zip`` or ``.tar.gz``; taken from
+                the path when omitted
+            root: Directory name to prefix every entry with
+
+        Raises:
+            ValueError: If the format is unsupported or a file name is invalid
+        """
+        if isinstance(destination, (str, Path)):
+            path = Path(destination)
+            fmt = _archive_format(format or path.name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    self._write_archive(files, f, fmt, root, streaming=False)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        else:
+            if not format:
+                raise ValueError("format is required when exporting to a file object")
+            self._write_archive(files, destination, _archive_format(format), root, streaming=True)
+
+    @staticmethod
+    def _write_archive(files: ProjectFiles, fileobj: IO[bytes], fmt: str, root: str, streaming: bool) -> None:
+        prefix = f"{safe_relative_path(root)}/" if root else ""
+        mtime = time.time()
+        if fmt == ".zip":
+            with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for name, content in files.items():
+                    archive.writestr(prefix + safe_relative_path(name), _encode(content))
+            return
+
+        mode = _TAR_MODES[fmt][1 if streaming else 0]
+        with tarfile.open(fileobj=fileobj, mode=mode) as archive:
+            for name, content in files.items():
+                data = _encode(content)
+                info = tarfile.TarInfo(prefix + safe_relative_path(name))
+                info.size = len(data)
+                info.mtime = mtime
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+
+    def _write_file(self, path: Path, content: Union[str, bytes]) -> None:
+        if self.blob_store is not None:
+            self.blob_store.store(content, path)
+        else:
+            self._write_atomic(path, content)
+
+    @staticmethod
+    def _write_atomic(path: Path, content: Union[str, bytes]) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_encode(content))
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
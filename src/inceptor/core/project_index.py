@@ -0,0 +1,242 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    problem TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    architecture TEXT NOT NULL DEFAULT '',
+    info TEXT NOT NULL,
+    info_mtime REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS projects_created ON projects (created);
+
+CREATE TABLE IF NOT EXISTS project_technologies (
+    name TEXT NOT NULL REFERENCES projects (name) ON DELETE CASCADE,
+    technology TEXT NOT NULL,
+    PRIMARY KEY (technology, name)
+);
+
+CREATE TABLE IF NOT EXISTS project_components (
+    name TEXT NOT NULL REFERENCES projects (name) ON DELETE CASCADE,
+    component TEXT NOT NULL,
+    PRIMARY KEY (component, name)
+);
+"""
+
+INFO_FILE = "project_info.json"
+
+DateLike = Union[str, date, datetime]
+
+
+def _component_name(component: Any) -> str:
+    if isinstance(component, dict):
+        component = component.get("name", "")
+    return str(component).strip().lower()
+
+
+def _iso(value: DateLike) -> str:
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+
+
+class ProjectIndex:
+    """SQLite index of generated project directories.
+
+    Mirrors each project's ``project_info.json`` (problem, timestamp,
+    technologies, components, files) so that listing and filtering thousands
+    of projects is a query rather than a directory walk that parses every
+    file. Writers call ``update`` after saving a project; ``refresh`` picks
+    up projects added, changed or removed behind the index's back, and
+    ``rebuild`` recreates it from disk.
+    """
+
+    def __init__(self, projects_dir: Union[str, Path] = "projects", path: Optional[Union[str, Path]] = None):
+        """Open (or create) the index.
+
+        Args:
+            projects_dir: Directory holding one subdirectory per project
+            path: Index database (default: ``<projects_dir>/.index.db``)
+        """
+        self.projects_dir = Path(projects_dir)
+        self.projects_dir.mkdir(parents=True, exist_ok=True)
+        self.path = Path(path) if path else self.projects_dir / ".index.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ProjectIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def update(self, name: str, info: Dict[str, Any], info_mtime: Optional[float] = None) -> None:
+        """Adds or replaces a project.
+
+        Args:
+            name: Project directory name
+            info: Contents of its ``project_info.json``
+            info_mtime: Modification time of that file (read from disk if omitted)
+        """
+        if info_mtime is None:
+            info_mtime = self._info_mtime(name)
+        with self._lock, self._conn:
+            self._upsert(name, info, info_mtime)
+
+    def remove(self, name: str) -> bool:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM projects WHERE name = ?", (name,)).rowcount > 0
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Returns a project's ``project_info.json`` contents, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT info FROM projects WHERE name = ?", (name,)).fetchone()
+        return json.loads(row["info"]) if row else None
+
+    def search(self, technology: Optional[str] = None, component: Optional[str] = None,
+               since: Optional[DateLike] = None, until: Optional[DateLike] = None,
+               text: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lists projects matching all given filters, oldest first.
+
+        Args:
+            technology: Technology name (case-insensitive, exact)
+            component: Component name (case-insensitive, exact)
+            since: Earliest creation date/time (inclusive)
+            until: Latest creation date/time (exclusive)
+            text: Substring of the problem description (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            Dicts with ``name``, ``problem`` and ``created``
+        """
+        query = "SELECT p.name, p.problem, p.created FROM projects p"
+        where, params = [], []
+        if technology:
+            where.append("EXISTS (SELECT 1 FROM project_technologies t "
+                         "WHERE t.technology = ? AND t.name = p.name)")
+            params.append(technology.strip().lower())
+        if component:
+            where.append("EXISTS (SELECT 1 FROM project_components c "
+                         "WHERE c.component = ? AND c.name = p.name)")
+            params.append(component.strip().lower())
+        if since:
+            where.append("p.created >= ?")
+            params.append(_iso(since))
+        if until:
+            where.append("p.created < ?")
+            params.append(_iso(until))
+        if text:
+            where.append("p.problem LIKE ? ESCAPE '\\'")
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY p.created, p.name"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        self.refresh_if_stale()
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params)]
+
+    def names(self, **filters: Any) -> List[str]:
+        """Project names matching ``search`` filters, sorted by name."""
+        return sorted(project["name"] for project in self.search(**filters))
+
+    def is_stale(self) -> bool:
+        """True when projects were added or removed on disk since indexing.
+
+        Only directory names are compared, no file is read. Edits inside an
+        existing project are not detected; use ``refresh`` for those.
+        """
+        with self._lock:
+            indexed = {row[0] for row in self._conn.execute("SELECT name FROM projects")}
+        return indexed != set(self._project_dirs())
+
+    def refresh_if_stale(self) -> int:
+        return self.refresh() if self.is_stale() else 0
+
+    def refresh(self) -> int:
+        """Brings the index in line with disk.
+
+        Only projects whose ``project_info.json`` is new or has a different
+        mtime are re-read. Directories without a readable one are indexed
+        with empty info, so they stay listed and ``is_stale`` sees the same
+        set of names.
+
+        Returns:
+            Number of projects added, updated or removed
+        """
+        on_disk = {name: self._info_mtime(name) for name in self._project_dirs()}
+
+        with self._lock, self._conn:
+            indexed = dict(self._conn.execute("SELECT name, info_mtime FROM projects").fetchall())
+            changes = 0
+            for name in indexed.keys() - on_disk.keys():
+                self._conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+                changes += 1
+            for name, mtime in on_disk.items():
+                if indexed.get(name) != mtime:
+                    info = self._read_info(name) if mtime else None
+                    self._upsert(name, info or {}, mtime)
+                    changes += 1
+        return changes
+
+    def rebuild(self) -> int:
+        """Drops the index and re-reads every project from disk.
+
+        Returns:
+            Number of projects indexed
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM projects")
+        self.refresh()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def _upsert(self, name: str, info: Dict[str, Any], info_mtime: float) -> None:
+        self._conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+        self._conn.execute(
+            "INSERT INTO projects (name, problem, created, architecture, info, info_mtime) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, str(info.get("problem", "")), str(info.get("timestamp", "")),
+             str(info.get("architecture", "")), json.dumps(info, ensure_ascii=False), info_mtime)
+        )
+        technologies = {str(t).strip().lower() for t in info.get("technologies", []) or []}
+        components = {_component_name(c) for c in info.get("components", []) or []}
+        self._conn.executemany("INSERT INTO project_technologies (name, technology) VALUES (?, ?)",
+                               [(name, t) for t in technologies if t])
+        self._conn.executemany("INSERT INTO project_components (name, component) VALUES (?, ?)",
+                               [(name, c) for c in components if c])
+
+    def _project_dirs(self) -> List[str]:
+        # Dot names are the index itself, blob stores and export staging dirs
+        with os.scandir(self.projects_dir) as entries:
+            return [entry.name for entry in entries if entry.is_dir() and not entry.name.startswith(".")]
+
+    def _info_mtime(self, name: str) -> float:
+        try:
+            return os.stat(self.projects_dir / name / INFO_FILE).st_mtime
+        except OSError:
+            return 0.0
+
+    def _read_info(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.projects_dir / name / INFO_FILE, "r", encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return info if isinstance(info, dict) else None
@@ -1,5 +1,24 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+from .template_engine import CompiledTemplate, compile_template
+from .token_budget import estimate_tokens, shrink
+
+# (class, level) -> (template attribute, compiled template); recompiled when
+# the attribute is reassigned
+_compiled: Dict[Tuple[type, int], Tuple[str, CompiledTemplate]] = {}
+
+
 class PromptTemplates:
-    """Templates for generating prompts at different architecture levels."""
+    """Templates for generating prompts at different architecture levels.
+
+    Each template is compiled once (see ``CompiledTemplate``). Custom
+    templates come from subclasses overriding the ``*_PROMPT`` attributes
+    or from template files (``from_directory``).
+    """
+
+    # Template attribute and file name (``<name>.txt``) of each level
+    LEVEL_NAMES = {1: "limbo", 2: "dream", 3: "reality", 4: "deeper", 5: "deepest"}
 
     LIMBO_PROMPT = """
 Jesteś Meta-Architect. Analizujesz problem biznesowy i tworzysz wysokopoziomową architekturę.
@@ -159,22 +178,154 @@ Odpowiedź w JSON:
 }}
 """
 
+    # How much each field matters when a prompt must be trimmed to a token
+    # budget: lower priorities are trimmed first, the largest field first.
+    FIELD_PRIORITIES: Dict[int, Dict[str, int]] = {
+        1: {"context": 1, "problem": 3},
+        2: {"components": 1, "context": 1, "task": 3},
+        3: {"context": 1, "specification": 2, "task": 3},
+        4: {"context": 1, "task": 2},
+        5: {"context": 1, "task": 2},
+    }
+
+    # Fields are never trimmed below this many tokens
+    MIN_FIELD_TOKENS = 32
+
     @classmethod
-    def get_prompt(cls, level, **kwargs):
+    def get_prompt(cls, level, budget: Optional[int] = None, **kwargs):
         """Get the appropriate prompt template for the given level.
         
         Args:
             level: ArchitectureLevel enum value
+            budget: Maximum prompt size in (estimated) tokens; larger
+                fields are trimmed to fit (see ``fit``)
             **kwargs: Format arguments for the prompt
             
         Returns:
             Formatted prompt string
         """
-        prompts = {
-            1: cls.LIMBO_PROMPT,
-            2: cls.DREAM_PROMPT,
-            3: cls.REALITY_PROMPT,
-            4: cls.DEEPER_PROMPT,
-            5: cls.DEEPEST_PROMPT
+        if budget is not None:
+            return cls.fit(level, budget, **kwargs)[0]
+        template = cls.compiled(level)
+        return template.render(**cls._fields(level, template, kwargs))
+
+    @classmethod
+    def fit(cls, level, budget: int, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """Format a prompt, trimming its fields to fit a token budget.
+
+        Fields are trimmed in ``FIELD_PRIORITIES`` order, just enough to
+        fit: JSON fields lose their indentation, then their longest strings
+        (code, specifications); plain text is cut at the end. Each cut is
+        marked in the prompt. Token counts come from ``estimate_tokens``.
+
+        Args:
+            level: ArchitectureLevel enum value
+            budget: Maximum prompt size in tokens (context window minus the
+                tokens reserved for the response)
+            **kwargs: Format arguments for the prompt
+
+        Returns:
+            Tuple of the prompt and a report: ``tokens`` (estimated size),
+            ``budget``, ``dropped_tokens`` and ``fields`` (tokens dropped
+            per trimmed field)
+        """
+        template = cls.compiled(level)
+        fields = {name: str(value) for name, value in cls._fields(level, template, kwargs).items()}
+        # A field filling several slots counts once per slot
+        uses = {name: template.slots.count(name) for name in fields}
+        sizes = {name: estimate_tokens(value) for name, value in fields.items()}
+        excess = template.literal_tokens + sum(sizes[name] * uses[name] for name in fields) - budget
+        dropped: Dict[str, int] = {}
+
+        priorities = cls.FIELD_PRIORITIES.get(getattr(level, "value", level), {})
+        for name in sorted(fields, key=lambda name: (priorities.get(name, 0), -sizes[name])):
+            if excess <= 0:
+                break
+            target = max(cls.MIN_FIELD_TOKENS, sizes[name] - -(-excess // uses[name]))
+            if target >= sizes[name]:
+                continue
+            fields[name] = shrink(fields[name], target)
+            saved = (sizes[name] - estimate_tokens(fields[name])) * uses[name]
+            if saved > 0:
+                dropped[name] = saved
+                excess -= saved
+
+        report = {
+            "tokens": excess + budget,
+            "budget": budget,
+            "dropped_tokens": sum(dropped.values()),
+            "fields": dropped,
         }
-        return prompts[level].format(**kwargs)
+        return template.render(**fields), report
+
+    @classmethod
+    def compiled(cls, level) -> CompiledTemplate:
+        """Compiled template of a level (``ArchitectureLevel`` or 1-5)."""
+        key = (cls, getattr(level, "value", level))
+        cached = _compiled.get(key)
+        if cached is not None and getattr(cls, cached[0]) is cached[1].source:
+            return cached[1]
+        name = cls.LEVEL_NAMES[key[1]]
+        attribute = f"{name.upper()}_PROMPT"
+        template = compile_template(getattr(cls, attribute), name)
+        _compiled[key] = (attribute, template)
+        return template
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, Path]) -> Type["PromptTemplates"]:
+        """Templates with levels overridden by files in ``directory``.
+
+        Files are named after the level (``limbo.txt``, ``dream.txt``,
+        ``reality.txt``, ``deeper.txt``, ``deepest.txt``); levels without a
+        file keep the built-in template. Files are validated when loaded:
+        they may only use the placeholders of the level they replace.
+
+        Args:
+            directory: Directory holding the template files
+
+        Returns:
+            A ``PromptTemplates`` subclass to pass as ``templates`` to
+            ``DreamArchitect``
+
+        Raises:
+            ValueError: If the directory is missing or a template is invalid
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise ValueError(f"Template directory not found: {directory}")
+        overrides: Dict[str, str] = {}
+        for level, name in cls.LEVEL_NAMES.items():
+            path = directory / f"{name}.txt"
+            if not path.exists():
+                continue
+            template = CompiledTemplate.from_file(path)
+            known = cls._known_fields(level)
+            unknown = template.fields - known
+            if unknown:
+                raise ValueError(f"Unknown placeholders in {path}: {', '.join(sorted(unknown))} "
+                                 f"(use {', '.join(sorted(known))})")
+            overrides[f"{name.upper()}_PROMPT"] = template.source
+        return type(cls.__name__, (cls,), overrides)
+
+    @classmethod
+    def _known_fields(cls, level) -> set:
+        level = getattr(level, "value", level)
+        return set(cls.compiled(level).fields) | set(cls.FIELD_PRIORITIES.get(level, {}))
+
+    @classmethod
+    def _fields(cls, level, template: CompiledTemplate, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """The fields ``template`` uses; level fields it leaves out are ignored.
+
+        Raises:
+            ValueError: If a field is unknown to the level or one the
+                template uses is missing
+        """
+        if kwargs.keys() == template.fields:
+            return kwargs
+        unknown = kwargs.keys() - template.fields
+        if unknown and unknown - cls._known_fields(level):
+            raise ValueError(f"Unknown fields for template {template.name}: "
+                             f"{', '.join(sorted(unknown - cls._known_fields(level)))}")
+        fields = {name: value for name, value in kwargs.items() if name in template.fields}
+        template.validate(fields)
+        return fields
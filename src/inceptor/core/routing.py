@@ -0,0 +1,167 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .enums import ArchitectureLevel
+from .stats import percentile
+
+LEVELS = tuple(level.name.lower() for level in ArchitectureLevel)
+
+# Values of the ``complexity`` field LIMBO assigns to components
+COMPLEXITIES = ("simple", "medium", "complex")
+
+
+class ModelRouter:
+    """Picks the model for each prompt of an inception.
+
+    Rules are checked in order and the first match wins:
+
+    1. ``complexity``: model per LIMBO component complexity, for the DREAM
+       and REALITY nodes of that component
+    2. ``levels``: model per level (``limbo``, ``dream``, ...)
+    3. ``prompt_tokens``: ``(max_tokens, model)`` pairs; the first whose
+       limit the prompt fits under
+    4. ``default``
+
+    If a model fails (request error or unusable response), its
+    ``fallbacks`` are tried in order, then the default model. Latency,
+    token counts, errors and fallbacks are recorded per model.
+    """
+
+    def __init__(self, default: str = "mistral:7b", levels: Optional[Mapping[str, str]] = None,
+                 complexity: Optional[Mapping[str, str]] = None,
+                 prompt_tokens: Optional[Iterable[Sequence[Any]]] = None,
+                 fallbacks: Optional[Mapping[str, Sequence[str]]] = None, history: int = 1000):
+        """Initialize the router.
+
+        Args:
+            default: Model used when no rule matches, and as last fallback
+            levels: Level name -> model
+            complexity: Component complexity -> model
+            prompt_tokens: ``(max_tokens, model)`` pairs, checked from the
+                smallest limit up
+            fallbacks: Model -> models to try when it fails
+            history: Latencies kept per model for percentiles
+
+        Raises:
+            ValueError: If a level or complexity name is unknown
+        """
+        self.default = default
+        self.levels = dict(levels or {})
+        self.complexity = dict(complexity or {})
+        self.prompt_tokens: List[Tuple[int, str]] = sorted((int(limit), model) for limit, model in prompt_tokens or ())
+        self.fallbacks = {model: list(chain) for model, chain in (fallbacks or {}).items()}
+        unknown = set(self.levels) - set(LEVELS) | set(self.complexity) - set(COMPLEXITIES)
+        if unknown:
+            raise ValueError(f"Unknown routing keys: {', '.join(sorted(unknown))} "
+                             f"(levels: {', '.join(LEVELS)}; complexity: {', '.join(COMPLEXITIES)})")
+        self._history = history
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "ModelRouter":
+        """Builds a router from a config mapping with the constructor's keys.
+
+        Raises:
+            ValueError: If the mapping has other keys
+        """
+        unknown = set(config) - {"default", "levels", "complexity", "prompt_tokens", "fallbacks", "history"}
+        if unknown:
+            raise ValueError(f"Unknown routing options: {', '.join(sorted(unknown))}")
+        return cls(**{key: value for key, value in config.items() if value is not None})
+
+    @property
+    def needs_prompt_size(self) -> bool:
+        return bool(self.prompt_tokens)
+
+    def route(self, level: str, complexity: Optional[str] = None, prompt_tokens: Optional[int] = None) -> List[str]:
+        """Models to try for a prompt, in order: the routed model, then fallbacks.
+
+        Args:
+            level: Level name (``limbo`` ... ``deepest``)
+            complexity: Complexity of the component the prompt is about
+            prompt_tokens: Estimated prompt size
+
+        Returns:
+            Distinct model names, ending with the default model
+        """
+        model = self.complexity.get(complexity or "") or self.levels.get(level)
+        if model is None and prompt_tokens is not None:
+            model = next((model for limit, model in self.prompt_tokens if prompt_tokens <= limit), None)
+        chain = [model or self.default]
+        pending = list(self.fallbacks.get(chain[0], ()))
+        while pending:
+            candidate = pending.pop(0)
+            if candidate not in chain:
+                chain.append(candidate)
+                pending.extend(self.fallbacks.get(candidate, ()))
+        if self.default not in chain:
+            chain.append(self.default)
+        return chain
+
+    def record(self, model: str, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+               error: bool = False, fallback: bool = False, load_seconds: float = 0.0) -> None:
+        """Adds one request to the statistics of ``model``.
+
+        Args:
+            model: Model that served (or failed) the request
+            latency: Seconds the request took
+            prompt_tokens: Prompt size in tokens
+            completion_tokens: Response size in tokens
+            error: The request failed or its response was unusable
+            fallback: The model was tried because another one failed
+            load_seconds: Part of ``latency`` the server spent loading the
+                model
+        """
+        with self._lock:
+            stats = self._stats.get(model)
+            if stats is None:
+                stats = self._stats[model] = {
+                    "requests": 0, "errors": 0, "fallbacks": 0, "seconds": 0.0, "load_seconds": 0.0,
+                    "prompt_tokens": 0, "completion_tokens": 0, "latencies": deque(maxlen=self._history),
+                }
+            stats["requests"] += 1
+            stats["errors"] += error
+            stats["fallbacks"] += fallback
+            stats["seconds"] += latency
+            stats["load_seconds"] += load_seconds
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["latencies"].append(latency)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model requests, errors, fallbacks, latency and token totals."""
+        with self._lock:
+            result = {}
+            for model, stats in self._stats.items():
+                latencies: Deque[float] = stats["latencies"]
+                requests = stats["requests"]
+                result[model] = {
+                    "requests": requests,
+                    "errors": stats["errors"],
+                    "fallbacks": stats["fallbacks"],
+                    "mean_latency": stats["seconds"] / requests if requests else 0.0,
+                    "p50_latency": percentile(latencies, 50),
+                    "p95_latency": percentile(latencies, 95),
+                    # Model load time, kept apart from generation time
+                    "load_seconds": stats["load_seconds"],
+                    "mean_generation": (stats["seconds"] - stats["load_seconds"]) / requests if requests else 0.0,
+                    "prompt_tokens": stats["prompt_tokens"],
+                    "completion_tokens": stats["completion_tokens"],
+                    "tokens_per_second": (stats["completion_tokens"] / (stats["seconds"] - stats["load_seconds"])
+                                          if stats["seconds"] > stats["load_seconds"] else 0.0),
+                }
+            return result
+
+    def models(self) -> List[str]:
+        """Every model the rules can pick, the default first."""
+        models = [self.default, *self.levels.values(), *self.complexity.values(),
+                  *(model for _, model in self.prompt_tokens)]
+        for chain in self.fallbacks.values():
+            models.extend(chain)
+        return list(dict.fromkeys(models))
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
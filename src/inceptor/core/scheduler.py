@@ -0,0 +1,277 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from .stats import percentile
+
+# Priority classes, most urgent first
+PRIORITIES = ("interactive", "batch", "background")
+
+DEFAULT_WEIGHTS = {"interactive": 8, "batch": 2, "background": 1}
+
+
+class _Ticket:
+    __slots__ = ("priority", "flow", "enqueued", "started", "granted")
+
+    def __init__(self, priority: str, flow: Any):
+        self.priority = priority
+        self.flow = flow
+        self.enqueued = time.monotonic()
+        self.started = 0.0
+        self.granted = False
+
+
+class _ClassQueue:
+    """Requests of one priority class, round-robin between flows."""
+
+    def __init__(self) -> None:
+        self.flows: "OrderedDict[Any, Deque[_Ticket]]" = OrderedDict()
+        self.size = 0
+        # Stride scheduling: the class with the lowest pass is served next
+        self.pass_value = 0.0
+
+    def push(self, ticket: _Ticket) -> None:
+        self.flows.setdefault(ticket.flow, deque()).append(ticket)
+        self.size += 1
+
+    def oldest(self) -> Optional[_Ticket]:
+        return min((queue[0] for queue in self.flows.values()), key=lambda t: t.enqueued, default=None)
+
+    def remove(self, ticket: _Ticket) -> None:
+        queue = self.flows[ticket.flow]
+        queue.remove(ticket)
+        if not queue:
+            del self.flows[ticket.flow]
+        self.size -= 1
+
+    def pop(self, ticket: Optional[_Ticket] = None) -> _Ticket:
+        """Removes ``ticket`` (or the next flow's head) and rotates that flow to the back."""
+        flow = ticket.flow if ticket is not None else next(iter(self.flows))
+        queue = self.flows.pop(flow)
+        ticket = queue.popleft()
+        if queue:
+            self.flows[flow] = queue
+        self.size -= 1
+        return ticket
+
+
+class RequestScheduler:
+    """Priority queue in front of a model client shared by many inceptions.
+
+    At most ``max_concurrency`` requests reach the backend at once; the
+    rest wait in per-class queues. Classes share the backend by weight
+    (stride scheduling: with the default weights interactive requests get
+    8 slots for every 2 batch and 1 background slot while all are busy),
+    and within a class, flows (one per inception or user) take turns so a
+    single large job cannot monopolize its class. A request that has waited
+    longer than ``aging`` seconds is served before anything else, oldest
+    first, so low classes never starve.
+
+    The scheduler has the client's ``generate``/``embed`` methods and can be
+    passed to ``DreamArchitect(client=...)``. The class and flow come from
+    ``context()`` on the calling thread, or use a ``client()`` view.
+    """
+
+    def __init__(self, client: Any, max_concurrency: int = 1, weights: Optional[Dict[str, float]] = None,
+                 aging: float = 30.0, default_priority: str = "batch", history: int = 1000):
+        """Initialize the scheduler.
+
+        Args:
+            client: Backend client (OllamaClient, StandInClient, ...)
+            max_concurrency: Requests allowed in flight on the backend
+            weights: Share per priority class (default: ``DEFAULT_WEIGHTS``)
+            aging: Seconds after which a queued request jumps the queue
+            default_priority: Class of requests made outside ``context()``
+            history: Queue waits kept per class for percentiles
+
+        Raises:
+            ValueError: If a priority class or weight is invalid
+        """
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        unknown = set(weights) - set(PRIORITIES) | ({default_priority} - set(PRIORITIES))
+        if unknown:
+            raise ValueError(f"Unknown priority class: {', '.join(sorted(unknown))} (use {', '.join(PRIORITIES)})")
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError("Priority weights must be positive")
+
+        self.backend = client
+        self.max_concurrency = max(1, max_concurrency)
+        self.weights = weights
+        self.aging = aging
+        self.default_priority = default_priority
+        self.base_url = getattr(client, "base_url", "")
+        self.model = getattr(client, "model", "")
+        self.embedding_model = getattr(client, "embedding_model", "")
+        self._history = history
+        self._cond = threading.Condition()
+        self._queues = {priority: _ClassQueue() for priority in PRIORITIES}
+        self._active = 0
+        # Pass value of the last class served; idle classes resume from here
+        self._virtual_time = 0.0
+        self._local = threading.local()
+        self._flow_ids = itertools.count(1)
+        self.reset_stats()
+
+    @contextmanager
+    def context(self, priority: str, flow: Any = None) -> Iterator[None]:
+        """Runs requests made by this thread in the block as ``priority``.
+
+        Args:
+            priority: One of ``PRIORITIES``
+            flow: Fair-sharing key, e.g. an inception or user id
+                (default: a new flow for this block)
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority} (use {', '.join(PRIORITIES)})")
+        previous = getattr(self._local, "context", None)
+        self._local.context = (priority, flow if flow is not None else f"flow-{next(self._flow_ids)}")
+        try:
+            yield
+        finally:
+            self._local.context = previous
+
+    def client(self, priority: str, flow: Any = None) -> "ScheduledClient":
+        """Client view whose requests always use ``priority`` and ``flow``."""
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority} (use {', '.join(PRIORITIES)})")
+        return ScheduledClient(self, priority, flow if flow is not None else f"flow-{next(self._flow_ids)}")
+
+    def bound(self) -> "ScheduledClient":
+        """Client view fixed to this thread's current class and flow, for use from other threads."""
+        priority, flow = self._current()
+        return ScheduledClient(self, priority, flow)
+
+    def generate(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000, **options: Any) -> str:
+        priority, flow = self._current()
+        return self.call(priority, flow, self.backend.generate, prompt, system_prompt, max_tokens, **options)
+
+    def embed(self, text: str, model: Optional[str] = None) -> List[float]:
+        priority, flow = self._current()
+        return self.call(priority, flow, self.backend.embed, text, model)
+
+    def last_usage(self) -> Optional[Dict[str, Any]]:
+        """The backend's usage report for this thread's last request, if it has one."""
+        last_usage = getattr(self.backend, "last_usage", None)
+        return last_usage() if last_usage is not None else None
+
+    def call(self, priority: str, flow: Any, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Waits for a backend slot in ``priority``'s queue, then runs ``func``."""
+        ticket = _Ticket(priority, flow)
+        with self._cond:
+            queue = self._queues[priority]
+            if not queue.size:
+                # A class that was idle gets no credit for its idle time
+                queue.pass_value = max(queue.pass_value, self._virtual_time)
+            queue.push(ticket)
+            self._dispatch()
+            try:
+                while not ticket.granted:
+                    self._cond.wait()
+            except BaseException:
+                # Interrupted while queued: give up the place (or the slot)
+                if ticket.granted:
+                    self._active -= 1
+                    self._dispatch()
+                else:
+                    self._queues[priority].remove(ticket)
+                raise
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._dispatch()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue-wait statistics per class since the last ``reset_stats``."""
+        with self._cond:
+            result = {}
+            for priority in PRIORITIES:
+                waits = list(self._waits[priority])
+                count = self._counts[priority]
+                result[priority] = {
+                    "requests": count,
+                    "queued": self._queues[priority].size,
+                    "aged": self._aged[priority],
+                    "mean_wait": self._total_wait[priority] / count if count else 0.0,
+                    "p50_wait": percentile(waits, 50),
+                    "p95_wait": percentile(waits, 95),
+                    "max_wait": self._max_wait[priority],
+                }
+            result["backend"] = {"active": self._active, "max_concurrency": self.max_concurrency}
+            return result
+
+    def reset_stats(self) -> None:
+        with self._cond:
+            self._counts = dict.fromkeys(PRIORITIES, 0)
+            self._aged = dict.fromkeys(PRIORITIES, 0)
+            self._total_wait = dict.fromkeys(PRIORITIES, 0.0)
+            self._max_wait = dict.fromkeys(PRIORITIES, 0.0)
+            self._waits: Dict[str, Deque[float]] = {p: deque(maxlen=self._history) for p in PRIORITIES}
+
+    def _current(self) -> tuple:
+        context = getattr(self._local, "context", None)
+        return context if context is not None else (self.default_priority, "default")
+
+    def _dispatch(self) -> None:
+        # Called with the lock held
+        granted = False
+        while self._active < self.max_concurrency:
+            ticket = self._next()
+            if ticket is None:
+                break
+            ticket.granted = True
+            ticket.started = time.monotonic()
+            wait = ticket.started - ticket.enqueued
+            self._active += 1
+            self._counts[ticket.priority] += 1
+            self._total_wait[ticket.priority] += wait
+            self._max_wait[ticket.priority] = max(self._max_wait[ticket.priority], wait)
+            self._waits[ticket.priority].append(wait)
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _next(self) -> Optional[_Ticket]:
+        waiting = [queue for queue in self._queues.values() if queue.size]
+        if not waiting:
+            return None
+
+        # Aging: anything queued too long goes first, oldest first
+        deadline = time.monotonic() - self.aging
+        overdue = [ticket for ticket in (queue.oldest() for queue in waiting) if ticket.enqueued <= deadline]
+        if overdue:
+            ticket = min(overdue, key=lambda t: t.enqueued)
+            self._aged[ticket.priority] += 1
+            return self._queues[ticket.priority].pop(ticket)
+
+        priority, queue = min(((p, q) for p, q in self._queues.items() if q.size),
+                              key=lambda item: (item[1].pass_value, PRIORITIES.index(item[0])))
+        self._virtual_time = queue.pass_value
+        queue.pass_value += 1.0 / self.weights[priority]
+        return queue.pop()
+
+
+class ScheduledClient:
+    """Model client view of a ``RequestScheduler`` with a fixed class and flow."""
+
+    def __init__(self, scheduler: RequestScheduler, priority: str, flow: Any):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.flow = flow
+        self.base_url = scheduler.base_url
+        self.model = scheduler.model
+        self.embedding_model = scheduler.embedding_model
+
+    def generate(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000, **options: Any) -> str:
+        return self.scheduler.call(self.priority, self.flow, self.scheduler.backend.generate,
+                                   prompt, system_prompt, max_tokens, **options)
+
+    def last_usage(self) -> Optional[Dict[str, Any]]:
+        return self.scheduler.last_usage()
+
+    def embed(self, text: str, model: Optional[str] = None) -> List[float]:
+        return self.scheduler.call(self.priority, self.flow, self.scheduler.backend.embed, text, model)
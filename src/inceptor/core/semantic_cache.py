@@ -0,0 +1,144 @@
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .ollama_client import OllamaClient
+
+
+class SemanticCache:
+    """Reuses LIMBO/DREAM results for problems that mean the same thing.
+
+    Problems are embedded through Ollama's embeddings endpoint and kept in a
+    float32 matrix of unit vectors, so a lookup is a single matrix-vector
+    product. When the best cosine similarity reaches ``threshold`` the cached
+    LIMBO and DREAM subtrees are returned and those levels can be skipped.
+
+    Requires NumPy (``pip install inceptor[cache]``).
+    """
+
+    def __init__(self, client: OllamaClient, threshold: float = 0.92,
+                 max_entries: int = 10000, path: Optional[Union[str, Path]] = None):
+        """Initialize the cache.
+
+        Args:
+            client: Client used to compute embeddings
+            threshold: Minimum cosine similarity for a hit (0-1)
+            max_entries: Oldest entries are dropped beyond this size
+            path: Directory to load the cache from and save it to
+        """
+        if np is None:
+            raise ImportError("SemanticCache requires numpy: pip install numpy")
+
+        self.client = client
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._entries: List[Dict[str, Any]] = []
+
+        if self.path and (self.path / "entries.json").exists():
+            self.load(self.path)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def key_text(problem: str, context: Dict[str, Any]) -> str:
+        """Builds the text that is embedded for a LIMBO request.
+
+        Only the variable part of the LIMBO prompt is used: the template text
+        is identical for every problem and would dominate the similarity.
+        """
+        return f"{problem}\n{json.dumps(context, sort_keys=True, ensure_ascii=False)}"
+
+    def lookup(self, text: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Finds the most similar cached entry.
+
+        Args:
+            text: Text built by ``key_text``
+
+        Returns:
+            ``(similarity, entry)`` with a deep copy of the cached entry, or
+            None if nothing reaches the threshold
+        """
+        query = self._embed(text)
+        with self._lock:
+            if self._size == 0 or query.shape[0] != self._vectors.shape[1]:
+                self.misses += 1
+                return None
+            scores = self._vectors[:self._size] @ query
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return similarity, copy.deepcopy(self._entries[best])
+
+    def store(self, text: str, entry: Dict[str, Any]) -> None:
+        """Adds an entry, e.g. ``{"problem": ..., "limbo": ..., "dream": ...}``.
+
+        Args:
+            text: Text built by ``key_text``
+            entry: JSON-serializable payload returned by later lookups
+        """
+        vector = self._embed(text)
+        with self._lock:
+            if self._size and vector.shape[0] != self._vectors.shape[1]:
+                # Embedding model changed; old vectors are not comparable
+                self._vectors = np.zeros((0, 0), dtype=np.float32)
+                self._entries = []
+                self._size = 0
+            if self._size >= self.max_entries:
+                drop = self._size - self.max_entries + 1
+                self._vectors[:self._size - drop] = self._vectors[drop:self._size]
+                del self._entries[:drop]
+                self._size -= drop
+            if self._size == self._vectors.shape[0]:
+                grown = np.zeros((max(16, self._size * 2), vector.shape[0]), dtype=np.float32)
+                if self._size:
+                    grown[:self._size] = self._vectors[:self._size]
+                self._vectors = grown
+            self._vectors[self._size] = vector
+            self._entries.append(copy.deepcopy(entry))
+            self._size += 1
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Writes the index to ``path`` (vectors.npy + entries.json)."""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No cache path configured")
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            np.save(path / "vectors.npy", self._vectors[:self._size])
+            with open(path / "entries.json", "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Replaces the index with one written by ``save``."""
+        path = Path(path)
+        vectors = np.load(path / "vectors.npy")
+        with open(path / "entries.json", "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        if len(entries) != len(vectors):
+            raise ValueError(f"Corrupt semantic cache at {path}")
+        with self._lock:
+            self._vectors = vectors.astype(np.float32, copy=False)
+            self._entries = entries
+            self._size = len(entries)
+
+    def _embed(self, text: str) -> "np.ndarray":
+        vector = np.asarray(self.client.embed(text), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
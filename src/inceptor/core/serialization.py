@@ -0,0 +1,449 @@
+import io
+import json
+import mmap
+import struct
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import yaml
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from .models import Solution, Task, as_task
+
+# Binary solution format
+#
+#   header:  b"ISOL" | version: u16 | codec: u8
+#   record:  kind: u8 | name length: u16 | value length: u32 | name | value
+#
+# Records are written one node at a time, so neither writing nor reading
+# needs the whole solution in memory as a single encoded blob. Architecture
+# and implementation levels keyed by task id get one record per task; the
+# record name is then ``level\0task_id``. Readers skip record kinds they do
+# not know, so new kinds can be added without a version bump.
+#
+# Before the end record the writer adds an index record listing
+# ``[kind, name, value offset, value length]`` for every record, and after
+# it a trailer ``index record offset: u64 | b"ISIX"``. LazySolution uses the
+# index to decode single nodes straight from a memory map.
+MAGIC = b"ISOL"
+INDEX_MAGIC = b"ISIX"
+FORMAT_VERSION = 1
+FILE_SUFFIX = ".isol"
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+RECORD_END = 0
+RECORD_PROBLEM = 1
+RECORD_METADATA = 2
+RECORD_ARCHITECTURE = 3
+RECORD_TASK = 4
+RECORD_IMPLEMENTATION = 5
+RECORD_INDEX = 6
+
+_HEADER = struct.Struct("<4sHB")
+_RECORD = struct.Struct("<BHI")
+_TRAILER = struct.Struct("<Q4s")
+_SECTIONS = {RECORD_ARCHITECTURE: "architecture", RECORD_IMPLEMENTATION: "implementation"}
+
+# Node key for levels stored as a single record
+WHOLE_LEVEL = ""
+
+
+def json_default(obj: Any) -> Any:
+    """``default`` hook for json/msgpack: dataclasses and enums inside solutions."""
+    if isinstance(obj, (Task, Solution)):
+        return obj.to_dict()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.name
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def split_nodes(section: Dict[str, Any]) -> Iterator[Tuple[str, str, Any]]:
+    """Splits ``architecture``/``implementation`` into ``(level, key, value)`` nodes.
+
+    Levels whose values are all dicts (task id -> result) yield one node per
+    task; other levels yield a single node with key ``WHOLE_LEVEL``.
+    """
+    for level, data in section.items():
+        if isinstance(data, dict) and data and all(isinstance(v, dict) for v in data.values()):
+            for key, value in data.items():
+                yield level, str(key), value
+        else:
+            yield level, WHOLE_LEVEL, data
+
+
+def _encoder(codec: int):
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ImportError("This solution file uses MessagePack: pip install msgpack")
+        packer = msgpack.Packer(default=json_default, use_bin_type=True)
+        return packer.pack
+    if codec == CODEC_JSON:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=json_default)
+        return lambda value: encoder.encode(value).encode("utf-8")
+    raise ValueError(f"Unknown solution codec: {codec}")
+
+
+def _decoder(codec: int):
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ImportError("This solution file uses MessagePack: pip install msgpack")
+        return lambda data: msgpack.unpackb(data, raw=False)
+    if codec == CODEC_JSON:
+        return json.loads
+    raise ValueError(f"Unknown solution codec: {codec}")
+
+
+class SolutionWriter:
+    """Writes a solution to a binary stream record by record."""
+
+    def __init__(self, file: IO[bytes], codec: Optional[int] = None):
+        """Write the file header.
+
+        Args:
+            file: Binary file object
+            codec: ``CODEC_MSGPACK`` or ``CODEC_JSON``; defaults to MessagePack
+                when it is installed
+        """
+        self.file = file
+        self.codec = codec if codec is not None else (CODEC_MSGPACK if msgpack else CODEC_JSON)
+        self._encode = _encoder(self.codec)
+        self._index: List[List[Any]] = []
+        self._offset = 0
+        self._write_raw(_HEADER.pack(MAGIC, FORMAT_VERSION, self.codec))
+
+    def _write_raw(self, data: bytes) -> None:
+        self.file.write(data)
+        self._offset += len(data)
+
+    def _write_record(self, kind: int, name: str, data: bytes) -> int:
+        """Writes one record and returns the offset of its value."""
+        encoded_name = name.encode("utf-8")
+        self._write_raw(_RECORD.pack(kind, len(encoded_name), len(data)))
+        self._write_raw(encoded_name)
+        offset = self._offset
+        self._write_raw(data)
+        return offset
+
+    def write(self, kind: int, name: str, value: Any) -> None:
+        data = self._encode(value)
+        self._index.append([kind, name, self._write_record(kind, name, data), len(data)])
+
+    def write_node(self, kind: int, level: str, key: str, value: Any) -> None:
+        self.write(kind, f"{level}\0{key}" if key != WHOLE_LEVEL else level, value)
+
+    def write_solution(self, solution: Solution) -> None:
+        self.write(RECORD_PROBLEM, "", solution.problem)
+        for level, key, value in split_nodes(solution.architecture):
+            self.write_node(RECORD_ARCHITECTURE, level, key, value)
+        for task in solution.tasks:
+            self.write(RECORD_TASK, "", task.to_dict() if isinstance(task, Task) else task)
+        for level, key, value in split_nodes(solution.implementation):
+            self.write_node(RECORD_IMPLEMENTATION, level, key, value)
+        self.write(RECORD_METADATA, "", solution.metadata)
+
+    def close(self) -> None:
+        """Writes the node index, the end record and the trailer."""
+        index_offset = self._offset
+        self._write_record(RECORD_INDEX, "", self._encode(self._index))
+        self._write_raw(_RECORD.pack(RECORD_END, 0, 0))
+        self._write_raw(_TRAILER.pack(index_offset, INDEX_MAGIC))
+
+
+def _read_exact(file: IO[bytes], size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated solution file")
+    return data
+
+
+def read_header(file: IO[bytes]) -> int:
+    """Reads and validates the file header.
+
+    Returns:
+        The codec used for record values
+
+    Raises:
+        ValueError: If this is not a solution file or it was written by a
+            newer version of the format
+    """
+    magic, version, codec = _HEADER.unpack(_read_exact(file, _HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not an Inceptor solution file")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported solution format version {version} (expected <= {FORMAT_VERSION})")
+    return codec
+
+
+def iter_records(file: IO[bytes]) -> Iterator[Tuple[int, str, Any]]:
+    """Streams ``(kind, name, value)`` records from a binary solution file.
+
+    Raises:
+        ValueError: If the file is not a valid solution file
+    """
+    decode = _decoder(read_header(file))
+    while True:
+        kind, name_length, value_length = _RECORD.unpack(_read_exact(file, _RECORD.size))
+        if kind == RECORD_END:
+            return
+        name = _read_exact(file, name_length).decode("utf-8")
+        data = _read_exact(file, value_length)
+        if kind in _SECTIONS or kind in (RECORD_PROBLEM, RECORD_METADATA, RECORD_TASK):
+            yield kind, name, decode(data)
+
+
+def dump(solution: Solution, file: IO[bytes], codec: Optional[int] = None) -> None:
+    """Writes ``solution`` in the binary format to a binary file object."""
+    writer = SolutionWriter(file, codec)
+    writer.write_solution(solution)
+    writer.close()
+
+
+def dumps(solution: Solution, codec: Optional[int] = None) -> bytes:
+    buffer = io.BytesIO()
+    dump(solution, buffer, codec)
+    return buffer.getvalue()
+
+
+def load(file: IO[bytes]) -> Solution:
+    """Reads a binary solution file back into a Solution.
+
+    Raises:
+        ValueError: If the file is not a valid solution file
+    """
+    problem = ""
+    metadata: Dict[str, Any] = {}
+    tasks = []
+    sections: Dict[str, Dict[str, Any]] = {"architecture": {}, "implementation": {}}
+
+    for kind, name, value in iter_records(file):
+        if kind == RECORD_PROBLEM:
+            problem = value
+        elif kind == RECORD_METADATA:
+            metadata = value
+        elif kind == RECORD_TASK:
+            tasks.append(as_task(value))
+        else:
+            section = sections[_SECTIONS[kind]]
+            level, _, key = name.partition("\0")
+            if key:
+                section.setdefault(level, {})[key] = value
+            else:
+                section[level] = value
+
+    return Solution(
+        problem=problem,
+        architecture=sections["architecture"],
+        tasks=tasks,
+        implementation=sections["implementation"],
+        metadata=metadata
+    )
+
+
+def loads(data: bytes) -> Solution:
+    return load(io.BytesIO(data))
+
+
+class LazySection(Mapping):
+    """Read-only ``architecture``/``implementation`` view over a LazySolution.
+
+    Iterating lists level names from the index; a level's records are
+    decoded the first time the level is accessed.
+    """
+
+    def __init__(self, decode_at):
+        self._decode_at = decode_at
+        self._nodes: Dict[str, List[Tuple[str, int, int]]] = {}
+        self._cache: Dict[str, Any] = {}
+
+    def _add(self, name: str, offset: int, length: int) -> None:
+        level, _, key = name.partition("\0")
+        self._nodes.setdefault(level, []).append((key, offset, length))
+
+    def __getitem__(self, level: str) -> Any:
+        if level not in self._cache:
+            nodes = self._nodes[level]
+            if len(nodes) == 1 and nodes[0][0] == WHOLE_LEVEL:
+                self._cache[level] = self._decode_at(nodes[0][1], nodes[0][2])
+            else:
+                self._cache[level] = {key: self._decode_at(offset, length) for key, offset, length in nodes}
+        return self._cache[level]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def node_count(self, level: str) -> int:
+        """Number of stored nodes (tasks) in a level, without decoding it."""
+        return len(self._nodes.get(level, ()))
+
+
+class LazySolution:
+    """A binary solution file opened without decoding it.
+
+    The file is memory-mapped and only the node index is read up front.
+    ``problem``, ``metadata``, ``tasks`` and each architecture/implementation
+    level are decoded on first access, so showing LIMBO components does not
+    parse the REALITY code. Files written without an index are indexed by
+    scanning record headers, which still skips all payloads.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open and index a solution file.
+
+        Args:
+            path: ``.isol`` file written by ``save_solution``/``dump``
+
+        Raises:
+            ValueError: If the file is not a valid solution file
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._decode = _decoder(read_header(io.BytesIO(self._map[:_HEADER.size])))
+            entries = self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+        self.architecture = LazySection(self._decode_at)
+        self.implementation = LazySection(self._decode_at)
+        self._tasks: List[Tuple[int, int]] = []
+        self._fields: Dict[int, Tuple[int, int]] = {}
+        self._cache: Dict[int, Any] = {}
+        sections = {RECORD_ARCHITECTURE: self.architecture, RECORD_IMPLEMENTATION: self.implementation}
+        for kind, name, offset, length in entries:
+            if kind in sections:
+                sections[kind]._add(name, offset, length)
+            elif kind == RECORD_TASK:
+                self._tasks.append((offset, length))
+            elif kind in (RECORD_PROBLEM, RECORD_METADATA):
+                self._fields[kind] = (offset, length)
+
+    def _decode_at(self, offset: int, length: int) -> Any:
+        if offset + length > len(self._map):
+            raise ValueError("Truncated solution file")
+        return self._decode(self._map[offset:offset + length])
+
+    def _read_index(self) -> List[List[Any]]:
+        size = len(self._map)
+        if size >= _HEADER.size + _TRAILER.size:
+            index_offset, magic = _TRAILER.unpack(self._map[size - _TRAILER.size:])
+            if magic == INDEX_MAGIC:
+                kind, name_length, length = _RECORD.unpack_from(self._map, index_offset)
+                if kind != RECORD_INDEX:
+                    raise ValueError("Corrupt solution index")
+                return self._decode_at(index_offset + _RECORD.size + name_length, length)
+
+        entries = []
+        position = _HEADER.size
+        while True:
+            if position + _RECORD.size > size:
+                raise ValueError("Truncated solution file")
+            kind, name_length, length = _RECORD.unpack_from(self._map, position)
+            if kind == RECORD_END:
+                return entries
+            position += _RECORD.size
+            name = self._map[position:position + name_length].decode("utf-8")
+            position += name_length
+            entries.append([kind, name, position, length])
+            position += length
+
+    def _field(self, kind: int, default: Any) -> Any:
+        if kind not in self._cache:
+            self._cache[kind] = self._decode_at(*self._fields[kind]) if kind in self._fields else default
+        return self._cache[kind]
+
+    @property
+    def problem(self) -> str:
+        return self._field(RECORD_PROBLEM, "")
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._field(RECORD_METADATA, {})
+
+    @property
+    def tasks(self) -> List[Any]:
+        if RECORD_TASK not in self._cache:
+            self._cache[RECORD_TASK] = [as_task(self._decode_at(offset, length)) for offset, length in self._tasks]
+        return self._cache[RECORD_TASK]
+
+    def to_solution(self) -> Solution:
+        """Decodes everything into a regular Solution."""
+        return Solution(
+            problem=self.problem,
+            architecture={level: self.architecture[level] for level in self.architecture},
+            tasks=self.tasks,
+            implementation={level: self.implementation[level] for level in self.implementation},
+            metadata=self.metadata
+        )
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "LazySolution":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def save_solution(solution: Solution, path: Union[str, Path]) -> None:
+    """Saves a solution, choosing the format from the file suffix.
+
+    ``.isol`` is the binary format, ``.yaml``/``.yml`` YAML, anything else
+    indented JSON.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == FILE_SUFFIX:
+        with open(path, "wb") as f:
+            dump(solution, f)
+    elif suffix in (".yaml", ".yml"):
+        with open(path, "w") as f:
+            yaml.dump(solution.to_dict(), f, default_flow_style=False)
+    else:
+        with open(path, "w") as f:
+            json.dump(solution.to_dict(), f, indent=2, default=json_default)
+
+
+def load_solution(path: Union[str, Path]) -> Solution:
+    """Loads a solution saved by ``save_solution``.
+
+    Raises:
+        ValueError: If a binary file is invalid
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == FILE_SUFFIX:
+        with open(path, "rb") as f:
+            return load(f)
+    with open(path, "r") as f:
+        data = yaml.safe_load(f) if suffix in (".yaml", ".yml") else json.load(f)
+    return Solution.from_dict(data)
+
+
+def open_solution(path: Union[str, Path]) -> Union[Solution, LazySolution]:
+    """Opens a saved solution, lazily for the binary format.
+
+    ``.isol`` files return a LazySolution that decodes nodes on access;
+    other formats are loaded in full.
+    """
+    if Path(path).suffix.lower() == FILE_SUFFIX:
+        return LazySolution(path)
+    return load_solution(path)
@@ -0,0 +1,280 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .models import Solution, as_task
+from .serialization import WHOLE_LEVEL, json_default, split_nodes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    problem TEXT NOT NULL,
+    components TEXT NOT NULL DEFAULT '',
+    metadata TEXT NOT NULL DEFAULT '{}',
+    created REAL NOT NULL,
+    modified REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_modified ON solutions (modified);
+
+-- One row per level, or per task for levels keyed by task id
+CREATE TABLE IF NOT EXISTS nodes (
+    solution_id INTEGER NOT NULL REFERENCES solutions (id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    level TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (solution_id, section, level, key)
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    solution_id INTEGER NOT NULL REFERENCES solutions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (solution_id, position)
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS solutions_fts USING fts5 (
+    name, problem, components, content='solutions', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS solutions_ai AFTER INSERT ON solutions BEGIN
+    INSERT INTO solutions_fts (rowid, name, problem, components)
+    VALUES (new.id, new.name, new.problem, new.components);
+END;
+CREATE TRIGGER IF NOT EXISTS solutions_ad AFTER DELETE ON solutions BEGIN
+    INSERT INTO solutions_fts (solutions_fts, rowid, name, problem, components)
+    VALUES ('delete', old.id, old.name, old.problem, old.components);
+END;
+CREATE TRIGGER IF NOT EXISTS solutions_au AFTER UPDATE ON solutions BEGIN
+    INSERT INTO solutions_fts (solutions_fts, rowid, name, problem, components)
+    VALUES ('delete', old.id, old.name, old.problem, old.components);
+    INSERT INTO solutions_fts (rowid, name, problem, components)
+    VALUES (new.id, new.name, new.problem, new.components);
+END;
+"""
+
+
+def _encode(value: Any) -> Tuple[str, str]:
+    """Returns ``(payload, hash)`` for a node value."""
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=json_default)
+    return payload, hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SolutionStore:
+    """SQLite-backed store of generated solutions.
+
+    Each solution is split into node rows (one per level, or one per task
+    for task-keyed levels) plus one row per task. Saving compares content
+    hashes and only writes rows that changed. Listing is a single indexed
+    query and problems/components are searchable with full-text search.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open (or create) a store.
+
+        Args:
+            path: SQLite database file, or ``":memory:"``
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.executescript(_FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5; search falls back to LIKE
+                self.has_fts = False
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SolutionStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def save(self, name: str, solution: Solution) -> int:
+        """Saves a solution under ``name``, writing only rows that changed.
+
+        Args:
+            name: Unique solution name
+            solution: Solution to store
+
+        Returns:
+            Number of node/task rows written or deleted
+        """
+        now = time.time()
+        components = " ".join(
+            c.get("name", "") for c in solution.architecture.get("limbo", {}).get("components", [])
+            if isinstance(c, dict)
+        )
+        metadata, _ = _encode(solution.metadata)
+
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM solutions WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                solution_id = self._conn.execute(
+                    "INSERT INTO solutions (name, problem, components, metadata, created, modified) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, solution.problem, components, metadata, now, now)
+                ).lastrowid
+            else:
+                solution_id = row["id"]
+                self._conn.execute(
+                    "UPDATE solutions SET problem = ?, components = ?, metadata = ?, modified = ? WHERE id = ?",
+                    (solution.problem, components, metadata, now, solution_id)
+                )
+
+            return (self._sync_nodes(solution_id, solution)
+                    + self._sync_tasks(solution_id, solution.tasks))
+
+    def _sync_nodes(self, solution_id: int, solution: Solution) -> int:
+        existing = {
+            (r["section"], r["level"], r["key"]): (r["hash"], r["position"])
+            for r in self._conn.execute(
+                "SELECT section, level, key, hash, position FROM nodes WHERE solution_id = ?", (solution_id,))
+        }
+        changes = 0
+        position = 0
+        for section_name, section in (("architecture", solution.architecture),
+                                      ("implementation", solution.implementation)):
+            for level, key, value in split_nodes(section):
+                payload, digest = _encode(value)
+                node_id = (section_name, level, key)
+                if existing.pop(node_id, None) != (digest, position):
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO nodes (solution_id, section, level, key, position, hash, payload) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (solution_id, section_name, level, key, position, digest, payload)
+                    )
+                    changes += 1
+                position += 1
+
+        for section_name, level, key in existing:
+            self._conn.execute(
+                "DELETE FROM nodes WHERE solution_id = ? AND section = ? AND level = ? AND key = ?",
+                (solution_id, section_name, level, key)
+            )
+            changes += 1
+        return changes
+
+    def _sync_tasks(self, solution_id: int, tasks: List[Any]) -> int:
+        existing = dict(self._conn.execute(
+            "SELECT position, hash FROM tasks WHERE solution_id = ?", (solution_id,)).fetchall())
+        changes = 0
+        for position, task in enumerate(tasks):
+            payload, digest = _encode(task)
+            if existing.get(position) != digest:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tasks (solution_id, position, hash, payload) VALUES (?, ?, ?, ?)",
+                    (solution_id, position, digest, payload)
+                )
+                changes += 1
+        removed = self._conn.execute(
+            "DELETE FROM tasks WHERE solution_id = ? AND position >= ?", (solution_id, len(tasks))
+        ).rowcount
+        return changes + removed
+
+    def load(self, name: str) -> Optional[Solution]:
+        """Loads a solution by name.
+
+        Returns:
+            The rebuilt Solution, or None if ``name`` is unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, problem, metadata FROM solutions WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            nodes = self._conn.execute(
+                "SELECT section, level, key, payload FROM nodes WHERE solution_id = ? ORDER BY position",
+                (row["id"],)).fetchall()
+            tasks = self._conn.execute(
+                "SELECT payload FROM tasks WHERE solution_id = ? ORDER BY position",
+                (row["id"],)).fetchall()
+
+        sections: Dict[str, Dict[str, Any]] = {"architecture": {}, "implementation": {}}
+        for node in nodes:
+            value = json.loads(node["payload"])
+            section = sections[node["section"]]
+            if node["key"] == WHOLE_LEVEL:
+                section[node["level"]] = value
+            else:
+                section.setdefault(node["level"], {})[node["key"]] = value
+
+        return Solution(
+            problem=row["problem"],
+            architecture=sections["architecture"],
+            tasks=[as_task(json.loads(t["payload"])) for t in tasks],
+            implementation=sections["implementation"],
+            metadata=json.loads(row["metadata"])
+        )
+
+    def list(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Lists saved solutions, most recently modified first.
+
+        Returns:
+            Dicts with ``name``, ``problem``, ``created`` and ``modified``
+        """
+        query = "SELECT name, problem, created, modified FROM solutions ORDER BY modified DESC"
+        params: Tuple = ()
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = (limit, offset)
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(query, params)]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search over names, problems and LIMBO component names.
+
+        Args:
+            query: Search terms (FTS5 syntax when available)
+            limit: Maximum number of results
+
+        Returns:
+            Matching solutions, best match first
+        """
+        with self._lock:
+            if self.has_fts:
+                try:
+                    rows = self._conn.execute(
+                        "SELECT s.name, s.problem, s.created, s.modified FROM solutions_fts "
+                        "JOIN solutions s ON s.id = solutions_fts.rowid "
+                        "WHERE solutions_fts MATCH ? ORDER BY rank LIMIT ?",
+                        (query, limit)).fetchall()
+                    return [dict(r) for r in rows]
+                except sqlite3.OperationalError:
+                    pass  # not valid FTS syntax; fall back to a plain substring match
+            pattern = f"%{query}%"
+            rows = self._conn.execute(
+                "SELECT name, problem, created, modified FROM solutions "
+                "WHERE name LIKE ? OR problem LIKE ? OR components LIKE ? "
+                "ORDER BY modified DESC LIMIT ?",
+                (pattern, pattern, pattern, limit)).fetchall()
+            return [dict(r) for r in rows]
+
+    def delete(self, name: str) -> bool:
+        """Deletes a solution; returns False if it did not exist."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM solutions WHERE name = ?", (name,)).rowcount > 0
@@ -0,0 +1,207 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from .ollama_client import GenerationCancelled
+from .routing import LEVELS
+from .token_budget import estimate_tokens
+
+# Top-level key a level's response needs to be usable by the next level
+EXPECTED_KEYS = {
+    "limbo": "dream_tasks",
+    "dream": "reality_tasks",
+    "reality": "implementation",
+    "deeper": "deployment",
+    "deepest": "optimization",
+}
+
+# Sampling temperatures of the candidates; the first is the client default,
+# so candidate 0 is the request a non-speculative run would send
+DEFAULT_TEMPERATURES = (0.7, 0.4, 1.0)
+
+
+def validate_response(level: str, result: Any) -> None:
+    """Checks that a parsed response has the shape its level needs.
+
+    Raises:
+        ValueError: If it is not a JSON object with the level's key
+    """
+    key = EXPECTED_KEYS.get(level)
+    if not isinstance(result, dict) or (key is not None and key not in result):
+        raise ValueError(f"Unusable {level} response: expected a JSON object with {key!r}")
+
+
+class SpeculativeGenerator:
+    """Races several generations of a prompt and keeps the first usable one.
+
+    For the configured levels, ``fanout`` requests are sent in parallel,
+    each with its own temperature (and seed, if one is set). The first
+    response that parses and passes ``validate_response`` wins and the
+    others are cancelled, so a malformed response no longer costs a full
+    sequential retry. The price is the tokens the other candidates used
+    before they were cancelled; both are tracked per level.
+    """
+
+    def __init__(self, levels: Optional[Mapping[str, int]] = None,
+                 temperatures: Sequence[float] = DEFAULT_TEMPERATURES, seed: Optional[int] = None):
+        """Initialize the generator.
+
+        Args:
+            levels: Level name -> parallel candidates (default: 3 for LIMBO);
+                levels left out, or set to 1, are not raced
+            temperatures: Temperature per candidate, reused cyclically
+            seed: Seed of the first candidate; candidate ``i`` gets
+                ``seed + i`` (default: the server picks)
+
+        Raises:
+            ValueError: If a level is unknown, a count is below 1 or no
+                temperature is given
+        """
+        self.levels = dict(levels if levels is not None else {"limbo": 3})
+        self.temperatures = tuple(temperatures)
+        self.seed = seed
+        unknown = set(self.levels) - set(LEVELS)
+        if unknown:
+            raise ValueError(f"Unknown speculation levels: {', '.join(sorted(unknown))} (use {', '.join(LEVELS)})")
+        if any(int(count) < 1 for count in self.levels.values()):
+            raise ValueError("Speculation fanout must be at least 1")
+        if not self.temperatures:
+            raise ValueError("At least one temperature is required")
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "SpeculativeGenerator":
+        """Builds a generator from a config mapping with the constructor's keys.
+
+        Raises:
+            ValueError: If the mapping has other keys
+        """
+        unknown = set(config) - {"levels", "temperatures", "seed"}
+        if unknown:
+            raise ValueError(f"Unknown speculation options: {', '.join(sorted(unknown))}")
+        return cls(**{key: value for key, value in config.items() if value is not None})
+
+    def fanout(self, level: str) -> int:
+        """Candidates raced for a level's prompts (1: not speculative)."""
+        return int(self.levels.get(level, 1))
+
+    def generate(self, client: Any, level: str, prompt: str, parse: Callable[[str], Any],
+                 model: Optional[str] = None) -> Tuple[Any, str, Optional[Dict[str, Any]]]:
+        """Races ``fanout(level)`` generations and returns the first usable one.
+
+        Args:
+            client: Model client whose ``generate`` accepts ``temperature``,
+                ``seed`` and ``cancel``
+            level: Level name, for validation and statistics
+            prompt: Prompt to send
+            parse: Turns a response into a result, raising on bad output
+            model: Model to ask (default: the client's)
+
+        Returns:
+            Tuple of the parsed result, the raw response and the client's
+            usage report for it (None if the client has none)
+
+        Raises:
+            Exception: The first candidate's error, if none was usable
+        """
+        fanout = self.fanout(level)
+        # Worker threads do not inherit the caller's scheduling class
+        bound = getattr(client, "bound", None)
+        if bound is not None:
+            client = bound()
+        last_usage = getattr(client, "last_usage", None)
+        race: Dict[str, Any] = {
+            "cancel": threading.Event(), "done": threading.Condition(self._lock), "started": time.perf_counter(),
+            "prompt_tokens": estimate_tokens(prompt), "finished": {}, "winner": None,
+        }
+
+        def candidate(index: int) -> None:
+            options: Dict[str, Any] = {"temperature": self.temperatures[index % len(self.temperatures)],
+                                       "cancel": race["cancel"]}
+            if self.seed is not None:
+                options["seed"] = self.seed + index
+            if model is not None:
+                options["model"] = model
+            result = response = error = None
+            try:
+                response = client.generate(prompt, **options)
+                result = parse(response)
+                validate_response(level, result)
+            except Exception as e:
+                error = e
+            usage = last_usage() if last_usage is not None else None
+            self._finish(level, race, index, (result, response, usage if isinstance(usage, dict) else None, error))
+
+        with self._lock:
+            stats = self._level_stats(level)
+            stats["races"] += 1
+            stats["candidates"] += fanout
+        for index in range(fanout):
+            threading.Thread(target=candidate, args=(index,), name=f"inceptor-speculative-{level}-{index}",
+                             daemon=True).start()
+
+        with race["done"]:
+            race["done"].wait_for(lambda: race["winner"] is not None or len(race["finished"]) == fanout)
+            if race["winner"] is None:
+                self._level_stats(level)["failures"] += 1
+                raise race["finished"][0][3]
+            result, response, usage, _ = race["finished"][race["winner"]][:4]
+        return result, response, usage
+
+    def _finish(self, level: str, race: Dict[str, Any], index: int, outcome: Tuple[Any, ...]) -> None:
+        """Settles one candidate: the first usable one wins, the others are extra cost."""
+        result, response, usage, error = outcome
+        latency = time.perf_counter() - race["started"]
+        with race["done"]:
+            stats = self._level_stats(level)
+            race["finished"][index] = (result, response, usage, error, latency)
+            if error is None and race["winner"] is None:
+                race["winner"] = index
+                race["cancel"].set()
+                stats["wins"][index] = stats["wins"].get(index, 0) + 1
+                # A sequential run would have waited for each failed lower
+                # candidate before retrying (lower bound: unfinished ones count 0)
+                stats["latency_saved"] += sum(finished[4] for position, finished in race["finished"].items()
+                                              if position < index and finished[3] is not None)
+            elif usage is not None:
+                stats["extra_prompt_tokens"] += usage.get("prompt_eval_count", race["prompt_tokens"])
+                stats["extra_completion_tokens"] += usage.get("eval_count", 0)
+            elif not isinstance(error, GenerationCancelled):
+                # No usage report: estimate what the finished request cost
+                stats["extra_prompt_tokens"] += race["prompt_tokens"]
+                stats["extra_completion_tokens"] += estimate_tokens(response) if isinstance(response, str) else 0
+            if isinstance(error, GenerationCancelled):
+                stats["cancelled"] += 1
+            if index == 0 and error is not None and not isinstance(error, GenerationCancelled):
+                stats["primary_failures"] += 1
+            race["done"].notify_all()
+
+    def _level_stats(self, level: str) -> Dict[str, Any]:
+        # Called with the lock held
+        stats = self._stats.get(level)
+        if stats is None:
+            stats = self._stats[level] = {
+                "races": 0, "candidates": 0, "failures": 0, "primary_failures": 0, "cancelled": 0, "wins": {},
+                "extra_prompt_tokens": 0, "extra_completion_tokens": 0, "latency_saved": 0.0,
+            }
+        return stats
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-level races and their cost and benefit.
+
+        Returns:
+            Level -> ``races``, ``candidates`` sent, ``failures`` (no
+            usable candidate), ``primary_failures`` (races whose first
+            candidate was unusable, i.e. that needed a retry without
+            speculation), ``cancelled`` candidates, ``wins`` per candidate
+            index, ``extra_prompt_tokens`` and ``extra_completion_tokens``
+            spent by candidates that did not win, and ``latency_saved``
+            (seconds of sequential retries avoided)
+        """
+        with self._lock:
+            return {level: dict(stats, wins=dict(stats["wins"])) for level, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from .ollama_client import GenerationCancelled, OllamaClient
+
+# Backend names accepted by ``create_client`` and $INCEPTOR_BACKEND
+BACKENDS = ("ollama", "stand-in", "replay")
+
+# Keys whose values name a task or file; suffixed when a list item is repeated
+_ID_KEYS = ("task_id", "name", "file")
+
+_decoder = json.JSONDecoder()
+
+
+def prompt_key(prompt: str, system_prompt: str = "") -> str:
+    """SHA-256 hex digest identifying a prompt in recorded responses."""
+    digest = hashlib.sha256(prompt.encode("utf-8"))
+    if system_prompt:
+        digest.update(b"\0" + system_prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def response_schema(prompt: str) -> Optional[Any]:
+    """Returns the last JSON value embedded in a prompt.
+
+    Every level prompt ends with an example of the JSON it expects back;
+    task, context and component JSON embedded in it come earlier.
+    """
+    schema, pos = None, prompt.find("{")
+    while pos != -1:
+        try:
+            schema, end = _decoder.raw_decode(prompt, pos)
+        except ValueError:
+            end = pos + 1
+        pos = prompt.find("{", end)
+    return schema
+
+
+class StandInClient:
+    """In-process stand-in for ``OllamaClient`` that never touches the network.
+
+    ``generate`` answers from recorded responses when the prompt was
+    recorded, and otherwise synthesizes a response shaped like the JSON
+    example the prompt asks for: every list of objects is repeated
+    ``fanout`` times (with unique task ids and names), so a full 5-level
+    inception does the same orchestration work it would against a model.
+    Prompts that do not ask for JSON get a short plain-text answer.
+
+    Useful for dry runs, profiling the orchestration itself, load tests and
+    CI without a model server.
+    """
+
+    def __init__(self, responses: Optional[Union[str, Path, Mapping[str, str]]] = None,
+                 fanout: int = 2, latency: float = 0.0):
+        """Initialize the stand-in.
+
+        Args:
+            responses: Recorded responses: a mapping of prompt to response
+                text, or a JSON/JSON-lines file of records with a
+                ``response`` and either the ``prompt`` or its ``key``
+                (``prompt_key`` digest)
+            fanout: Copies of each list of objects in synthetic responses
+            latency: Seconds to sleep per call, to mimic a model
+        """
+        self.base_url = "stand-in://"
+        self.model = "stand-in"
+        self.embedding_model = "stand-in"
+        self.fanout = max(1, fanout)
+        self.latency = latency
+        self.calls = 0
+        self.recorded_hits = 0
+        self._lock = threading.Lock()
+        self._responses: Dict[str, str] = {}
+        if isinstance(responses, (str, Path)):
+            self.load(responses)
+        elif responses:
+            for prompt, response in responses.items():
+                self.record(prompt, response)
+
+    def generate(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000,
+                 model: Optional[str] = None, temperature: float = 0.7, seed: Optional[int] = None,
+                 cancel: Optional[threading.Event] = None) -> str:
+        """Same contract as ``OllamaClient.generate`` (``model``, ``temperature`` and ``seed`` are ignored)."""
+        if self.latency:
+            if cancel is None:
+                time.sleep(self.latency)
+            elif cancel.wait(self.latency):
+                raise GenerationCancelled("Generation cancelled")
+        key = prompt_key(prompt, system_prompt)
+        response = self._responses.get(key)
+        with self._lock:
+            self.calls += 1
+            if response is not None:
+                self.recorded_hits += 1
+        if response is not None:
+            return response
+
+        schema = response_schema(prompt)
+        if schema is None:
+            return f"stand-in response {key[:12]}"
+        return json.dumps(self._fill(schema, key[:8]), ensure_ascii=False)
+
+    def embed(self, text: str, model: Optional[str] = None) -> List[float]:
+        """Deterministic unit vector derived from the words of ``text``.
+
+        Texts sharing most words get similar vectors, which is enough to
+        exercise the semantic cache.
+        """
+        vector = [0.0] * 64
+        for word in text.lower().split():
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            vector[digest[0] % 64] += 1.0 if digest[1] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def record(self, prompt: str, response: str, system_prompt: str = "") -> None:
+        """Adds a recorded response for a prompt."""
+        self._responses[prompt_key(prompt, system_prompt)] = response
+
+    def load(self, path: Union[str, Path]) -> int:
+        """Loads recorded responses from a JSON or JSON-lines file.
+
+        Returns:
+            Number of responses loaded
+
+        Raises:
+            ValueError: If a record has no response or no prompt/key
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            data = json.loads(text)
+            records = data if isinstance(data, list) else [
+                {"prompt": prompt, "response": response} for prompt, response in data.items()
+            ]
+        except ValueError:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+        for record in records:
+            if not isinstance(record, dict) or "response" not in record:
+                raise ValueError(f"Invalid recorded response in {path}: {record!r}")
+            if "key" in record:
+                self._responses[record["key"]] = record["response"]
+            elif "prompt" in record:
+                self._responses[prompt_key(record["prompt"], record.get("system", ""))] = record["response"]
+            else:
+                raise ValueError(f"Recorded response without prompt or key in {path}")
+        return len(records)
+
+    def _fill(self, value: Any, tag: str) -> Any:
+        # tag (from the prompt digest) keeps task ids unique across responses
+        if isinstance(value, dict):
+            return {key: self._fill(item, tag) for key, item in value.items()}
+        if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+            items = []
+            for copy_index in range(1, self.fanout + 1):
+                for item in value:
+                    item = self._fill(item, tag)
+                    for key in _ID_KEYS:
+                        if isinstance(item.get(key), str):
+                            item[key] = f"{item[key]}_{copy_index}"
+                    if isinstance(item.get("task_id"), str):
+                        item["task_id"] = f"{item['task_id']}_{tag}"
+                    items.append(item)
+            return items
+        if isinstance(value, list):
+            return [self._fill(item, tag) for item in value]
+        return value
+
+
+def create_client(backend: Optional[str] = None, base_url: str = "http://localhost:11434",
+                  responses: Optional[Union[str, Path]] = None, record: Optional[Union[str, Path]] = None,
+                  keep_alive: Optional[Union[str, float]] = None, **options: Any):
+    """Builds the model client for a backend name.
+
+    Args:
+        backend: ``"ollama"``, ``"stand-in"`` or ``"replay"``; defaults to
+            $INCEPTOR_BACKEND, then ``"ollama"``
+        base_url: Ollama server URL
+        responses: Recorded responses for the stand-in, or the trace to replay
+        record: Trace file to record Ollama traffic to (ollama backend only)
+        keep_alive: How long Ollama keeps models loaded (see ``OllamaClient``)
+        **options: Extra ``StandInClient`` options (``fanout``, ``latency``)
+            or ``ReplayClient`` options (``speed``, ``strict``)
+
+    Returns:
+        OllamaClient, StandInClient or ReplayClient
+
+    Raises:
+        ValueError: If the backend name is unknown, replay has no trace, or
+            ``record`` is given for a backend other than Ollama
+    """
+    backend = (backend or os.environ.get("INCEPTOR_BACKEND") or "ollama").lower()
+    if record and backend in BACKENDS and backend != "ollama":
+        raise ValueError(f"Only the ollama backend can record a trace, not {backend}")
+    if backend == "ollama":
+        if record:
+            from .trace import TraceRecorder
+            return OllamaClient(base_url, recorder=TraceRecorder(record), keep_alive=keep_alive)
+        return OllamaClient(base_url, keep_alive=keep_alive)
+    if backend == "stand-in":
+        return StandInClient(responses, **options)
+    if backend == "replay":
+        if not responses:
+            raise ValueError("The replay backend needs a trace file")
+        from .trace import ReplayClient
+        return ReplayClient(responses, **options)
+    raise ValueError(f"Unknown backend: {backend} (use {', '.join(BACKENDS)})")
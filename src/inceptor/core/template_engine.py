@@ -0,0 +1,99 @@
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Union
+
+from .token_budget import estimate_tokens
+
+
+class CompiledTemplate:
+    """A prompt template parsed once into literal segments and slots.
+
+    Templates use ``str.format`` syntax restricted to plain ``{field}``
+    placeholders (``{{``/``}}`` for literal braces). Rendering checks the
+    fields and joins the segments; nothing is parsed again.
+    """
+
+    __slots__ = ("name", "source", "literals", "slots", "fields", "literal_tokens", "_parts", "_positions")
+
+    def __init__(self, source: str, name: str = "template"):
+        """Parse a template.
+
+        Args:
+            source: Template text
+            name: Name used in error messages
+
+        Raises:
+            ValueError: If the template is malformed or a placeholder uses
+                indexing, attributes, conversions or format specs
+        """
+        literals = [""]
+        slots = []
+        try:
+            parsed = list(Formatter().parse(source))
+        except ValueError as e:
+            raise ValueError(f"Invalid template {name}: {e}")
+        for literal, field, format_spec, conversion in parsed:
+            literals[-1] += literal
+            if field is None:
+                continue
+            if not field.isidentifier() or format_spec or conversion:
+                raise ValueError(f"Invalid placeholder {{{field}}} in template {name}: only {{name}} is supported")
+            slots.append(field)
+            literals.append("")
+        self.name = name
+        self.source = source
+        self.literals: Tuple[str, ...] = tuple(literals)
+        self.slots: Tuple[str, ...] = tuple(slots)
+        self.fields: FrozenSet[str] = frozenset(slots)
+        # Size of the fixed text, for token budgets
+        self.literal_tokens = estimate_tokens("".join(literals))
+        # Literals interleaved with slot placeholders, filled in by render
+        self._parts = [part for index, literal in enumerate(literals)
+                       for part in ((literal,) if index == 0 else ("", literal))]
+        self._positions = tuple((2 * index + 1, slot) for index, slot in enumerate(slots))
+
+    def validate(self, fields: Dict[str, Any]) -> None:
+        """Checks that ``fields`` are exactly the template's placeholders.
+
+        Raises:
+            ValueError: If a field is missing or unknown
+        """
+        if fields.keys() != self.fields:
+            missing = sorted(self.fields - fields.keys())
+            unknown = sorted(fields.keys() - self.fields)
+            problems = []
+            if missing:
+                problems.append(f"missing {', '.join(missing)}")
+            if unknown:
+                problems.append(f"unknown {', '.join(unknown)}")
+            raise ValueError(f"Fields for template {self.name}: {'; '.join(problems)}")
+
+    def render(self, **fields: Any) -> str:
+        """Fills the slots; values are converted with ``str``.
+
+        Raises:
+            ValueError: If a field is missing or unknown
+        """
+        if fields.keys() != self.fields:
+            self.validate(fields)
+        parts = list(self._parts)
+        for position, slot in self._positions:
+            value = fields[slot]
+            parts[position] = value if isinstance(value, str) else str(value)
+        return "".join(parts)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], name: Optional[str] = None) -> "CompiledTemplate":
+        """Compiles a UTF-8 template file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read(), name or Path(path).name)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.name!r}, fields={sorted(self.fields)})"
+
+
+@lru_cache(maxsize=64)
+def compile_template(source: str, name: str = "template") -> CompiledTemplate:
+    """Compiled form of ``source``, parsed once per distinct template."""
+    return CompiledTemplate(source, name)
@@ -0,0 +1,91 @@
+import json
+import re
+from typing import Any, List, Tuple
+
+# Rough BPE tokenization: words split every 4 characters, each punctuation
+# character and each line break (with its indentation) a token. Errs on the
+# high side for English and JSON, so trimmed prompts still fit.
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]|\n\s*")
+
+# Replaces what was cut from a string; {} is the estimated tokens omitted
+OMISSION_MARKER = "[... {} tokens omitted]"
+
+# Strings shorter than this (in tokens) are not worth truncating
+_MIN_LEAF_TOKENS = 16
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate of the tokens ``text`` takes in a model prompt."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Cuts ``text`` to about ``max_tokens`` tokens, marking what was omitted."""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    marker_tokens = estimate_tokens(OMISSION_MARKER.format(tokens))
+    keep = max(0, max_tokens - marker_tokens)
+    # Token positions -> character offset of the last kept token
+    end = 0
+    for index, match in enumerate(_TOKEN_RE.finditer(text)):
+        if index == keep:
+            break
+        end = match.end()
+    return text[:end].rstrip() + " " + OMISSION_MARKER.format(tokens - keep)
+
+
+def shrink(text: str, max_tokens: int) -> str:
+    """Shrinks a prompt field to about ``max_tokens`` tokens.
+
+    JSON fields are first re-serialized without indentation, then their
+    longest strings (code, specifications, ...) are truncated, so the
+    structure and the short fields survive. Anything still too long, and
+    plain text, is truncated at the end.
+
+    Args:
+        text: Field value as it would be inserted into the prompt
+        max_tokens: Target size
+
+    Returns:
+        The field, at most about ``max_tokens`` tokens long
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return truncate_text(text, max_tokens)
+    if not isinstance(value, (dict, list)):
+        return truncate_text(text, max_tokens)
+
+    compact = json.dumps(value, ensure_ascii=False)
+    excess = estimate_tokens(compact) - max_tokens
+    if excess <= 0:
+        return compact
+
+    # Truncate the longest strings first (counted as serialized, with escapes)
+    leaves = sorted(_string_leaves(value), key=lambda leaf: -leaf[2])
+    for container, key, tokens in leaves:
+        if excess <= 0 or tokens < _MIN_LEAF_TOKENS:
+            break
+        keep = max(_MIN_LEAF_TOKENS // 2, tokens - excess - _MIN_LEAF_TOKENS // 2)
+        raw_tokens = estimate_tokens(container[key])
+        container[key] = truncate_text(container[key], raw_tokens * keep // tokens)
+        excess -= tokens - estimate_tokens(json.dumps(container[key], ensure_ascii=False))
+    return truncate_text(json.dumps(value, ensure_ascii=False), max_tokens)
+
+
+def _string_leaves(value: Any) -> List[Tuple[Any, Any, int]]:
+    """(container, key, tokens) of every string in a JSON value."""
+    leaves = []
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, item in items:
+            if isinstance(item, str):
+                leaves.append((node, key, estimate_tokens(json.dumps(item, ensure_ascii=False))))
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
+    return leaves
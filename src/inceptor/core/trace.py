@@ -0,0 +1,226 @@
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from .ollama_client import GenerationCancelled
+from .stand_in import StandInClient, prompt_key
+
+TRACE_VERSION = 1
+
+# Record keys are kept short; a trace can hold thousands of responses.
+#   k: prompt_key digest   t: start offset (s)   l: latency (s)
+#   m: model               n: max_tokens         r: response
+#   e: error message       p/s: prompt/system (only with include_prompts)
+#   pt/ct: prompt/completion token counts reported by the server
+#   ld: model load time (s) reported by the server
+
+
+def _open(path: Union[str, Path], mode: str) -> IO[str]:
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_trace(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yields the request records of a trace file (``.gz`` is decompressed).
+
+    Raises:
+        ValueError: If the file is not a trace or has a newer version
+    """
+    with _open(path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("trace", 0) < 1:
+            raise ValueError(f"Not a trace file: {path}")
+        if header["trace"] > TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header['trace']} in {path}")
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class TraceRecorder:
+    """Appends model requests and responses, with timing, to a trace file.
+
+    The trace is JSON lines (gzip-compressed when the path ends in ``.gz``):
+    a header line, then one record per request. Prompts are identified by
+    their digest; pass ``include_prompts`` to keep the full text as well.
+    """
+
+    def __init__(self, path: Union[str, Path], include_prompts: bool = False):
+        """Start a new trace.
+
+        Args:
+            path: Trace file to create (overwritten if it exists)
+            include_prompts: Store prompt and system prompt text
+        """
+        self.path = Path(path)
+        self.include_prompts = include_prompts
+        self.records = 0
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._file = _open(self.path, "w")
+        self._write({"trace": TRACE_VERSION, "started": datetime.now().isoformat()})
+
+    def record(self, prompt: str, system_prompt: str, max_tokens: int, model: str,
+               started: float, latency: float, response: Optional[str] = None,
+               error: Optional[str] = None, usage: Optional[Dict[str, Any]] = None) -> None:
+        """Adds one request.
+
+        Args:
+            prompt: Prompt sent
+            system_prompt: System prompt sent
+            max_tokens: Token limit requested
+            model: Model name
+            started: ``time.monotonic()`` when the request was sent
+            latency: Seconds until the response (or error) arrived
+            response: Response text
+            error: Error message if the request failed
+            usage: Server response fields such as ``prompt_eval_count``
+        """
+        entry: Dict[str, Any] = {
+            "k": prompt_key(prompt, system_prompt),
+            "t": round(started - self._start, 6),
+            "l": round(latency, 6),
+            "m": model,
+            "n": max_tokens,
+        }
+        if error is not None:
+            entry["e"] = error
+        else:
+            entry["r"] = response
+        if usage:
+            if usage.get("prompt_eval_count") is not None:
+                entry["pt"] = usage["prompt_eval_count"]
+            if usage.get("eval_count") is not None:
+                entry["ct"] = usage["eval_count"]
+            if usage.get("load_duration"):
+                entry["ld"] = round(usage["load_duration"] / 1e9, 6)
+        if self.include_prompts:
+            entry["p"] = prompt
+            if system_prompt:
+                entry["s"] = system_prompt
+        with self._lock:
+            self._write(entry)
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+
+class ReplayClient(StandInClient):
+    """Serves the responses of a recorded trace, with their timing.
+
+    Each prompt gets the responses recorded for it in order (the last one
+    is repeated once they run out) after sleeping the recorded latency
+    divided by ``speed``. Recorded errors are raised again like
+    ``OllamaClient`` raises them, and ``last_usage`` reports the recorded
+    token counts and load time.
+    """
+
+    def __init__(self, path: Union[str, Path], speed: float = 1.0, strict: bool = True):
+        """Load a trace.
+
+        Args:
+            path: Trace written by ``TraceRecorder``
+            speed: Latency divisor; 1 replays the original timing, 2 twice
+                as fast, 0 without any delay
+            strict: Raise for prompts missing from the trace instead of
+                answering with a synthetic response
+        """
+        super().__init__()
+        self.base_url = f"replay://{path}"
+        self.model = "replay"
+        self.speed = speed
+        self.strict = strict
+        self.misses = 0
+        self._local = threading.local()
+        self._replies: Dict[str, Deque[Tuple[Optional[str], Optional[str], float, Optional[Dict[str, Any]]]]] = {}
+        for entry in read_trace(path):
+            usage = {}
+            if "pt" in entry:
+                usage["prompt_eval_count"] = entry["pt"]
+            if "ct" in entry:
+                usage["eval_count"] = entry["ct"]
+            if "ld" in entry:
+                usage["load_duration"] = int(round(entry["ld"] * 1e9))
+            reply = (entry.get("r"), entry.get("e"), entry["l"], usage if "e" not in entry else None)
+            self._replies.setdefault(entry["k"], deque()).append(reply)
+
+    def generate(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000,
+                 model: Optional[str] = None, temperature: float = 0.7, seed: Optional[int] = None,
+                 cancel: Optional[threading.Event] = None) -> str:
+        """Same contract as ``OllamaClient.generate`` (``model``, ``temperature`` and ``seed`` are ignored)."""
+        self._local.usage = None
+        replies = self._replies.get(prompt_key(prompt, system_prompt))
+        if not replies:
+            with self._lock:
+                self.misses += 1
+            if self.strict:
+                raise Exception("Ollama API error: prompt not found in replay trace")
+            return super().generate(prompt, system_prompt, max_tokens, cancel=cancel)
+
+        with self._lock:
+            response, error, latency, usage = replies.popleft() if len(replies) > 1 else replies[0]
+            self.calls += 1
+            self.recorded_hits += 1
+        if self.speed > 0 and latency > 0:
+            if cancel is None:
+                time.sleep(latency / self.speed)
+            elif cancel.wait(latency / self.speed):
+                raise GenerationCancelled("Generation cancelled")
+        if error is not None:
+            raise Exception(f"Ollama API error: {error}")
+        self._local.usage = dict(usage)
+        return response
+
+    def last_usage(self) -> Optional[Dict[str, Any]]:
+        """Recorded usage of this thread's last ``generate``, like ``OllamaClient.last_usage``.
+
+        Returns:
+            ``prompt_eval_count``, ``eval_count`` and ``load_duration``
+            (nanoseconds) as far as the trace has them, or None if the
+            request failed or was not in the trace
+        """
+        return getattr(self._local, "usage", None)
+
+
+def trace_summary(path: Union[str, Path]) -> Dict[str, Any]:
+    """Request count, error count and latency totals of a trace.
+
+    ``load_seconds`` is the part of ``model_seconds`` the server spent
+    loading models.
+    """
+    latencies: List[float] = []
+    errors = 0
+    load = 0.0
+    end = 0.0
+    for entry in read_trace(path):
+        latencies.append(entry["l"])
+        errors += "e" in entry
+        load += entry.get("ld", 0.0)
+        end = max(end, entry["t"] + entry["l"])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "model_seconds": round(sum(latencies), 6),
+        "load_seconds": round(load, 6),
+        "wall_seconds": round(end, 6),
+        "max_latency": max(latencies, default=0.0),
+    }
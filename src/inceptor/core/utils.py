@@ -1,6 +1,7 @@
-from typing import Dict, Any
+from typing import IO, Dict, Any, Iterable, Optional, Tuple, Union
 from .dream_architect import DreamArchitect
-from .context_extractor import ContextExtractor
+from .context_extractor import ContextExtractor, TextSource
+from .corpus_analyzer import CorpusAnalyzer, CorpusReport
 from .models import Solution
 
 def quick_solution(problem: str, levels: int = 3) -> Solution:
@@ -27,3 +28,29 @@ def analyze_context(text: str) -> Dict[str, Any]:
     """
     extractor = ContextExtractor()
     return extractor.extract_context(text)
+
+def analyze_context_stream(source: TextSource, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """Analyze context from a file, file object or iterable of chunks.
+
+    Args:
+        source: File path, file object or iterable of str/bytes chunks
+        chunk_size: Amount of input processed at a time
+
+    Returns:
+        Dictionary with extracted context
+    """
+    return ContextExtractor.extract_context_stream(source, chunk_size=chunk_size)
+
+def analyze_corpus(documents: Iterable[Union[str, Tuple[str, str]]], workers: Optional[int] = None,
+                   jsonl: Optional[IO[str]] = None) -> CorpusReport:
+    """Analyze context across many documents using a process pool.
+
+    Args:
+        documents: Texts, or (doc_id, text) pairs
+        workers: Worker processes (default: CPU count)
+        jsonl: Optional text stream receiving per-document results as JSON lines
+
+    Returns:
+        CorpusReport with category/term frequencies and throughput
+    """
+    return CorpusAnalyzer(workers=workers).analyze(documents, jsonl=jsonl)
@@ -24,7 +24,8 @@ from .core import (
     
     # Utility functions
     quick_solution,
-    analyze_context
+    analyze_context,
+    analyze_context_stream
 )
 
 # For backward compatibility
@@ -37,7 +38,8 @@ __all__ = [
     'Task',
     'ArchitectureLevel',
     'quick_solution',
-    'analyze_context'
+    'analyze_context',
+    'analyze_context_stream'
 ]
 
 # Example usage
@@ -61,20 +63,7 @@ if __name__ == "__main__":
     
     # Save to file
     with open("solution.json", "w") as f:
-        from dataclasses import asdict, is_dataclass
         import json
-        
-        def convert_dataclass(obj):
-            if is_dataclass(obj):
-                return {k: convert_dataclass(v) for k, v in asdict(obj).items()}
-            elif isinstance(obj, (list, tuple)):
-                return [convert_dataclass(x) for x in obj]
-            elif isinstance(obj, dict):
-                return {k: convert_dataclass(v) for k, v in obj.items()}
-            elif hasattr(obj, 'name'):  # For Enums
-                return obj.name
-            return obj
-            
-        json.dump(convert_dataclass(solution), f, indent=2, ensure_ascii=False)
+        json.dump(solution.to_dict(), f, indent=2, ensure_ascii=False)
     
     print("\nSolution saved to solution.json")
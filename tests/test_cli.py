@@ -72,3 +72,120 @@ class TestCLI:
             result = runner.invoke(cli, ['shell'], input='exit\n')
             assert result.exit_code == 0
             assert 'Goodbye!' in result.output
+
+    def test_cli_context_from_file_and_stdin(self, runner, tmp_path):
+        """The context command streams files and stdin."""
+        path = tmp_path / "ticket.txt"
+        path.write_text("Urgent Flask logging fix")
+
+        result = runner.invoke(cli, ['context', '--file', str(path)])
+        assert result.exit_code == 0
+        assert 'flask' in result.output
+        assert 'logging' in result.output
+
+        result = runner.invoke(cli, ['context', '--file', '-'], input='Kubernetes rollout')
+        assert result.exit_code == 0
+        assert 'kubernetes' in result.output
+
+        result = runner.invoke(cli, ['context'])
+        assert result.exit_code != 0
+
+    def test_cli_corpus(self, runner, tmp_path):
+        """The corpus command prints frequencies and writes JSONL results."""
+        corpus_file = tmp_path / "tickets.txt"
+        corpus_file.write_text("Urgent Django bug\nDjango deployment\n\nPython tests\n")
+        jsonl = tmp_path / "out.jsonl"
+
+        result = runner.invoke(cli, ['corpus', str(corpus_file), '--lines', '--workers', '1',
+                                     '--jsonl', str(jsonl)])
+
+        assert result.exit_code == 0
+        assert 'django (2)' in result.output
+        assert 'documents/sec' in result.output
+        assert len(jsonl.read_text().splitlines()) == 3
+
+    def test_cli_generate_binary_output(self, runner, tmp_path):
+        """generate --output with a .isol suffix writes the binary format."""
+        from inceptor.core import Solution, load_solution
+        solution = Solution("test prompt", {"limbo": {}}, [], {}, {})
+        output = tmp_path / "solution.isol"
+
+        with patch('inceptor.cli.DreamArchitect') as mock_da_class:
+            mock_da_class.return_value.inception.return_value = solution
+            result = runner.invoke(cli, ['generate', 'test prompt', '--output', str(output)])
+
+        assert result.exit_code == 0
+        assert output.read_bytes()[:4] == b"ISOL"
+        assert load_solution(output) == solution
+
+    def test_cli_dream_stand_in_backend(self, runner):
+        """dream --backend stand-in runs a full inception without a model server."""
+        result = runner.invoke(cli, ['dream', 'Flask logging API', '--levels', '5', '--backend', 'stand-in'])
+
+        assert result.exit_code == 0
+        assert 'Solution generated' in result.output
+
+    def test_cli_record_needs_ollama(self, runner, tmp_path):
+        """--record with a backend that cannot record is a usage error, not silently ignored."""
+        trace = tmp_path / "trace.jsonl"
+        result = runner.invoke(cli, ['dream', 'Flask logging API', '--backend', 'stand-in', '--record', str(trace)])
+
+        assert result.exit_code == 2
+        assert 'ollama backend' in result.output and not trace.exists()
+
+    def test_cli_loadtest(self, runner, tmp_path):
+        """loadtest ramps concurrency against the stand-in backend."""
+        corpus = tmp_path / "problems.txt"
+        corpus.write_text("Flask logging API\n# skipped\nKafka ETL\n")
+        report = tmp_path / "report.json"
+
+        result = runner.invoke(cli, ['loadtest', str(corpus), '--backend', 'stand-in', '-c', '1,2',
+                                     '-n', '4', '--json', str(report)])
+
+        assert result.exit_code == 0
+        assert 'Peak throughput' in result.output
+        data = json.loads(report.read_text())
+        assert [step["concurrency"] for step in data["steps"]] == [1, 2]
+        assert set(data["steps"][0]["levels"]) == {"limbo", "dream", "reality"}
+
+    def test_cli_loadtest_priority_mix(self, runner, tmp_path):
+        """loadtest --mix reports queue wait per priority class."""
+        corpus = tmp_path / "problems.txt"
+        corpus.write_text("Flask logging API\n")
+
+        result = runner.invoke(cli, ['loadtest', str(corpus), '--backend', 'stand-in', '-c', '2', '-n', '4',
+                                     '--mix', 'interactive=1,background=1'])
+
+        assert result.exit_code == 0
+        assert 'Queue Wait per Priority Class' in result.output
+        assert runner.invoke(cli, ['loadtest', str(corpus), '--mix', 'urgent=1']).exit_code == 2
+
+    def test_cli_dream_profile(self, runner, tmp_path):
+        """dream --profile prints the time split and writes profile files."""
+        prefix = tmp_path / "profile"
+        result = runner.invoke(cli, ['dream', 'Flask logging API', '--backend', 'stand-in',
+                                     '--profile', '--profile-output', str(prefix)])
+
+        assert result.exit_code == 0
+        assert 'Model wait:' in result.output
+        assert (tmp_path / "profile.prof").exists()
+        assert (tmp_path / "profile.folded").read_text()
+
+    def test_shell_search(self, tmp_path, monkeypatch, capsys):
+        """The shell's search command runs a full-text search for all its words."""
+        from inceptor.cli import DreamShell
+        from inceptor.core import Solution
+        monkeypatch.setenv('HOME', str(tmp_path))
+        shell = DreamShell()
+        shell.store.save('logging-api', Solution(problem='Flask logging API', architecture={}, tasks=[],
+                                                 implementation={}, metadata={}))
+
+        with patch('inceptor.cli.Prompt.ask', side_effect=['search flask logging', 'search', 'search kafka',
+                                                            'exit']):
+            shell.loop()
+
+        output = capsys.readouterr().out
+        assert "Solutions matching 'flask logging'" in output and 'logging-api' in output
+        assert 'Please provide a search query' in output
+        assert "No solutions match 'kafka'" in output
+        assert 'Unknown command' not in output
@@ -1,7 +1,7 @@
 """Test core functionality of Inceptor."""
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from inceptor.core import DreamArchitect, OllamaClient, ContextExtractor
+from inceptor.core import DreamArchitect, OllamaClient, ContextExtractor, CorpusAnalyzer, PatternRegistry
 
 class TestDreamArchitect:
     """Test suite for DreamArchitect class."""
@@ -52,3 +52,1411 @@ class TestDreamArchitect:
         # Verify mocks were called
         mock_extractor_instance.extract_context.assert_called_once()
         mock_ollama_instance.generate.assert_called()
+
+
+class TestContextExtractor:
+    """Test suite for ContextExtractor class."""
+
+    @staticmethod
+    def _legacy_extract(text):
+        """Reference result: one findall per pattern, as before the combined matcher."""
+        import re
+        context = {}
+        for category, patterns in ContextExtractor.CONTEXT_PATTERNS.items():
+            matches = []
+            for pattern in patterns:
+                matches.extend(re.findall(pattern, text.lower()))
+            context[category] = set(matches)
+        return context
+
+    @pytest.mark.parametrize("text", [
+        "Urgent Python security audit for a team of 50 users",
+        "Team size is small, GDPR compliance and CI/CD with Docker on AWS",
+        "nice to have: 3 servers, 10 requests per second, legacy migration",
+        "nothing relevant here",
+        "",
+    ])
+    def test_extract_context_matches_per_pattern_scan(self, text):
+        """The single-pass matcher reports the same terms as per-pattern scans."""
+        result = ContextExtractor.extract_context(text)
+
+        assert set(result) == set(ContextExtractor.CONTEXT_PATTERNS)
+        assert {k: set(v) for k, v in result.items()} == self._legacy_extract(text)
+
+    def test_shared_keyword_reported_in_all_categories(self):
+        """A keyword listed under several categories is reported under each."""
+        result = ContextExtractor.extract_context("Security and team size")
+
+        assert "security" in result["problem_type"]
+        assert "security" in result["constraints"]
+        assert "team" in result["scale"]
+        assert "team size" in result["constraints"]
+
+    def test_matcher_is_cached_and_rebuilt_on_change(self, monkeypatch):
+        """The compiled matcher is reused until CONTEXT_PATTERNS changes."""
+        matcher = ContextExtractor.get_matcher()
+        assert ContextExtractor.get_matcher() is matcher
+
+        patterns = dict(ContextExtractor.CONTEXT_PATTERNS, cloud=[r'\b(openstack)\b'])
+        monkeypatch.setattr(ContextExtractor, "CONTEXT_PATTERNS", patterns)
+
+        assert ContextExtractor.get_matcher() is not matcher
+        assert ContextExtractor.extract_context("OpenStack")["cloud"] == ["openstack"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 64])
+    def test_extract_context_stream_matches_across_chunks(self, chunk_size):
+        """Matches split across chunk boundaries are still found."""
+        text = "Team size of 120 users, nice to have CI/CD with PostgreSQL " * 20
+        chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+
+        result = ContextExtractor.extract_context_stream(chunks)
+
+        expected = ContextExtractor.extract_context(text)
+        assert {k: set(v) for k, v in result.items()} == {k: set(v) for k, v in expected.items()}
+
+    def test_extract_context_stream_from_file(self, tmp_path, monkeypatch):
+        """Files are read in chunks, memory-mapped when larger than one chunk."""
+        path = tmp_path / "spec.txt"
+        path.write_text("filler " * 500 + "Zażółć: urgent Django migration " * 3, encoding="utf-8")
+        monkeypatch.setattr(ContextExtractor, "STREAM_OVERLAP", 16)
+
+        result = ContextExtractor.extract_context_stream(str(path), chunk_size=100)
+
+        assert result["technology"] == ["django"]
+        assert result["urgency"] == ["urgent"]
+        assert result["constraints"] == ["migration"]
+
+    def test_extract_context_stream_from_file_object(self):
+        """Binary and text file objects are both accepted."""
+        import io
+        assert ContextExtractor.extract_context_stream(io.BytesIO(b"redis"))["technology"] == ["redis"]
+        assert ContextExtractor.extract_context_stream(io.StringIO("Redis"))["technology"] == ["redis"]
+
+
+class TestPatternRegistry:
+    """Test suite for PatternRegistry class."""
+
+    BASE = {'technology': [r'\b(python|flask)\b']}
+
+    def test_loads_patterns_and_keywords_from_config(self, tmp_path):
+        """Config files extend existing categories and add new ones."""
+        config = tmp_path / "patterns.yaml"
+        config.write_text(
+            "technology:\n  - '\\b(rust)\\b'\n"
+            "healthcare:\n  keywords: [HL7, fhir]\n"
+        )
+        registry = PatternRegistry([config])
+
+        result = registry.get_matcher(self.BASE).extract("Flask, Rust and FHIR")
+
+        assert set(result["technology"]) == {"flask", "rust"}
+        assert result["healthcare"] == ["fhir"]
+        assert registry.get_matcher(self.BASE) is registry.get_matcher(self.BASE)
+
+    def test_cache_invalidated_when_file_changes(self, tmp_path):
+        """Editing a config file rebuilds the matcher on the next check."""
+        config = tmp_path / "patterns.json"
+        config.write_text('{"cloud": {"keywords": ["openstack"]}}')
+        registry = PatternRegistry([config], check_interval=0)
+        first = registry.get_matcher(self.BASE)
+
+        config.write_text('{"cloud": {"keywords": ["openstack", "proxmox"]}}')
+        second = registry.get_matcher(self.BASE)
+
+        assert second is not first
+        assert second.extract("Proxmox")["cloud"] == ["proxmox"]
+
+    def test_broken_rewrite_keeps_last_good_patterns(self, tmp_path, caplog):
+        """A config file that breaks after loading is logged once; lookups keep the old matcher."""
+        import logging
+        config = tmp_path / "patterns.yaml"
+        config.write_text("cloud:\n  keywords: [openstack]\n")
+        registry = PatternRegistry([config], check_interval=0)
+        first = registry.get_matcher(self.BASE)
+
+        config.write_text("cloud: [unclosed\n")
+        with caplog.at_level(logging.WARNING, logger="inceptor.core.pattern_registry"):
+            matchers = [registry.get_matcher(self.BASE) for _ in range(3)]
+
+        assert all(matcher is first for matcher in matchers)
+        assert first.extract("OpenStack")["cloud"] == ["openstack"]
+        assert len(caplog.records) == 1 and "patterns.yaml" in caplog.records[0].getMessage()
+        with pytest.raises(ValueError):
+            PatternRegistry.load_file(config)
+
+        config.write_text("cloud:\n  keywords: [proxmox]\n")
+        assert registry.get_matcher(self.BASE).extract("Proxmox")["cloud"] == ["proxmox"]
+
+    def test_invalid_pattern_raises(self, tmp_path):
+        """Patterns are validated when a file is loaded."""
+        config = tmp_path / "bad.json"
+        config.write_text('{"broken": ["(unclosed"]}')
+
+        with pytest.raises(ValueError, match="invalid pattern"):
+            PatternRegistry.load_file(config)
+
+    def test_patterns_overlapping_keywords(self, tmp_path):
+        """Config patterns run on their own, so keywords do not hide their matches."""
+        config = tmp_path / "patterns.json"
+        config.write_text('{"version": ["\\\\bpython \\\\d+\\\\b", "\\\\bflask (\\\\d)\\\\b"]}')
+        matcher = PatternRegistry([config]).get_matcher(self.BASE)
+
+        result = matcher.extract("We use Python 3 with Flask 2")
+
+        assert set(result["technology"]) == {"python", "flask"}
+        assert result["version"] == ["python 3", "2"]
+        chunks = ["we use pyt", "hon 3 with fla", "sk 2"]
+        assert matcher.extract_stream(chunks, overlap=16) == result
+
+    def test_patterns_with_inline_flags(self, tmp_path):
+        """Inline global flags are valid at the start of each pattern."""
+        config = tmp_path / "patterns.json"
+        config.write_text('{"tooling": ["(?i)\\\\bmake(file)?\\\\b"]}')
+
+        result = PatternRegistry([config]).get_matcher(self.BASE).extract("Flask Makefile")
+
+        assert result == {"technology": ["flask"], "tooling": ["file"]}
+
+    def test_patterns_with_named_groups_and_backreferences(self, tmp_path):
+        """Group names and numbers are local to each pattern."""
+        config = tmp_path / "patterns.json"
+        config.write_text('{"names": ["(?P<kw>x)y"], "doubles": ["\\\\b(\\\\w)\\\\1\\\\b"]}')
+
+        result = PatternRegistry([config]).get_matcher(self.BASE).extract("xy python zz")
+
+        assert result == {"technology": ["python"], "names": ["x"], "doubles": ["z"]}
+
+    def test_profile_reports_cost_per_pattern(self, tmp_path):
+        """Every pattern gets a cost entry with its source and match count."""
+        config = tmp_path / "patterns.json"
+        config.write_text('{"technology": ["\\\\b(rust)\\\\b"]}')
+        registry = PatternRegistry([config])
+
+        costs = registry.profile("python rust python", self.BASE)
+
+        by_pattern = {c.pattern: c for c in costs}
+        assert by_pattern[r'\b(python|flask)\b'].matches == 2
+        assert by_pattern[r'\b(rust)\b'].source == str(config)
+        assert all(c.seconds >= 0 for c in costs)
+
+
+class TestCorpusAnalyzer:
+    """Test suite for CorpusAnalyzer class."""
+
+    DOCUMENTS = [
+        "Urgent Flask logging",
+        "Flask API on Kubernetes",
+        "Nothing to see",
+    ]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_analyze_aggregates_document_frequencies(self, workers):
+        """Term counts are per document, results come back in input order."""
+        import io
+        import json
+        jsonl = io.StringIO()
+
+        report = CorpusAnalyzer(workers=workers, batch_size=2).analyze(self.DOCUMENTS, jsonl=jsonl)
+
+        assert report.documents == 3
+        assert report.errors == 0
+        assert report.category_counts["technology"] == 2
+        assert report.top_terms("technology", 1) == [("flask", 2)]
+        assert report.term_counts["problem_type"]["logging"] == 1
+        records = [json.loads(line) for line in jsonl.getvalue().splitlines()]
+        assert [r["id"] for r in records] == ["0", "1", "2"]
+        assert records[2]["context"]["technology"] == []
+
+    def test_analyze_files_reports_unreadable_documents(self, tmp_path):
+        """Files are documents; failures are counted instead of aborting the run."""
+        (tmp_path / "a.txt").write_text("docker")
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / "b.txt").write_text("docker and redis")
+
+        report = CorpusAnalyzer(workers=1).analyze_files([tmp_path, tmp_path / "missing.txt"])
+
+        assert report.documents == 3
+        assert report.errors == 1
+        assert report.term_counts["technology"]["docker"] == 2
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache class."""
+
+    VECTORS = {
+        "logging for flask app": [1.0, 0.0, 0.1],
+        "flask logging system": [0.98, 0.05, 0.12],
+        "kubernetes autoscaling": [0.0, 1.0, 0.0],
+    }
+
+    @pytest.fixture
+    def client(self):
+        pytest.importorskip("numpy")
+        client = MagicMock()
+        client.embed.side_effect = lambda text: self.VECTORS[text.split("\n")[0]]
+        return client
+
+    def test_similar_problem_hits_and_distant_problem_misses(self, client):
+        """Hits are returned above the threshold only, as independent copies."""
+        from inceptor.core import SemanticCache
+        cache = SemanticCache(client, threshold=0.95)
+        cache.store(SemanticCache.key_text("logging for flask app", {}), {"limbo": {"components": []}})
+
+        similarity, entry = cache.lookup(SemanticCache.key_text("flask logging system", {}))
+        entry["limbo"]["components"].append("mutated")
+
+        assert similarity > 0.95
+        assert cache.lookup(SemanticCache.key_text("kubernetes autoscaling", {})) is None
+        assert cache.lookup(SemanticCache.key_text("logging for flask app", {}))[1] == {"limbo": {"components": []}}
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_save_and_load_round_trip(self, client, tmp_path):
+        """The index persists to a directory and loads back."""
+        from inceptor.core import SemanticCache
+        cache = SemanticCache(client, path=tmp_path)
+        cache.store(SemanticCache.key_text("logging for flask app", {}), {"problem": "a"})
+        cache.save()
+
+        reloaded = SemanticCache(client, path=tmp_path)
+
+        assert len(reloaded) == 1
+        assert reloaded.lookup(SemanticCache.key_text("flask logging system", {}))[1] == {"problem": "a"}
+
+    def test_inception_skips_limbo_and_dream_on_hit(self, client):
+        """A cache hit reuses LIMBO/DREAM and only runs the later levels."""
+        from inceptor.core import SemanticCache
+        limbo = '{"components": [], "dream_tasks": [{"task_id": "D1"}]}'
+        dream = '{"design": {}, "reality_tasks": [{"task_id": "R1"}]}'
+        reality = '{"implementation": {}, "deeper_tasks": []}'
+        cache = SemanticCache(client, threshold=0.95)
+        architect = DreamArchitect(semantic_cache=cache)
+
+        with patch.object(architect.ollama, "generate", side_effect=[limbo, dream, reality]):
+            architect.inception("logging for flask app")
+        with patch.object(architect.ollama, "generate", side_effect=[reality]) as generate:
+            solution = architect.inception("flask logging system")
+
+        assert generate.call_count == 1
+        assert solution.metadata["semantic_cache"]["source_problem"] == "logging for flask app"
+        assert "R1" in solution.implementation["reality"]
+
+
+class TestSolutionStore:
+    """Tests for the SQLite solution store."""
+
+    @pytest.fixture
+    def solution(self):
+        from inceptor.core import ArchitectureLevel, Solution, Task
+        return Solution(
+            problem="logging system for Flask app",
+            architecture={
+                "limbo": {"components": [{"name": "LogCollector"}], "dream_tasks": [{"task_id": "D1"}]},
+                "dream": {"D1": {"design": {"stack": "flask"}}, "D2": {"design": {}}},
+            },
+            tasks=[Task.from_dict({"task_id": "D1"}, ArchitectureLevel.DREAM),
+                   Task.from_dict({"task_id": "D2", "estimate": "2h"}, ArchitectureLevel.DREAM)],
+            implementation={"reality": {"R1": {"code": "print('hi')"}}},
+            metadata={"levels": 3},
+        )
+
+    def test_round_trip_returns_real_solution(self, tmp_path, solution):
+        """Loading rebuilds an equal Solution instance."""
+        from inceptor.core import Solution, SolutionStore
+        with SolutionStore(tmp_path / "solutions.db") as store:
+            store.save("logging", solution)
+
+        with SolutionStore(tmp_path / "solutions.db") as store:
+            loaded = store.load("logging")
+
+        assert isinstance(loaded, Solution)
+        assert loaded == solution
+        assert store.path.endswith("solutions.db")
+
+    def test_save_is_incremental(self, solution):
+        """Re-saving only writes the rows that changed."""
+        from inceptor.core import SolutionStore
+        store = SolutionStore(":memory:")
+
+        assert store.save("logging", solution) == 6
+        assert store.save("logging", solution) == 0
+
+        solution.architecture["dream"]["D2"] = {"design": {"queue": "redis"}}
+        solution.tasks.pop()
+        assert store.save("logging", solution) == 2
+        assert store.load("logging") == solution
+
+    def test_list_search_and_delete(self, solution):
+        """Listing, full-text search and deletion."""
+        from inceptor.core import SolutionStore
+        store = SolutionStore(":memory:")
+        store.save("logging", solution)
+        solution.problem = "CI/CD pipeline for Kubernetes"
+        solution.architecture["limbo"]["components"] = [{"name": "Runner"}]
+        store.save("pipeline", solution)
+
+        assert [s["name"] for s in store.list()] == ["pipeline", "logging"]
+        assert store.count() == 2
+        assert [s["name"] for s in store.search("flask")] == ["logging"]
+        assert [s["name"] for s in store.search("runner")] == ["pipeline"]
+        assert store.load("missing") is None
+        assert store.delete("logging") is True
+        assert store.delete("logging") is False
+        assert store.search("flask") == []
+
+
+class TestSerialization:
+    """Tests for the binary solution format."""
+
+    @pytest.fixture
+    def solution(self):
+        from inceptor.core import ArchitectureLevel, Solution, Task
+        return Solution(
+            problem="logging system for Flask app",
+            architecture={"limbo": {"components": [{"name": "LogCollector"}]},
+                          "dream": {"D1": {"design": {"stack": "flask"}}}},
+            tasks=[Task.from_dict({"task_id": "D1", "description": "design"}, ArchitectureLevel.DREAM)],
+            implementation={"reality": {"R1": {"code": "print('zażółć')"}}},
+            metadata={"levels": 3, "duration": 1.5},
+        )
+
+    @pytest.mark.parametrize("codec", ["json", "msgpack"])
+    def test_round_trip(self, solution, codec):
+        """Both codecs load back into an equal Solution."""
+        from inceptor.core import Solution, serialization
+        if codec == "msgpack":
+            pytest.importorskip("msgpack")
+        data = serialization.dumps(solution, codec=getattr(serialization, f"CODEC_{codec.upper()}"))
+
+        loaded = serialization.loads(data)
+
+        assert data[:4] == b"ISOL"
+        assert isinstance(loaded, Solution)
+        assert loaded == solution
+
+    def test_records_are_streamed_per_node(self, solution):
+        """Task-keyed levels are written as one record per task."""
+        import io
+        from inceptor.core import serialization
+        records = list(serialization.iter_records(io.BytesIO(serialization.dumps(solution))))
+
+        assert [(kind, name) for kind, name, _ in records] == [
+            (serialization.RECORD_PROBLEM, ""),
+            (serialization.RECORD_ARCHITECTURE, "limbo"),
+            (serialization.RECORD_ARCHITECTURE, "dream\0D1"),
+            (serialization.RECORD_TASK, ""),
+            (serialization.RECORD_IMPLEMENTATION, "reality\0R1"),
+            (serialization.RECORD_METADATA, ""),
+        ]
+
+    def test_rejects_invalid_files(self, solution):
+        """Bad magic, newer versions and truncated data raise ValueError."""
+        import struct
+        from inceptor.core import serialization
+        data = serialization.dumps(solution)
+        newer = data[:4] + struct.pack("<H", serialization.FORMAT_VERSION + 1) + data[6:]
+
+        for bad in (b"NOPE" + data[4:], newer, data[:len(data) // 2]):
+            with pytest.raises(ValueError):
+                serialization.loads(bad)
+
+    @pytest.mark.parametrize("suffix", [".isol", ".json", ".yaml"])
+    def test_save_and_load_by_suffix(self, solution, tmp_path, suffix):
+        """The file format follows the file suffix."""
+        from inceptor.core import load_solution, save_solution
+        path = tmp_path / f"solution{suffix}"
+
+        save_solution(solution, path)
+
+        assert load_solution(path) == solution
+
+    def test_lazy_solution_decodes_only_accessed_nodes(self, solution, tmp_path):
+        """LazySolution decodes a level only when it is accessed."""
+        from inceptor.core import LazySolution, save_solution
+        path = tmp_path / "solution.isol"
+        save_solution(solution, path)
+
+        with LazySolution(path) as lazy:
+            with patch.object(lazy, "_decode", wraps=lazy._decode) as decode:
+                assert list(lazy.architecture) == ["limbo", "dream"]
+                assert lazy.implementation.node_count("reality") == 1
+                assert decode.call_count == 0
+
+                assert lazy.architecture["limbo"]["components"][0]["name"] == "LogCollector"
+                assert lazy.architecture["limbo"] is lazy.architecture["limbo"]
+                assert decode.call_count == 1
+
+            assert lazy.to_solution() == solution
+
+    def test_lazy_solution_without_index(self, solution, tmp_path):
+        """Files without the trailing index are indexed by scanning headers."""
+        import struct
+        from inceptor.core import LazySolution, serialization
+        data = serialization.dumps(solution)
+        index_offset, _ = struct.unpack("<Q4s", data[-12:])
+        path = tmp_path / "old.isol"
+        path.write_bytes(data[:index_offset] + struct.pack("<BHI", serialization.RECORD_END, 0, 0))
+
+        with LazySolution(path) as lazy:
+            assert lazy.implementation["reality"] == solution.implementation["reality"]
+            assert lazy.to_solution() == solution
+        assert serialization.load_solution(path) == solution
+
+
+class TestModels:
+    """Tests for the slotted Task/Solution node types."""
+
+    def test_task_round_trip_and_slots(self):
+        """Tasks keep unknown keys in context and have no instance dict."""
+        from inceptor.core import ArchitectureLevel, Task
+        data = {"task_id": "R1", "description": "write handler", "file": "app.py"}
+
+        task = Task.from_dict(data, ArchitectureLevel.REALITY)
+
+        assert task.context == {"file": "app.py"}
+        assert not hasattr(task, "__dict__")
+        assert Task.from_dict(task.to_dict()) == task
+
+    def test_task_level_is_not_guessed(self):
+        """A dict without a known level leaves it unset; the model's own level key survives."""
+        from inceptor.core import ArchitectureLevel, Solution, Task
+        legacy = {"task_id": "T1", "description": "d", "dependencies": [], "output_format": "",
+                  "success_criteria": []}
+        own = dict(legacy, level="backend")
+
+        assert Task.from_dict(legacy).level is None
+        assert Task.from_dict(legacy).to_dict() == legacy
+        assert Task.from_dict({"task_id": "T1", "level": "DEEPER"}).level is ArchitectureLevel.DEEPER
+        task = Task.from_dict(own, ArchitectureLevel.REALITY)
+        assert task.level is ArchitectureLevel.REALITY and task.context == {"level": "backend"}
+        assert Solution.from_dict({"problem": "p", "tasks": [legacy, own]}).to_dict()["tasks"] == [legacy, own]
+
+    def test_solution_to_dict_shares_level_results(self):
+        """to_dict does not copy architecture/implementation trees."""
+        from inceptor.core import Solution
+        solution = Solution("p", {"limbo": {"components": []}}, [], {"reality": {}}, {})
+
+        data = solution.to_dict()
+
+        assert data["architecture"] is solution.architecture
+        assert Solution.from_dict(data) == solution
+
+    def test_inception_collects_task_nodes(self):
+        """Tasks emitted by each level become Task nodes tagged with their level."""
+        from inceptor.core import ArchitectureLevel, Task
+        limbo = '{"components": [], "dream_tasks": [{"task_id": "D1", "description": "design"}]}'
+        dream = '{"design": {}, "reality_tasks": []}'
+        architect = DreamArchitect()
+
+        with patch.object(architect.ollama, "generate", side_effect=[limbo, dream]):
+            solution = architect.inception("logging for flask app")
+
+        assert solution.tasks == [Task("D1", ArchitectureLevel.DREAM, "design", {}, [], "", [])]
+
+
+class TestProjectExporter:
+    """Tests for directory and archive project export."""
+
+    files = {"main.py": "print('hi')", "app/config.yml": "debug: true", "logo.bin": b"\x00\x01"}
+
+    def test_export_dir_replaces_project(self, tmp_path):
+        """The target is replaced as a whole and no staging files remain."""
+        from inceptor.core import ProjectExporter
+        target = tmp_path / "projects" / "demo"
+        target.mkdir(parents=True)
+        (target / "stale.txt").write_text("old")
+
+        paths = ProjectExporter(max_workers=4).export_dir(self.files, target)
+
+        assert paths == [str(target / name) for name in self.files]
+        assert (target / "app" / "config.yml").read_text() == "debug: true"
+        assert (target / "logo.bin").read_bytes() == b"\x00\x01"
+        assert not (target / "stale.txt").exists()
+        assert [p.name for p in target.parent.iterdir()] == ["demo"]
+
+    def test_failed_export_keeps_old_project(self, tmp_path):
+        """Invalid file names abort the export before the swap."""
+        from inceptor.core import ProjectExporter
+        target = tmp_path / "demo"
+        target.mkdir()
+        (target / "main.py").write_text("old")
+
+        with pytest.raises(ValueError):
+            ProjectExporter().export_dir({"main.py": "new", "../escape.py": "x"}, target)
+
+        assert (target / "main.py").read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["demo"]
+
+    @pytest.mark.parametrize("suffix", [".zip", ".tar.gz"])
+    def test_export_archive(self, tmp_path, suffix):
+        """Archives contain every file under the given root."""
+        import tarfile
+        import zipfile
+        from inceptor.core import ProjectExporter
+        archive = tmp_path / f"demo{suffix}"
+
+        ProjectExporter().export_archive(self.files, archive, root="demo")
+
+        if suffix == ".zip":
+            with zipfile.ZipFile(archive) as zf:
+                assert zf.read("demo/app/config.yml") == b"debug: true"
+                names = zf.namelist()
+        else:
+            with tarfile.open(archive) as tf:
+                assert tf.extractfile("demo/main.py").read() == b"print('hi')"
+                names = tf.getnames()
+        assert sorted(names) == sorted(f"demo/{name}" for name in self.files)
+
+    def test_solution_files_layout(self):
+        """Implementation fields become files under level/task directories."""
+        from inceptor.core import Solution, solution_files
+        solution = Solution("p", {}, [], {"reality": {"R/1": {"implementation": {"code": "x = 1", "dependencies": []}}}}, {})
+
+        files = solution_files(solution)
+
+        assert set(files) == {"solution.json", "reality/R_1/result.json", "reality/R_1/code.txt"}
+        assert files["reality/R_1/code.txt"] == "x = 1"
+
+
+class TestBlobStore:
+    """Tests for the content-addressed blob store."""
+
+    def test_exports_share_identical_files(self, tmp_path):
+        """Identical content is stored once and hardlinked into each project."""
+        from inceptor.core import BlobStore, ProjectExporter
+        store = BlobStore(tmp_path / ".blobs")
+        exporter = ProjectExporter(blob_store=store)
+        files = {"Dockerfile": "FROM python:3.11", "main.py": "print(1)"}
+
+        exporter.export_dir(files, tmp_path / "one")
+        exporter.export_dir(dict(files, **{"main.py": "print(2)"}), tmp_path / "two")
+        exporter.write_files(files, tmp_path / "one")
+
+        one, two = tmp_path / "one" / "Dockerfile", tmp_path / "two" / "Dockerfile"
+        assert one.read_text() == "FROM python:3.11"
+        assert one.stat().st_ino == two.stat().st_ino
+        assert sorted(p.name for p in (tmp_path / "one").iterdir()) == ["Dockerfile", "main.py"]
+        stats = store.stats()
+        assert stats["blobs"] == 3
+        assert stats["bytes_written"] == len("FROM python:3.11") + 2 * len("print(1)")
+        assert stats["bytes_deduplicated"] == 2 * len("FROM python:3.11") + len("print(1)")
+
+    def test_prune_removes_unreferenced_blobs(self, tmp_path):
+        """Blobs whose projects were deleted are pruned."""
+        import shutil
+        from inceptor.core import BlobStore
+        store = BlobStore(tmp_path / ".blobs")
+        (tmp_path / "project").mkdir()
+        store.store("keep", tmp_path / "project" / "a.txt")
+        store.store("drop", tmp_path / "project" / "b.txt")
+        (tmp_path / "project" / "b.txt").unlink()
+
+        assert store.prune() == 1
+        assert store.stats()["blobs"] == 1
+        shutil.rmtree(tmp_path / "project")
+        assert store.prune() == 1
+
+
+class TestProjectIndex:
+    """Tests for the generated-project index."""
+
+    @staticmethod
+    def _write_project(root, name, **info):
+        import json
+        (root / name).mkdir(parents=True)
+        (root / name / "project_info.json").write_text(json.dumps(info))
+
+    def test_filters(self, tmp_path):
+        """Projects are found by technology, component, date and problem text."""
+        from inceptor.core import ProjectIndex
+        (tmp_path / "api").mkdir()
+        (tmp_path / "etl").mkdir()
+        with ProjectIndex(tmp_path) as index:
+            index.update("api", {"problem": "REST API for logs", "timestamp": "2024-01-05T10:00:00",
+                                 "technologies": ["Python", "FastAPI"], "components": [{"name": "API"}]})
+            index.update("etl", {"problem": "Nightly ETL of 100% logs", "timestamp": "2024-03-01T08:00:00",
+                                 "technologies": ["python"], "components": ["scheduler"]})
+
+            assert index.names() == ["api", "etl"]
+            assert index.names(technology="PYTHON") == ["api", "etl"]
+            assert index.names(technology="fastapi") == ["api"]
+            assert index.names(component="api") == ["api"]
+            assert index.names(since="2024-02-01") == ["etl"]
+            assert index.names(until="2024-02-01") == ["api"]
+            assert index.names(text="LOGS") == ["api", "etl"]
+            assert index.names(text="100%") == ["etl"]
+            assert index.get("api")["technologies"] == ["Python", "FastAPI"]
+            assert index.get("missing") is None
+
+    def test_refresh_and_rebuild_from_disk(self, tmp_path):
+        """Projects added or removed on disk are picked up; rebuild re-reads everything."""
+        import shutil
+        from inceptor.core import ProjectIndex
+        self._write_project(tmp_path, "one", problem="first", technologies=["go"])
+        with ProjectIndex(tmp_path) as index:
+            assert index.names() == ["one"]
+
+            self._write_project(tmp_path, "two", problem="second")
+            (tmp_path / ".blobs").mkdir()
+            assert index.names() == ["one", "two"]
+
+            shutil.rmtree(tmp_path / "one")
+            assert index.is_stale()
+            assert index.names() == ["two"]
+
+            (tmp_path / "two" / "project_info.json").write_text('{"problem": "changed"}')
+            assert index.refresh() == 1
+            assert index.get("two") == {"problem": "changed"}
+            assert index.rebuild() == 1
+
+    def test_project_without_info_file(self, tmp_path):
+        """A directory without project_info.json is listed and does not keep the index stale."""
+        from inceptor.core import ProjectIndex
+        self._write_project(tmp_path, "a", problem="with info")
+        (tmp_path / "b").mkdir()
+        with ProjectIndex(tmp_path) as index:
+            assert index.names() == ["a", "b"]
+            assert not index.is_stale()
+            assert index.refresh() == 0
+            assert index.get("b") == {}
+
+            (tmp_path / "b" / "project_info.json").write_text('{"problem": "late info"}')
+            assert index.refresh() == 1
+            assert index.names(text="late") == ["b"]
+
+
+class TestStandInClient:
+    """Tests for the in-process stand-in model backend."""
+
+    def test_full_inception_without_server(self):
+        """Synthetic responses follow each level's JSON schema with unique task ids."""
+        from inceptor.core import StandInClient
+        client = StandInClient(fanout=2)
+        architect = DreamArchitect(client=client)
+
+        solution = architect.inception("Flask logging API", max_levels=5)
+
+        assert len(solution.architecture["dream"]) == 2
+        assert len(solution.implementation["reality"]) == 4
+        assert len(solution.implementation["deepest"]) == 4
+        assert "optimization" in next(iter(solution.implementation["deepest"].values()))
+        assert client.calls == 1 + 2 + 4 + 4 + 4
+
+    def test_recorded_responses(self, tmp_path):
+        """Recorded responses are served by prompt; others fall back to synthesis."""
+        import json
+        from inceptor.core import StandInClient
+        from inceptor.core.stand_in import prompt_key
+        path = tmp_path / "responses.jsonl"
+        path.write_text("\n".join([
+            json.dumps({"prompt": "hello", "response": "recorded"}),
+            json.dumps({"key": prompt_key("bye"), "response": "by key"}),
+        ]))
+
+        client = StandInClient(path)
+
+        assert client.generate("hello") == "recorded"
+        assert client.generate("bye") == "by key"
+        synthetic = json.loads(client.generate('Data: {"x": 1}\nAnswer in JSON: {"a": [{"task_id": "T"}]}'))
+        assert [task["task_id"][:4] for task in synthetic["a"]] == ["T_1_", "T_2_"]
+        assert client.recorded_hits == 2
+
+    def test_create_client(self, monkeypatch):
+        """Backends are selected by name or $INCEPTOR_BACKEND."""
+        from inceptor.core import StandInClient, create_client
+        monkeypatch.setenv("INCEPTOR_BACKEND", "stand-in")
+        assert isinstance(create_client(), StandInClient)
+        assert isinstance(create_client("ollama"), OllamaClient)
+        with pytest.raises(ValueError):
+            create_client("gpt")
+        with pytest.raises(ValueError, match="record"):
+            create_client("stand-in", record="trace.jsonl")
+
+
+class TestTrace:
+    """Tests for recording and replaying model traffic."""
+
+    @patch('inceptor.core.ollama_client.requests.post')
+    def test_record_and_replay(self, mock_post, tmp_path):
+        """Recorded responses, errors and timing are replayed per prompt."""
+        import json
+        from inceptor.core import ReplayClient, TraceRecorder, read_trace, trace_summary
+        trace = tmp_path / "trace.jsonl.gz"
+        mock_post.return_value.json.side_effect = [
+            {"response": "first", "prompt_eval_count": 12, "eval_count": 7, "load_duration": 250_000_000},
+            {"response": "second"},
+        ]
+
+        with TraceRecorder(trace) as recorder:
+            client = OllamaClient(recorder=recorder)
+            assert client.generate("same prompt") == "first"
+            assert client.generate("same prompt") == "second"
+            mock_post.side_effect = ConnectionError("refused")
+            with pytest.raises(Exception):
+                client.generate("failing prompt")
+
+        records = list(read_trace(trace))
+        assert [record.get("r") for record in records] == ["first", "second", None]
+        assert records[0]["ct"] == 7 and "e" in records[2] and "p" not in records[0]
+        assert trace_summary(trace)["errors"] == 1
+
+        replay = ReplayClient(trace, speed=0)
+        assert replay.generate("same prompt") == "first"
+        assert replay.last_usage() == {"prompt_eval_count": 12, "eval_count": 7, "load_duration": 250_000_000}
+        assert [replay.generate("same prompt") for _ in range(2)] == ["second", "second"]
+        assert replay.last_usage() == {}
+        with pytest.raises(Exception, match="refused"):
+            replay.generate("failing prompt")
+        assert replay.last_usage() is None
+        with pytest.raises(Exception, match="not found"):
+            replay.generate("new prompt")
+        assert json.loads(ReplayClient(trace, speed=0, strict=False).generate('{"a": 1}')) == {"a": 1}
+
+    def test_replay_latency_is_scaled(self, tmp_path):
+        """Replay sleeps the recorded latency divided by speed."""
+        import time
+        from inceptor.core import ReplayClient, TraceRecorder
+        trace = tmp_path / "trace.jsonl"
+        with TraceRecorder(trace) as recorder:
+            recorder.record("prompt", "", 100, "m", time.monotonic(), 0.2, response="ok")
+
+        started = time.monotonic()
+        assert ReplayClient(trace, speed=4).generate("prompt") == "ok"
+        assert 0.04 <= time.monotonic() - started < 0.15
+
+
+class TestPromptTemplates:
+    """Tests for compiled prompt templates."""
+
+    def test_compiled_render_matches_format(self):
+        """Compiled templates render like str.format, with literal braces."""
+        from inceptor.core import CompiledTemplate, PromptTemplates
+        fields = {"task": '{"task_id": "T1"}', "specification": "{}", "context": "{}"}
+        assert PromptTemplates.get_prompt(level=3, **fields) == PromptTemplates.REALITY_PROMPT.format(**fields)
+        assert PromptTemplates.compiled(3) is PromptTemplates.compiled(3)
+        assert PromptTemplates.compiled(2).fields == {"task", "context", "components"}
+
+        template = CompiledTemplate("{a} and {{b}} and {a}{c}")
+        assert template.slots == ("a", "a", "c")
+        assert template.render(a=1, c="!") == "1 and {b} and 1!"
+
+    def test_fields_are_validated(self):
+        """Missing, unknown and complex placeholders are rejected."""
+        from inceptor.core import CompiledTemplate, PromptTemplates
+        with pytest.raises(ValueError, match="missing specification"):
+            PromptTemplates.get_prompt(level=3, task="{}", context="{}")
+        with pytest.raises(ValueError, match="foo"):
+            PromptTemplates.get_prompt(level=1, problem="p", context="{}", foo="x")
+        for source in ("{a.b}", "{a[0]}", "{a!r}", "{a:>10}", "{", "{}"):
+            with pytest.raises(ValueError):
+                CompiledTemplate(source)
+
+    def test_templates_from_directory(self, tmp_path):
+        """Template files override levels; unused level fields are ignored."""
+        from inceptor.core import PromptTemplates, StandInClient
+        (tmp_path / "dream.txt").write_text('Design {task}. Reply as JSON: {{"design": {{}}, "reality_tasks": []}}',
+                                            encoding="utf-8")
+        templates = PromptTemplates.from_directory(tmp_path)
+
+        prompt = templates.get_prompt(level=2, task="the API", context="{}", components="[]")
+        assert prompt.startswith("Design the API.")
+        assert templates.get_prompt(level=1, problem="p", context="{}") == \
+            PromptTemplates.get_prompt(level=1, problem="p", context="{}")
+        solution = DreamArchitect(client=StandInClient(), templates=templates).inception("Flask API")
+        assert solution.implementation["reality"] == {}
+
+        (tmp_path / "limbo.txt").write_text("{problem} {budget}", encoding="utf-8")
+        with pytest.raises(ValueError, match="budget"):
+            PromptTemplates.from_directory(tmp_path)
+        with pytest.raises(ValueError):
+            PromptTemplates.from_directory(tmp_path / "missing")
+
+
+class TestPromptBudget:
+    """Tests for fitting prompts into a token budget."""
+
+    def test_estimate_and_shrink(self):
+        """Fields shrink to the target, JSON keeping its structure."""
+        import json
+        from inceptor.core.token_budget import estimate_tokens, shrink
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("def handler(event):") < estimate_tokens("def handler(event):\n    return event")
+
+        field = json.dumps({"code": "x = 1\n" * 500, "language": "python"}, indent=2)
+        shrunk = shrink(field, 100)
+        assert estimate_tokens(shrunk) <= 100
+        data = json.loads(shrunk)
+        assert data["language"] == "python" and "tokens omitted]" in data["code"]
+
+        text = shrink("word " * 300, 50)
+        assert estimate_tokens(text) <= 50 and text.endswith("tokens omitted]")
+
+    def test_fit_trims_low_priority_fields_first(self):
+        """Context and specification are trimmed before the task."""
+        import json
+        from inceptor.core import PromptTemplates
+        from inceptor.core.token_budget import estimate_tokens
+        task = json.dumps({"task_id": "REALITY_TASK_api", "description": "Build the API"})
+        spec = json.dumps({"architecture": "layered " * 2000})
+        untrimmed = PromptTemplates.get_prompt(level=3, task=task, specification=spec, context="{}")
+
+        prompt, report = PromptTemplates.fit(3, 600, task=task, specification=spec, context="{}")
+
+        assert estimate_tokens(prompt) <= 600 == report["budget"]
+        assert task in prompt and list(report["fields"]) == ["specification"]
+        assert report["dropped_tokens"] == estimate_tokens(untrimmed) - report["tokens"]
+        assert PromptTemplates.get_prompt(level=3, budget=600, task=task, specification=spec,
+                                          context="{}") == prompt
+        assert PromptTemplates.fit(3, 10000, task=task, specification="{}", context="{}")[1]["fields"] == {}
+
+    def test_architect_records_trimming(self):
+        """Inceptions with a budget record what was dropped per level."""
+        import json
+        from inceptor.core import StandInClient
+        from inceptor.core.token_budget import estimate_tokens
+        client = StandInClient()
+        synthesize, sizes = client.generate, []
+
+        def generate(prompt, *args, **kwargs):
+            sizes.append(estimate_tokens(prompt))
+            result = json.loads(synthesize(prompt))
+            if "implementation" in result:
+                result["implementation"]["code"] = "print('hello')\n" * 1000
+            return json.dumps(result)
+
+        client.generate = generate
+        solution = DreamArchitect(client=client, prompt_budget=800).inception("Flask logging API", max_levels=4)
+
+        levels = solution.metadata["prompt_budget"]["levels"]
+        assert max(sizes) <= 800
+        assert levels["deeper"]["trimmed"] == levels["deeper"]["prompts"] > 0
+        assert levels["deeper"]["fields"]["task"] > 0 and levels["limbo"]["dropped_tokens"] == 0
+        assert "prompt_budget" not in DreamArchitect(client=StandInClient()).inception("API").metadata
+
+
+class TestAdaptiveLimiter:
+    """Tests for latency-driven backend concurrency limits."""
+
+    def test_grows_while_saturated_without_queueing(self):
+        """The limit grows only when in use and requests do not queue."""
+        from inceptor.core import AdaptiveLimiter
+        limiter = AdaptiveLimiter(initial=2, max_limit=3)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(latency=1.0, service_time=1.0)
+        assert limiter.limit == 2
+
+        for _ in range(10):
+            limiter.acquire()
+            limiter.acquire()
+            limiter.release(latency=1.0, service_time=1.0)
+            limiter.release(latency=1.0, service_time=1.0)
+        assert limiter.limit == 3
+
+    def test_backs_off_on_queueing_and_drops(self):
+        """Queueing delay and dropped requests cut the limit, once per round trip."""
+        from inceptor.core import AdaptiveLimiter
+        limiter = AdaptiveLimiter(initial=20, min_delay=0.0, smoothing=1.0)
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(latency=0.0, service_time=0.0)
+        limiter.acquire()
+        limiter.release(latency=0.01, service_time=0.001)
+        assert limiter.limit == 18
+
+        limiter.acquire()
+        limiter.release(latency=60.0, dropped=True)
+        assert limiter.limit == 18  # already cut within this round trip
+
+        limiter = AdaptiveLimiter(initial=20)
+        limiter.acquire()
+        limiter.release(dropped=True)
+        metrics = limiter.metrics()
+        assert metrics["limit"] == 10 and metrics["drops"] == 1 and metrics["in_flight"] == 0
+
+    def test_burst_of_drops_backs_off_once(self):
+        """Requests failing together cut the limit once, also without a latency."""
+        from inceptor.core import AdaptiveLimiter
+        limiter = AdaptiveLimiter(initial=16)
+        for _ in range(4):
+            limiter.acquire()
+        for _ in range(4):
+            limiter.release(latency=0.5, dropped=True)
+        assert limiter.metrics()["decreases"] == 1 and limiter.limit == 8
+
+        limiter = AdaptiveLimiter(initial=16)
+        limiter.acquire()
+        limiter.release(latency=1.0, service_time=1.0)
+        for _ in range(4):
+            limiter.acquire()
+        for _ in range(4):
+            limiter.release(dropped=True)
+        assert limiter.metrics()["decreases"] == 1 and limiter.limit == 8
+
+    @patch('inceptor.core.ollama_client.requests.post')
+    def test_concurrent_connection_errors_back_off_once(self, mock_post):
+        """The client reports how long a failed request took, so one outage is one cut."""
+        import threading
+        import time
+        import requests
+        from inceptor.core import AdaptiveLimiter
+        barrier = threading.Barrier(4)
+
+        def refuse(*args, **kwargs):
+            barrier.wait()
+            time.sleep(0.05)
+            raise requests.exceptions.ConnectionError("Connection refused")
+
+        mock_post.side_effect = refuse
+        limiter = AdaptiveLimiter(initial=16)
+        client = OllamaClient(limiter=limiter)
+
+        def call():
+            with pytest.raises(Exception):
+                client.generate("prompt")
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = limiter.metrics()
+        assert metrics["drops"] == 4 and metrics["decreases"] == 1 and limiter.limit == 8
+
+    def test_acquire_blocks_at_the_limit(self):
+        """Requests past the limit wait for a slot."""
+        import threading
+        from inceptor.core import AdaptiveLimiter
+        limiter = AdaptiveLimiter(initial=1)
+        limiter.acquire()
+        waiter = threading.Thread(target=limiter.acquire)
+        waiter.start()
+        waiter.join(0.05)
+        assert waiter.is_alive()
+        limiter.release()
+        waiter.join(1)
+        assert not waiter.is_alive() and limiter.metrics()["in_flight"] == 1
+
+    @patch('inceptor.core.ollama_client.requests.post')
+    def test_server_side_queueing_lowers_the_limit(self, mock_post):
+        """Time Ollama spends loading or waiting for a slot counts as queueing delay."""
+        import time
+        from inceptor.core import AdaptiveLimiter
+
+        def respond(*args, **kwargs):
+            time.sleep(0.05)
+            response = MagicMock(status_code=200)
+            # total_duration includes 30 ms of waiting before evaluation started
+            response.json.return_value = {"response": "ok", "total_duration": 50_000_000,
+                                          "load_duration": 30_000_000, "prompt_eval_duration": 5_000_000,
+                                          "eval_duration": 15_000_000}
+            return response
+
+        mock_post.side_effect = respond
+        limiter = AdaptiveLimiter(initial=8, min_delay=0.01, smoothing=1.0)
+        client = OllamaClient(limiter=limiter)
+        for _ in range(3):
+            client.generate("prompt")
+
+        metrics = limiter.metrics()
+        assert metrics["service_time"] == pytest.approx(0.02)
+        assert metrics["queue_delay"] >= 0.025
+        assert metrics["decreases"] >= 1 and limiter.limit < 8
+
+    @patch('inceptor.core.ollama_client.requests.post')
+    def test_ollama_client_reports_limit(self, mock_post):
+        """Clients of one backend share its limiter and report it in metrics."""
+        from inceptor.core import AdaptiveLimiter, limiter_for
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {"response": "ok", "total_duration": 3_000_000,
+                                                    "prompt_eval_duration": 500_000, "eval_duration": 1_500_000}
+        limiter = AdaptiveLimiter()
+
+        client = OllamaClient("http://gpu-1:11434", limiter=limiter)
+        assert client.generate("prompt") == "ok"
+        metrics = client.metrics()
+        assert metrics["limit"] == 4 and metrics["requests"] == 1
+        assert metrics["service_time"] == 0.002 and metrics["base_url"] == "http://gpu-1:11434"
+
+        mock_post.return_value.status_code = 503
+        mock_post.return_value.raise_for_status.side_effect = Exception("503 Service Unavailable")
+        with pytest.raises(Exception):
+            client.generate("prompt")
+        assert client.metrics()["drops"] == 1 and client.metrics()["in_flight"] == 0
+
+        assert OllamaClient("http://gpu-2:11434").limiter is limiter_for("http://gpu-2:11434/")
+        assert OllamaClient(adaptive=False).metrics()["limit"] is None
+
+
+class TestModelRouter:
+    """Tests for model routing per level, complexity and prompt size."""
+
+    def test_route_precedence_and_fallbacks(self):
+        """Complexity beats level beats prompt size; chains end with the default."""
+        from inceptor.core import ModelRouter
+        router = ModelRouter(default="big", levels={"limbo": "small", "reality": "coder"},
+                             complexity={"simple": "tiny"}, prompt_tokens=[(4000, "medium"), (500, "small")],
+                             fallbacks={"tiny": ["small"], "small": ["medium", "tiny"]})
+
+        assert router.route("dream", "simple") == ["tiny", "small", "medium", "big"]
+        assert router.route("reality", "complex") == ["coder", "big"]
+        assert router.route("deeper", prompt_tokens=300) == ["small", "medium", "tiny", "big"]
+        assert router.route("deeper", prompt_tokens=2000) == ["medium", "big"]
+        assert router.route("deeper", prompt_tokens=9000) == ["big"]
+        with pytest.raises(ValueError):
+            ModelRouter(levels={"basement": "x"})
+        with pytest.raises(ValueError):
+            ModelRouter.from_config({"model": "x"})
+
+    def test_architect_routes_and_falls_back(self):
+        """Simple components go to the small model; failures fall back and are counted."""
+        import json
+        from inceptor.core import ModelRouter, StandInClient
+        client = StandInClient()
+        synthesize, calls = client.generate, []
+
+        def generate(prompt, system_prompt="", max_tokens=2000, model=None):
+            calls.append(model)
+            result = json.loads(synthesize(prompt))
+            for component in result.get("components", []):
+                component["complexity"] = "simple"
+            for task in result.get("dream_tasks", []):
+                task["component"] = result["components"][0]["name"]
+            if model == "tiny" and "reality_tasks" in result:
+                return "not json"
+            return json.dumps(result)
+
+        client.generate = generate
+        router = ModelRouter(default="big", levels={"limbo": "small"}, complexity={"simple": "tiny"},
+                             fallbacks={"tiny": ["small"]})
+        solution = DreamArchitect(client=client, router=router).inception("Flask logging API", max_levels=3)
+
+        models = solution.metadata["models"]
+        assert models["limbo"] == {"small": 1}
+        assert models["dream"] == {"small": 2} and models["reality"] == {"tiny": 4}
+        stats = router.stats()
+        assert stats["tiny"]["errors"] == 2 and stats["small"]["fallbacks"] == 2
+        assert stats["tiny"]["requests"] == 6 and stats["tiny"]["completion_tokens"] > 0
+        assert "big" not in calls and "models" not in DreamArchitect(client=StandInClient()).inception("API").metadata
+
+    @patch('inceptor.core.ollama_client.requests.post')
+    def test_ollama_client_model_and_usage(self, mock_post):
+        """OllamaClient sends the requested model and keeps the reported usage."""
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {"response": "ok", "prompt_eval_count": 12, "eval_count": 3}
+        client = OllamaClient(adaptive=False)
+
+        assert client.generate("prompt", model="llama3.2:3b") == "ok"
+        assert mock_post.call_args.kwargs["json"]["model"] == "llama3.2:3b"
+        assert client.last_usage() == {"prompt_eval_count": 12, "eval_count": 3}
+        client.generate("prompt")
+        assert mock_post.call_args.kwargs["json"]["model"] == "mistral:7b"
+
+
+class TestKeepWarm:
+    """Tests for model preloading, keep-alive and load time reporting."""
+
+    def test_keep_alive_durations(self):
+        """Durations parse like Ollama's; negative means forever."""
+        from inceptor.core.keep_warm import keep_alive_seconds
+        assert keep_alive_seconds(None) == 300.0
+        assert keep_alive_seconds("30m") == 1800.0 and keep_alive_seconds(90) == 90.0
+        assert keep_alive_seconds("-1") is None and keep_alive_seconds(-1) is None
+        with pytest.raises(ValueError):
+            OllamaClient(keep_alive="soon")
+
+    @patch('inceptor.core.ollama_client.requests.post')
+    def test_preload_and_load_time(self, mock_post):
+        """Load time is reported apart from generation time, per model."""
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
+            "response": "ok", "load_duration": 2_000_000_000,
+            "prompt_eval_duration": 500_000_000, "eval_duration": 1_000_000_000,
+        }
+        client = OllamaClient(adaptive=False, keep_alive="30m")
+
+        assert client.preload("llama3.2:3b") == 2.0
+        assert mock_post.call_args.kwargs["json"] == {"model": "llama3.2:3b", "prompt": "", "stream": False,
+                                                      "keep_alive": "30m"}
+        client.generate("prompt")
+        assert mock_post.call_args.kwargs["json"]["keep_alive"] == "30m"
+        mock_post.return_value.json.return_value = {"response": "ok", "load_duration": 1_000_000}
+        client.generate("prompt")
+
+        timings = client.metrics()["models"]
+        assert timings["llama3.2:3b"]["preloads"] == 1 and timings["llama3.2:3b"]["requests"] == 0
+        assert timings["mistral:7b"]["requests"] == 2 and timings["mistral:7b"]["cold_starts"] == 1
+        assert timings["mistral:7b"]["load_seconds"] == pytest.approx(2.001)
+        assert timings["mistral:7b"]["eval_seconds"] == 1.0
+        client.unload()
+        assert mock_post.call_args.kwargs["json"]["keep_alive"] == 0
+
+    def test_background_pings(self):
+        """Models are preloaded and pinged until the block ends; failures are retried."""
+        import time
+        client = MagicMock(keep_alive=None)
+        client.preload.side_effect = lambda model: 0.0 if model == "a" else 1 / 0
+
+        with OllamaClient.keep_warm(client, ["a", "b", "a"], interval=0.01) as warm:
+            time.sleep(0.1)
+        calls = client.preload.call_count
+        time.sleep(0.05)
+
+        assert warm.models == ["a", "b"] and client.preload.call_count == calls
+        assert warm.pings >= 2 and warm.failures >= 2
+        assert OllamaClient(keep_alive="10m").keep_warm().interval == 60.0
+        assert OllamaClient(keep_alive=30).keep_warm().interval == 15.0
+
+    def test_router_separates_load_time(self):
+        """Router statistics keep model load time apart from generation."""
+        from inceptor.core import ModelRouter
+        router = ModelRouter(default="big", levels={"limbo": "small"}, fallbacks={"small": ["medium"]})
+        router.record("big", 5.0, completion_tokens=30, load_seconds=2.0)
+        router.record("big", 1.0, completion_tokens=10)
+
+        stats = router.stats()["big"]
+        assert stats["load_seconds"] == 2.0 and stats["mean_generation"] == 2.0
+        assert stats["tokens_per_second"] == 10.0
+        assert router.models() == ["big", "small", "medium"]
+
+
+class TestSpeculativeGenerator:
+    """Tests for racing parallel generations of latency-critical prompts."""
+
+    def test_first_valid_response_wins(self):
+        """An invalid first candidate costs no retry; the rest are cancelled."""
+        import time
+        from inceptor.core import DreamArchitect, GenerationCancelled, SpeculativeGenerator, StandInClient
+
+        class FlakyClient(StandInClient):
+            def generate(self, prompt, system_prompt="", max_tokens=2000, model=None, temperature=0.7,
+                         seed=None, cancel=None):
+                if temperature == 0.7 and "Meta-Architect" in prompt:
+                    return "not json"
+                if temperature == 1.0:
+                    if cancel.wait(5):
+                        raise GenerationCancelled("cancelled")
+                return super().generate(prompt, system_prompt, max_tokens, model, temperature, seed, cancel)
+
+        speculation = SpeculativeGenerator({"limbo": 3})
+        architect = DreamArchitect(client=FlakyClient(latency=0.02), speculation=speculation)
+        started = time.perf_counter()
+        solution = architect.inception("Build a todo app", max_levels=3)
+
+        assert solution.architecture["limbo"]["dream_tasks"]
+        assert time.perf_counter() - started < 5
+        time.sleep(0.05)
+        stats = speculation.stats()["limbo"]
+        assert stats["races"] == 1 and stats["candidates"] == 3 and stats["wins"] == {1: 1}
+        assert stats["primary_failures"] == 1 and stats["cancelled"] == 1 and stats["failures"] == 0
+        assert stats["extra_prompt_tokens"] > 0 and stats["latency_saved"] > 0
+        assert "dream" not in speculation.stats()
+
+    def test_all_candidates_invalid(self):
+        """Without a usable candidate the first candidate's error is raised."""
+        import json
+        from inceptor.core import SpeculativeGenerator
+        from inceptor.core.speculative import validate_response
+        client = MagicMock(spec=["generate", "last_usage"])
+        client.generate.side_effect = ['{"components": []}', "[]"]
+        client.last_usage.return_value = {"prompt_eval_count": 10, "eval_count": 4}
+        speculation = SpeculativeGenerator({"limbo": 2}, temperatures=[0.7], seed=7)
+
+        with pytest.raises(ValueError, match="dream_tasks"):
+            speculation.generate(client, "limbo", "prompt", json.loads)
+        seeds = sorted(call.kwargs["seed"] for call in client.generate.call_args_list)
+        assert seeds == [7, 8] and {call.kwargs["temperature"] for call in client.generate.call_args_list} == {0.7}
+        stats = speculation.stats()["limbo"]
+        assert stats["failures"] == 1 and stats["extra_prompt_tokens"] == 20 and stats["extra_completion_tokens"] == 8
+        validate_response("deepest", {"optimization": {}})
+        with pytest.raises(ValueError):
+            SpeculativeGenerator({"limbo": 0})
+        with pytest.raises(ValueError):
+            SpeculativeGenerator.from_config({"levels": {"dreams": 2}})
+
+    @patch('inceptor.core.ollama_client.requests.post')
+    def test_ollama_cancellation(self, mock_post):
+        """Cancelled requests are streamed and closed, reporting the tokens spent."""
+        import json
+        import threading
+        from inceptor.core import GenerationCancelled
+        cancel = threading.Event()
+
+        def chunks():
+            for index in range(5):
+                if index == 2:
+                    cancel.set()
+                yield json.dumps({"response": "token ", "done": False}).encode()
+
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.side_effect = chunks
+        client = OllamaClient(adaptive=False)
+
+        with pytest.raises(GenerationCancelled):
+            client.generate("prompt", temperature=0.3, seed=1, cancel=cancel)
+        assert mock_post.call_args.kwargs["stream"] is True
+        assert mock_post.call_args.kwargs["json"]["options"] == {"num_predict": 2000, "temperature": 0.3, "seed": 1}
+        assert client.last_usage() == {"eval_count": 2}
+        assert mock_post.return_value.close.called
+
+
+class TestRequestScheduler:
+    """Tests for the priority request scheduler."""
+
+    @staticmethod
+    def _run_queued(scheduler, requests):
+        """Queues (priority, flow) requests behind a held slot; returns the order they ran in."""
+        import threading
+        import time
+        release, order = threading.Event(), []
+        holder = threading.Thread(target=scheduler.call, args=("batch", "holder", release.wait))
+        holder.start()
+        while scheduler.stats()["backend"]["active"] < 1:
+            time.sleep(0.001)
+        threads = []
+        for index, (priority, flow) in enumerate(requests):
+            thread = threading.Thread(target=scheduler.call,
+                                      args=(priority, flow, order.append, (priority, flow, index)))
+            thread.start()
+            threads.append(thread)
+            while sum(scheduler.stats()[p]["queued"] for p in ("interactive", "batch", "background")) <= index:
+                time.sleep(0.001)
+        release.set()
+        for thread in [holder] + threads:
+            thread.join()
+        return order
+
+    def test_weighted_share_between_classes(self):
+        """Busy classes share the backend by weight, interactive first."""
+        from inceptor.core import RequestScheduler, StandInClient
+        scheduler = RequestScheduler(StandInClient())
+        requests = [(priority, priority) for priority in ("background", "batch", "interactive") for _ in range(8)]
+
+        order = self._run_queued(scheduler, requests)
+
+        first = [priority for priority, _, _ in order[:11]]
+        assert first.count("interactive") == 8
+        assert first.count("batch") == 2 and first.count("background") == 1
+        stats = scheduler.stats()
+        assert stats["interactive"]["requests"] == 8 and stats["batch"]["requests"] == 9
+        assert stats["background"]["max_wait"] >= stats["interactive"]["max_wait"] > 0
+
+    def test_flows_take_turns_within_a_class(self):
+        """A flow with many queued requests does not block other flows."""
+        from inceptor.core import RequestScheduler, StandInClient
+        scheduler = RequestScheduler(StandInClient())
+        requests = [("batch", "big")] * 4 + [("batch", "small")]
+
+        order = self._run_queued(scheduler, requests)
+
+        assert [flow for _, flow, _ in order][:2] == ["big", "small"]
+
+    def test_aging_prevents_starvation(self):
+        """Requests queued longer than the aging limit go first."""
+        from inceptor.core import RequestScheduler, StandInClient
+        scheduler = RequestScheduler(StandInClient(), aging=0.0)
+        requests = [("background", "old")] + [("interactive", f"user-{i}") for i in range(3)]
+
+        order = self._run_queued(scheduler, requests)
+
+        assert order[0][1] == "old"
+        assert scheduler.stats()["background"]["aged"] == 1
+
+    def test_client_views_and_context(self):
+        """Views and thread contexts route model calls through the scheduler."""
+        from inceptor.core import RequestScheduler, StandInClient
+        client = StandInClient()
+        scheduler = RequestScheduler(client, max_concurrency=2)
+
+        view = scheduler.client("interactive", flow="shell")
+        architect = DreamArchitect(client=view)
+        architect.inception("Flask logging API", max_levels=3)
+        with scheduler.context("background", flow="nightly"):
+            scheduler.generate("Summarize")
+        scheduler.embed("text")
+
+        stats = scheduler.stats()
+        assert stats["interactive"]["requests"] == client.calls - 1
+        assert stats["background"]["requests"] == 1 and stats["batch"]["requests"] == 1
+        with pytest.raises(ValueError):
+            scheduler.client("urgent")
+        with pytest.raises(ValueError):
+            RequestScheduler(client, weights={"batch": 0})
+
+    def test_load_tester_priority_mix(self):
+        """The load tester reports latency and queue wait per class."""
+        from inceptor.core import LoadTester, RequestScheduler, StandInClient
+        architect = DreamArchitect(client=RequestScheduler(StandInClient()))
+        tester = LoadTester(architect, ["Flask logging API"], mix={"interactive": 1, "batch": 3})
+
+        step = tester.run_step(4, requests=8)
+
+        assert len(step.class_latencies["interactive"]) == 2 and len(step.class_latencies["batch"]) == 6
+        assert step.queue_waits["batch"]["requests"] == 3 * step.queue_waits["interactive"]["requests"] > 0
+        assert "queue_wait" in step.to_dict()["classes"]["interactive"]
+        with pytest.raises(ValueError):
+            LoadTester(DreamArchitect(client=StandInClient()), ["x"], mix={"batch": 1})
+
+
+class TestLoadTester:
+    """Tests for the concurrent inception load tester."""
+
+    def test_ramp_reports_levels_and_errors(self):
+        """Each step reports throughput, per-level latencies and errors."""
+        from inceptor.core import LoadTester, StandInClient
+        client = StandInClient()
+        architect = DreamArchitect(client=client)
+        tester = LoadTester(architect, ["Flask logging API", "bad"], max_levels=4)
+        original = client.generate
+        client.generate = lambda prompt, *args, **kwargs: "not json" if "bad" in prompt else original(prompt)
+
+        report = tester.ramp([1, 4], requests_per_step=8)
+
+        assert [step.concurrency for step in report.steps] == [1, 4]
+        step = report.steps[1]
+        assert step.requests == 8 and step.errors == 4
+        assert step.error_rate == 0.5 and step.error_messages == {"ValueError": 4}
+        assert list(step.level_latencies) == ["limbo", "dream", "reality", "deeper"]
+        assert len(step.latencies) == 4 and step.throughput > 0
+        assert report.to_dict()["steps"][0]["latency"]["p99"] > 0
+
+    def test_saturation_point(self):
+        """Saturation is the last step before throughput stops growing."""
+        from inceptor.core import LoadReport, LoadStep
+        from inceptor.core.stats import percentile
+
+        def step(concurrency, requests, elapsed):
+            return LoadStep(concurrency=concurrency, requests=requests, elapsed=elapsed)
+
+        report = LoadReport(steps=[step(1, 10, 1.0), step(2, 20, 1.0), step(4, 21, 1.0), step(8, 40, 1.0)])
+        assert report.saturation_point == 2
+        assert report.peak.concurrency == 8
+        assert LoadReport(steps=[step(1, 10, 1.0), step(2, 20, 1.0)]).saturation_point is None
+        assert percentile([5, 1, 3, 2, 4], 50) == 3 and percentile([], 99) == 0.0
+
+
+class TestProfiling:
+    """Tests for the inception profiler."""
+
+    def test_model_wait_is_separated(self, tmp_path):
+        """Model calls count as wait time and are pruned from the profile."""
+        from inceptor.core import StandInClient, profile_inception
+        client = StandInClient(latency=0.01)
+        architect = DreamArchitect(client=client)
+
+        with profile_inception(architect) as profile:
+            architect.inception("Flask logging API", max_levels=3)
+
+        assert "generate" not in vars(client)
+        assert profile.model_calls == 7
+        assert profile.model_wait >= 0.07
+        assert profile.wall >= profile.model_wait + profile.local_cpu - 1e-3
+        functions = {name for _, _, name in profile.stats().stats}
+        assert "inception" in functions and "_fill" not in functions
+        assert "Model wait:" in profile.summary(top=5)
+
+        files = profile.save(tmp_path / "run")
+        lines = open(files["folded"]).read().splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any(line.startswith("inception (dream_architect.py") for line in lines)
+        assert not any("stand_in.py" in line for line in lines)
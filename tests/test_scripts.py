@@ -0,0 +1,169 @@
+"""Test the standalone root scripts (inceptor.py, inceptor2.py)."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+
+def load_script(name):
+    """Import a root script by path; inceptor.py would clash with the package."""
+    spec = importlib.util.spec_from_file_location(f"{name}_script", ROOT / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestEnvironmentFiles:
+    """Test suite for the cached environment files of inceptor2.py."""
+
+    STACKS = [
+        (["python", "flask", "postgresql"], "REST API with PostgreSQL and Redis cache"),
+        (["Python", "FastAPI", "Redis"], "Microservices on K8s with MongoDB"),
+        (["FLASK", "MySQL", " kubernetes "], "monolith backed by mysql"),
+        (["Node", "React"], "SPA with a Mongo backend"),
+        (["JavaScript", "Docker"], ""),
+        (["Django", "PostgreSQL", "Celery"], "k8s deployment, postgres and redis"),
+        ([], "plain k8s service"),
+        (["python", "JWT"], "API with JWT auth and PostgreSQL"),
+        ([" Flask ", "Redis"], "cache in redis"),
+        (["Kubernetes", "fastapi"], ""),
+    ]
+
+    @pytest.fixture
+    def script(self):
+        module = load_script("inceptor2")
+        module.SimpleDreamArchitect.clear_environment_cache()
+        yield module
+        module.SimpleDreamArchitect.clear_environment_cache()
+
+    @staticmethod
+    def uncached(architect, technologies, architecture):
+        """Environment files as generate_environment_files built them before caching."""
+        python = any(t.lower() in ['python', 'flask', 'django', 'fastapi'] for t in technologies)
+        node = any(t.lower() in ['nodejs', 'node', 'javascript', 'react'] for t in technologies)
+        files = {}
+        if python:
+            files['Dockerfile'] = architect.generate_dockerfile(technologies)
+            files['docker-compose.yml'] = architect.generate_docker_compose(technologies, architecture)
+            files['requirements.txt'] = architect.generate_requirements(technologies)
+        elif node:
+            files['package.json'] = architect.generate_package_json(technologies)
+        files['.env.example'] = architect.generate_env_example(technologies, architecture)
+        files['config.py'] = architect.generate_config_file(technologies)
+        files['setup.sh'] = architect.generate_setup_script(technologies)
+        files['run.sh'] = architect.generate_run_script(technologies)
+        files['healthcheck.py'] = architect.generate_healthcheck(technologies)
+        files['test_basic.py'] = architect.generate_basic_tests(technologies)
+        if 'kubernetes' in [t.lower() for t in technologies] or 'k8s' in architecture.lower():
+            files['k8s-deployment.yaml'] = architect.generate_k8s_deployment()
+        files['.github/workflows/ci.yml'] = architect.generate_github_actions(technologies)
+        files['TROUBLESHOOTING.md'] = architect.generate_troubleshooting(technologies)
+        return files
+
+    def test_cached_output_matches_generators(self, script):
+        """Cached files equal the generators' output, on first use and on cache hits."""
+        architect = script.SimpleDreamArchitect(backend=object())
+        for technologies, architecture in self.STACKS:
+            expected = self.uncached(architect, technologies, architecture)
+            dream = {"technologies": technologies, "architecture": architecture}
+
+            assert architect.generate_environment_files(dream) == expected, (technologies, architecture)
+            assert architect.generate_environment_files(dict(dream)) == expected, (technologies, architecture)
+
+    def test_cache_key(self, script):
+        """Irrelevant architecture text shares an entry; case, order and the k8s flag do not."""
+        architect = script.SimpleDreamArchitect(backend=object())
+        first = architect.generate_environment_files({"technologies": ["Flask", "Redis"],
+                                                      "architecture": "API on K8s"})
+        second = architect.generate_environment_files({"technologies": ["Flask", "Redis"],
+                                                       "architecture": "another API, k8s cluster"})
+        without_k8s = architect.generate_environment_files({"technologies": ["Flask", "Redis"],
+                                                            "architecture": "API on a VM"})
+        assert first == second and 'k8s-deployment.yaml' in first
+        assert 'k8s-deployment.yaml' not in without_k8s
+        assert len(script.SimpleDreamArchitect._env_files_cache) == 2
+
+        architect.generate_environment_files({"technologies": ["redis", "flask"], "architecture": "API on K8s"})
+        assert len(script.SimpleDreamArchitect._env_files_cache) == 3
+
+    def test_clear_environment_cache(self, script):
+        """Clearing resets both the file-set and the per-fragment caches."""
+        cls = script.SimpleDreamArchitect
+        architect = cls(backend=object())
+        files = architect.generate_environment_files({"technologies": ["python"], "architecture": ""})
+        files['Dockerfile'] = "changed"
+        assert cls._env_files_cache and cls._fragment_cache
+        assert architect.generate_environment_files({"technologies": ["python"]})['Dockerfile'] != "changed"
+
+        cls.clear_environment_cache()
+
+        assert cls._env_files_cache == {} and cls._fragment_cache == {}
+
+
+class TestConcurrentReality:
+    """Test suite for the concurrent REALITY file generation of both scripts."""
+
+    TASKS = [{"file": f"module_{index}.py", "description": f"part {index}"} for index in range(6)]
+
+    @pytest.fixture(params=["inceptor", "inceptor2"])
+    def script(self, request):
+        return load_script(request.param)
+
+    @staticmethod
+    def stub_ollama(architect, failing=None):
+        """Replaces ask_ollama; early files answer last, in-flight calls are counted."""
+        import threading
+        import time
+        lock = threading.Lock()
+        calls = {"active": 0, "peak": 0, "threads": set()}
+
+        def ask_ollama(prompt):
+            index = int(prompt.split("module_")[1].split(".py")[0])
+            with lock:
+                calls["active"] += 1
+                calls["peak"] = max(calls["peak"], calls["active"])
+                calls["threads"].add(threading.get_ident())
+            time.sleep(0.01 * (6 - index))
+            with lock:
+                calls["active"] -= 1
+            if index == failing:
+                return "ERROR: Read timed out"
+            return f"```python\nprint({index})\n```"
+
+        architect.ask_ollama = ask_ollama
+        return calls
+
+    def test_files_keep_task_order(self, script):
+        """Files come back in implementation_tasks order although they finish in reverse."""
+        architect = script.SimpleDreamArchitect(backend=object(), max_concurrency=4)
+        calls = self.stub_ollama(architect)
+
+        files = architect.reality({"implementation_tasks": self.TASKS, "technologies": ["python"]})["files"]
+
+        code_files = [name for name in files if name.startswith("module_")]
+        assert code_files == [task["file"] for task in self.TASKS]
+        assert files["module_3.py"] == "print(3)"
+        assert 1 < calls["peak"] <= 4
+
+    def test_max_concurrency_one_is_sequential(self, script):
+        """With max_concurrency=1 every request runs in the calling thread, one at a time."""
+        import threading
+        architect = script.SimpleDreamArchitect(backend=object(), max_concurrency=1)
+        calls = self.stub_ollama(architect)
+
+        files = architect.reality({"implementation_tasks": self.TASKS, "technologies": []})["files"]
+
+        assert [name for name in files if name.startswith("module_")] == [task["file"] for task in self.TASKS]
+        assert calls["peak"] == 1 and calls["threads"] == {threading.get_ident()}
+
+    def test_error_in_one_file_keeps_the_others(self, script):
+        """A failed request leaves its ERROR text in that file only."""
+        architect = script.SimpleDreamArchitect(backend=object(), max_concurrency=3)
+        self.stub_ollama(architect, failing=2)
+
+        files = architect.reality({"implementation_tasks": self.TASKS, "technologies": []})["files"]
+
+        assert files["module_2.py"].startswith("ERROR:")
+        assert all(files[f"module_{index}.py"] == f"print({index})" for index in (0, 1, 3, 4, 5))